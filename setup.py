@@ -80,7 +80,9 @@ setup(
         "console_scripts": [
             "titerra-cli=sierra.main:main",
             "titerra-gmtg=titerra.tools.gmt_generator:main",
-            "titerra-gmtv=titerra.tools.gmt_visualizer:main"
+            "titerra-gmtv=titerra.tools.gmt_visualizer:main",
+            "titerra-model-sweep=titerra.tools.model_sweep:main",
+            "titerra-import-budget=titerra.tools.import_budget:main"
         ]
     },
 )
@@ -20,12 +20,14 @@ Command line parsing and validation for the :xref:`TITAN` project.
 # Core packages
 import typing as tp
 import argparse
+import logging  # type: ignore
 
 # 3rd party packages
 from sierra.core import types
 import sierra.core.cmdline as cmd
 
 # Project packages
+from titerra.projects.common.generators import exec_planner
 
 
 class CommonCmdline(cmd.CoreCmdline):
@@ -283,6 +285,25 @@ class ARGoSCmdline(CommonCmdline):
                                  type=int,
                                  default=None)
 
+        self.stage1.add_argument("--exec-node-cores",
+                                 help="""
+
+                                 # of cores available for running simulations
+                                 on each node. If passed, the # of physics
+                                 engines per simulation, the # of convergence
+                                 threads per simulation, and the # of
+                                 simulations to run in parallel on each node
+                                 are chosen together to get through the runs in
+                                 each experiment as fast as possible without
+                                 oversubscribing the cores, overriding
+                                 ``--exec-jobs-per-node``. ``--physics-n-engines``
+                                 is treated as the maximum # of engines per
+                                 simulation.
+
+                                 """ + self.stage_usage_doc([1]),
+                                 type=int,
+                                 default=None)
+
     @staticmethod
     def cmdopts_update(cli_args: argparse.Namespace, cmdopts: types.Cmdopts):
         """Updates the core cmdopts dictionary with (key,value) pairs from the
@@ -297,10 +318,24 @@ class ARGoSCmdline(CommonCmdline):
             'scenario': cli_args.scenario,
 
             # stage 1
-            'n_blocks': cli_args.n_blocks
+            'n_blocks': cli_args.n_blocks,
+            'exec_node_cores': cli_args.exec_node_cores
         }
         cmdopts.update(updates)
 
+        # If stage 1 is run, it makes the execution plan, and updates cmdopts
+        # for the later stages itself. Otherwise, the batch must still be run
+        # the way it was generated, regardless of the current cmdline (the # of
+        # threads/run is already fixed in the experiment definitions).
+        if 1 not in cli_args.pipeline:
+            plan = exec_planner.plan_load(cmdopts['batch_input_root'])
+            if plan is not None:
+                logging.getLogger(__name__).info("Using execution plan from stage 1: %s",
+                                                 plan)
+                cmdopts['physics_n_engines'] = plan.n_engines
+                cmdopts['exec_jobs_per_node'] = plan.jobs_per_node
+                cmdopts['exec_plan'] = plan
+
 
 class ROSCmdline(CommonCmdline):
     pass
@@ -21,10 +21,13 @@ common to all TITAN scenarios which use ARGoS.
 """
 # Core packages
 import re
+import os
+import copy
+import typing as tp
 
 # 3rd party packages
 from sierra.core.utils import ArenaExtent
-from sierra.core.xml import XMLLuigi
+from sierra.core.xml import XMLLuigi, XMLWriterConfig, XMLAttrChangeSet, XMLAttrChange
 from sierra.plugins.platform.argos.generators.platform_generators import PlatformExpDefGenerator
 from sierra.plugins.platform.argos.generators.platform_generators import PlatformExpRunDefUniqueGenerator
 import sierra.core.utils as scutils
@@ -33,24 +36,76 @@ import sierra.core.utils as scutils
 from titerra.projects.common.variables import block_distribution, arena, block_quantity, exp_setup
 from titerra.projects.common.variables.nest import Nest
 from titerra.projects.common.generators import utils as tiutils
+from titerra.projects.common.generators.parallel import batch_parallel
+from titerra.projects.common.generators import exec_planner
+from titerra.projects.common.variables.batch_manifest import BatchManifest
 
 
 class BaseScenarioGenerator(PlatformExpDefGenerator):
     def __init__(self, *args, **kwargs) -> None:
         PlatformExpDefGenerator.__init__(self, *args, **kwargs)
 
+        # The plan is the same for all experiments in the batch, so it only
+        # needs to be made once.
+        if self.cmdopts.get('exec_node_cores') is not None and 'exec_plan' not in self.cmdopts:
+            self.exec_plan_create()
+
+    def exec_plan_create(self) -> None:
+        """
+        Plan how the cores on each node are divided between simulations (see
+        :class:`~titerra.projects.common.generators.exec_planner.ExecPlanner`),
+        and update the cmdopts used to generate and execute the batch
+        accordingly. The plan is recorded in the batch manifest.
+        """
+        plan = exec_planner.ExecPlanner(self.cmdopts['exec_node_cores'],
+                                        self.cmdopts['n_runs'],
+                                        self.cmdopts.get('physics_n_engines'))()
+        self.logger.info(("Allocated %s physics engines/run, %s convergence "
+                          "threads/run, %s parallel runs/node for %s cores/node"),
+                         plan.n_engines,
+                         plan.n_conv_threads,
+                         plan.jobs_per_node,
+                         self.cmdopts['exec_node_cores'])
+
+        self.cmdopts['physics_n_engines'] = plan.n_engines
+        self.cmdopts['exec_jobs_per_node'] = plan.jobs_per_node
+        self.cmdopts['exec_plan'] = plan
+
+        # Generators are constructed after the batch criteria reset the
+        # manifest in stage 1 (see BatchManifest), so this is not lost.
+        exp_dirs = self.spec.criteria.gen_exp_dirnames(self.cmdopts)
+        manifest = BatchManifest(self.cmdopts['batch_input_root'])
+        manifest.put({exp: {'exec_plan': plan.to_dict()} for exp in exp_dirs})
+
     def generate_convergence(self, exp_def: XMLLuigi):
         """
         Generate XML changes for calculating swarm convergence.
 
-        Does not write generated changes to the simulation definition pickle
-        file.
+        Only writes generated changes to the simulation definition pickle file
+        if ``--exec-node-cores`` was passed, in which case the # of threads
+        for the simulation is also written.
         """
+        plan = self.cmdopts.get('exec_plan')
+        chgs = XMLAttrChangeSet()
+
+        if plan is not None:
+            n_threads = plan.n_conv_threads
+            exp_def.attr_change(".//system", "threads", str(plan.n_engines))
+            chgs.add(XMLAttrChange(".//system", "threads", str(plan.n_engines)))
+        else:
+            n_threads = self.cmdopts["physics_n_engines"]
+
         # This whole tree can be missing and that's fine
         if exp_def.has_tag(".//loop_functions/convergence"):
             exp_def.attr_change(".//loop_functions/convergence",
                                 "n_threads",
-                                str(self.cmdopts["physics_n_engines"]))
+                                str(n_threads))
+            chgs.add(XMLAttrChange(".//loop_functions/convergence",
+                                   "n_threads",
+                                   str(n_threads)))
+
+        if plan is not None:
+            chgs.pickle(self.spec.exp_def_fpath)
 
     def generate_arena_map(self,
                            exp_def: XMLLuigi,
@@ -116,7 +171,11 @@ class ForagingScenarioGenerator(BaseScenarioGenerator):
         exp_def = super().generate()
 
         # Generate time definitions for TITAN
-        tiutils.generate_time(exp_def, self.cmdopts, self.spec)
+        n_robots = None
+        if exp_def.has_tag(".//arena/distribute/entity"):
+            n_robots = int(exp_def.attr_get(".//arena/distribute/entity", "quantity"))
+
+        tiutils.generate_time(exp_def, self.cmdopts, self.spec, n_robots)
 
         # Generate and apply convergence definitions
         self.generate_convergence(exp_def)
@@ -141,6 +200,7 @@ class ForagingSSGenerator(ForagingScenarioGenerator):
     def __init__(self, *args, **kwargs) -> None:
         ForagingScenarioGenerator.__init__(self, *args, **kwargs)
 
+    @batch_parallel
     def generate(self):
         exp_def = super().generate()
 
@@ -178,6 +238,7 @@ class ForagingDSGenerator(ForagingScenarioGenerator):
     def __init__(self, *args, **kwargs) -> None:
         ForagingScenarioGenerator.__init__(self, *args, **kwargs)
 
+    @batch_parallel
     def generate(self):
         exp_def = super().generate()
 
@@ -215,6 +276,7 @@ class ForagingQSGenerator(ForagingScenarioGenerator):
     def __init__(self, *args, **kwargs) -> None:
         ForagingScenarioGenerator.__init__(self, *args, **kwargs)
 
+    @batch_parallel
     def generate(self):
         exp_def = super().generate()
 
@@ -250,6 +312,7 @@ class ForagingRNGenerator(ForagingScenarioGenerator):
     def __init__(self, *args, **kwargs) -> None:
         ForagingScenarioGenerator.__init__(self, *args, **kwargs)
 
+    @batch_parallel
     def generate(self):
         exp_def = super().generate()
 
@@ -284,6 +347,7 @@ class ForagingPLGenerator(ForagingScenarioGenerator):
     def __init__(self, *args, **kwargs) -> None:
         ForagingScenarioGenerator.__init__(self, *args, **kwargs)
 
+    @batch_parallel
     def generate(self):
         exp_def = super().generate()
 
@@ -306,10 +370,63 @@ class ForagingPLGenerator(ForagingScenarioGenerator):
 
 
 class ExpRunDefUniqueGenerator(PlatformExpRunDefUniqueGenerator):
+    """
+    Generates the XML changes unique to each experimental run in an experiment.
+
+    Only the random seed and the run output directory differ between runs, so
+    the experiment definition is serialized once per experiment with
+    placeholders for them (see :class:`~titerra.projects.common.generators.utils.RunDefTemplate`),
+    and the input files for each run are written by filling them in. The
+    changes for the run are still applied to the experiment definition, so it
+    is complete for anything else which reads it, but it is configured not to
+    write anything, because its files have already been written.
+    """
+    kSEED_PLACEHOLDER = '@@TITERRA_RUN_SEED@@'
+    kLEAF_PLACEHOLDER = '@@TITERRA_RUN_OUTPUT_LEAF@@'
+
+    # The run definition template for the experiment currently being
+    # generated, and the (experiment input root, experiment output root) it
+    # is for. Runs in an experiment are generated in order, so it is rebuilt
+    # at the start of each experiment in the batch, and is never used for a
+    # different version of an experiment definition.
+    template = None  # type: tp.Optional[tp.Tuple[tp.Tuple[str, str], tiutils.RunDefTemplate]]
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
     def generate(self, exp_def: XMLLuigi):
+        key = (os.path.dirname(self.launch_stem_path),
+               os.path.dirname(self.run_output_path))
+
+        if self.run_num == 0 or self.template is None or self.template[0] != key:
+            type(self).template = (key, self._template_create(exp_def, key))
+
+        self.generate_changes(exp_def)
+
+        values = {self.kSEED_PLACEHOLDER: str(self.random_seed),
+                  self.kLEAF_PLACEHOLDER: os.path.basename(self.run_output_path)}
+        self.template[1].write(values, self.launch_stem_path)
+        exp_def.write_config_set(XMLWriterConfig([]))
+
+    def _template_create(self,
+                         exp_def: XMLLuigi,
+                         key: tp.Tuple[str, str]) -> tiutils.RunDefTemplate:
+        placeholders = type(self)(self.run_num,
+                                  os.path.join(key[1], self.kLEAF_PLACEHOLDER),
+                                  self.launch_stem_path,
+                                  self.kSEED_PLACEHOLDER,
+                                  self.cmdopts)
+        template_def = copy.deepcopy(exp_def)
+        placeholders.generate_changes(template_def)
+        return tiutils.RunDefTemplate(template_def,
+                                      os.path.basename(self.launch_stem_path),
+                                      [self.kSEED_PLACEHOLDER,
+                                       self.kLEAF_PLACEHOLDER])
+
+    def generate_changes(self, exp_def: XMLLuigi) -> None:
+        """
+        Apply the changes for this run to the experiment definition.
+        """
         super().generate(exp_def)
 
         tiutils.generate_random(exp_def,
@@ -0,0 +1,148 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+
+"""
+Planning how the cores on a node are divided between concurrent ARGoS runs and
+the threads within each run.
+"""
+
+# Core packages
+import math
+import typing as tp
+
+# 3rd party packages
+
+# Project packages
+from titerra.projects.common.variables.batch_manifest import BatchManifest
+
+# The # of physics engines of a single type which can be mapped to an extent
+kVALID_N_ENGINES = [1, 2, 4, 6, 8, 12, 16, 24]
+
+# Fraction of the time ARGoS spends in a timestep which is parallelized across
+# physics engines (one thread/engine).
+kPHYSICS_PARALLEL_FRACTION = 0.9
+
+
+class ExecPlan():
+    """
+    How to run the experimental runs in an experiment on a node.
+
+    Attributes:
+        n_engines: # physics engines (and ARGoS threads) per run.
+
+        n_conv_threads: # threads per run for convergence calculations.
+
+        jobs_per_node: # runs to execute concurrently on a node.
+    """
+
+    def __init__(self, n_engines: int, n_conv_threads: int, jobs_per_node: int) -> None:
+        self.n_engines = n_engines
+        self.n_conv_threads = n_conv_threads
+        self.jobs_per_node = jobs_per_node
+
+    def to_dict(self) -> tp.Dict[str, int]:
+        return {'n_engines': self.n_engines,
+                'n_conv_threads': self.n_conv_threads,
+                'jobs_per_node': self.jobs_per_node}
+
+    @staticmethod
+    def from_dict(d: tp.Dict[str, int]) -> 'ExecPlan':
+        return ExecPlan(d['n_engines'], d['n_conv_threads'], d['jobs_per_node'])
+
+    def __repr__(self) -> str:
+        return "{0}({1})".format(self.__class__.__name__, self.to_dict())
+
+
+class ExecPlanner():
+    """
+    Chooses the # of physics engines per run and the # of concurrent runs per
+    node together to minimize the time to execute all runs in an experiment on
+    a node with a fixed # of cores, without oversubscribing them.
+
+    The speedup from using more engines per run follows Amdahl's law, so
+    running more runs concurrently with fewer engines each is generally
+    better, until there are fewer runs than cores. Convergence is calculated
+    between timesteps, when the physics engine threads are idle, so it can use
+    all of the cores allocated to a run.
+
+    Attributes:
+        n_cores: # cores per node.
+
+        n_runs: # runs per experiment.
+
+        max_engines: Maximum # physics engines per run, if any.
+    """
+
+    def __init__(self,
+                 n_cores: int,
+                 n_runs: int,
+                 max_engines: tp.Optional[int] = None,
+                 parallel_fraction: float = kPHYSICS_PARALLEL_FRACTION) -> None:
+        self.n_cores = n_cores
+        self.n_runs = n_runs
+        self.max_engines = max_engines
+        self.parallel_fraction = parallel_fraction
+
+    def __call__(self) -> ExecPlan:
+        candidates = [n for n in kVALID_N_ENGINES
+                      if n <= self.n_cores and (self.max_engines is None or n <= self.max_engines)]
+
+        # Always at least 1 run with 1 engine, even if that oversubscribes
+        if not candidates:
+            return ExecPlan(1, 1, 1)
+
+        def cost(n_engines: int) -> tp.Tuple[float, int]:
+            jobs = self._jobs_calc(n_engines)
+            waves = math.ceil(self.n_runs / jobs)
+
+            # Time relative to running a single run with 1 engine, then # cores
+            # used as a tiebreaker.
+            return (waves / self._speedup(n_engines), jobs * n_engines)
+
+        n_engines = min(candidates, key=cost)
+        jobs = self._jobs_calc(n_engines)
+
+        return ExecPlan(n_engines, max(n_engines, self.n_cores // jobs), jobs)
+
+    def _jobs_calc(self, n_engines: int) -> int:
+        return max(1, min(self.n_runs, self.n_cores // n_engines))
+
+    def _speedup(self, n_engines: int) -> float:
+        return 1.0 / ((1.0 - self.parallel_fraction) + self.parallel_fraction / n_engines)
+
+
+def plan_load(batch_input_root: str) -> tp.Optional[ExecPlan]:
+    """
+    Get the plan recorded in the batch manifest during stage 1, if there is one
+    (i.e., if ``--exec-node-cores`` was passed), so that later stages which are
+    run separately execute the batch the way it was generated for.
+    """
+    plans = BatchManifest(batch_input_root).values('exec_plan')
+    if not plans:
+        return None
+
+    first = next(iter(plans.values()))
+    assert all(p == first for p in plans.values()), \
+        "Experiments in {0} generated with different execution plans".format(batch_input_root)
+
+    return ExecPlan.from_dict(first)
+
+
+__api__ = [
+    'ExecPlan',
+    'ExecPlanner',
+    'plan_load'
+]
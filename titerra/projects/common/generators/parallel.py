@@ -0,0 +1,132 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+
+"""
+Parallel generation of experiment definitions in stage 1.
+
+SIERRA asks the scenario generator for each experiment in the batch for its
+definition one at a time, but the experiment definitions are independent, and
+the per-experiment template files and pickles they are built from are all in
+place before the first one is requested. So, the first time a scenario
+generator is asked for an experiment definition, the definitions for it and
+all following experiments in the batch are generated in a process pool, and
+the rest are handed out from there as SIERRA asks for them.
+
+Each definition is generated by exactly the same code as when generating
+serially, and experiments only write to their own pickle files, so the
+generated input files are identical. Generation is serial if
+``--processing-serial`` was passed.
+"""
+
+# Core packages
+import os
+import multiprocessing as mp
+import functools
+import typing as tp
+import logging  # type: ignore
+
+# 3rd party packages
+from sierra.core.xml import XMLLuigi
+from sierra.core.experiment.spec import ExperimentSpec
+
+# Project packages
+
+# Generated experiment definitions which have not been asked for yet, by
+# (generator function, experiment input root).
+_prefetched = {}  # type: tp.Dict[tp.Tuple[tp.Any, str], XMLLuigi]
+
+# The generator function and the generator for the first experiment whose
+# definition was asked for, inherited by the worker processes.
+_proto = None  # type: tp.Optional[tp.Tuple[tp.Callable, tp.Any]]
+
+
+def batch_parallel(generate: tp.Callable[[tp.Any], XMLLuigi]) -> tp.Callable[[tp.Any], XMLLuigi]:
+    """
+    Decorator for the ``generate()`` method of scenario generators, which
+    generates the definitions for all remaining experiments in the batch in
+    parallel the first time it is called.
+    """
+    @functools.wraps(generate)
+    def wrapper(self) -> XMLLuigi:
+        key = (generate, self.spec.exp_input_root)
+        if key not in _prefetched:
+            _prefetch(generate, self)
+
+        return _prefetched.pop(key)
+
+    return wrapper
+
+
+def _prefetch(generate: tp.Callable[[tp.Any], XMLLuigi], generator: tp.Any) -> None:
+    global _proto
+
+    criteria = generator.spec.criteria
+    cmdopts = generator.cmdopts
+    exp_nums = list(range(generator.spec.exp_num,
+                          len(criteria.gen_exp_dirnames(cmdopts))))
+
+    if cmdopts.get('processing_serial', False):
+        n_procs = 1
+    else:
+        n_procs = min(mp.cpu_count(), len(exp_nums))
+
+    if n_procs <= 1:
+        _prefetched[(generate, generator.spec.exp_input_root)] = generate(generator)
+        return
+
+    logging.getLogger(__name__).debug("Generating definitions for exp%s-exp%s with %s processes",
+                                      exp_nums[0],
+                                      exp_nums[-1],
+                                      n_procs)
+
+    # The batch criteria and generators are created dynamically, and so
+    # can't be pickled to send them to the workers; they inherit them
+    # instead.
+    _proto = (generate, generator)
+    try:
+        with mp.get_context('fork').Pool(processes=n_procs) as pool:
+            defs = pool.map(_generate_exp, exp_nums)
+    finally:
+        _proto = None
+
+    for exp_num, exp_def in zip(exp_nums, defs):
+        exp_input_root = os.path.join(cmdopts['batch_input_root'],
+                                      criteria.gen_exp_dirnames(cmdopts)[exp_num])
+        _prefetched[(generate, exp_input_root)] = exp_def
+
+
+def _generate_exp(exp_num: int) -> XMLLuigi:
+    assert _proto is not None, "No generator to generate experiment from"
+    generate, proto = _proto
+
+    if exp_num == proto.spec.exp_num:
+        return generate(proto)
+
+    spec = ExperimentSpec(proto.spec.criteria, exp_num, proto.cmdopts)
+    kwargs = dict(proto.kwargs)
+    kwargs['template_input_file'] = os.path.join(spec.exp_input_root,
+                                                 os.path.basename(proto.template_input_file))
+
+    generator = type(proto)(spec=spec,
+                            controller=proto.controller,
+                            cmdopts=proto.cmdopts,
+                            **kwargs)
+    return generate(generator)
+
+
+__api__ = [
+    'batch_parallel'
+]
@@ -52,7 +52,10 @@ class ForagingScenarioGenerator(BaseScenarioGenerator):
         exp_def = super().generate()
 
         # Generate and apply time definitions for TITAN
-        tiutils.generate_time(exp_def, self.cmdopts, self.spec)
+        tiutils.generate_time(exp_def,
+                              self.cmdopts,
+                              self.spec,
+                              self.cmdopts.get('n_robots'))
 
         return exp_def
 
@@ -20,6 +20,9 @@ Extensions to the :class:`~sierra.core.generators.ExpCreator` and
 
 # Core packages
 import os
+import re
+import tempfile
+import typing as tp
 
 # 3rd party packages
 from sierra.core.xml import XMLLuigi
@@ -33,14 +36,22 @@ from titerra.projects.common.variables import exp_setup
 
 def generate_time(exp_def: XMLLuigi,
                   cmdopts: types.Cmdopts,
-                  spec: ExperimentSpec) -> None:
+                  spec: ExperimentSpec,
+                  n_robots: tp.Optional[int] = None) -> None:
     """
-    Generates XML changes for setting up time in TITAN.
+    Generates XML changes for setting up time in TITAN, including applying the
+    metric output budget, if there is one, for the specified swarm size (1 if
+    it is not known).
 
     Writes generated changes to the simulation definition pickle file.
     """
     tsetup = exp_setup.factory(cmdopts['exp_setup'])()
 
+    if tsetup.has_budget():
+        tsetup.budget_apply(exp_def,
+                            n_robots or 1,
+                            spec.arena_dim.xsize() * spec.arena_dim.ysize())
+
     _, adds, chgs = scutils.apply_to_expdef(tsetup, exp_def)
     scutils.pickle_modifications(adds, chgs, spec.exp_def_fpath)
 
@@ -88,3 +99,72 @@ def generate_output(exp_def: XMLLuigi,
     exp_def.attr_change(".//loop_functions/output",
                         "output_parent",
                         parent)
+
+
+class RunDefTemplate():
+    """
+    The input files for an experiment, serialized once with placeholders for the
+    attribute values which differ between the experimental runs in it (random
+    seeds, output paths, etc.), so that the input files for each run can be
+    written by substituting its values into the placeholders instead of
+    re-serializing the whole experiment definition.
+
+    Arguments:
+        exp_def: The experiment definition, with all per-run attributes set to
+                 placeholders. Written out to create the template, so it should
+                 not be used afterwards.
+
+        stem_leaf: The leaf of the launch file stem path for the run.
+
+        placeholders: The placeholders used in the experiment definition.
+    """
+
+    def __init__(self,
+                 exp_def: XMLLuigi,
+                 stem_leaf: str,
+                 placeholders: tp.List[str]) -> None:
+        self.placeholders = placeholders
+        pattern = re.compile(b'(' + b'|'.join(re.escape(p.encode('utf-8'))
+                                              for p in placeholders) + b')')
+
+        # The experiment definition can be written to multiple files, so
+        # write it the normal way and see what we get.
+        self.files = {}  # type: tp.Dict[str, tp.List[bytes]]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exp_def.write(os.path.join(tmpdir, stem_leaf))
+
+            for leaf in sorted(os.listdir(tmpdir)):
+                with open(os.path.join(tmpdir, leaf), 'rb') as f:
+                    self.files[leaf[len(stem_leaf):]] = pattern.split(f.read())
+
+    def write(self, values: tp.Dict[str, str], base_path: str) -> None:
+        """
+        Write the input files for an experimental run, with the specified
+        (placeholder, value) pairs, to the same paths the experiment definition
+        would have been written to.
+        """
+        encoded = {p.encode('utf-8'): _escape_attr(values[p]).encode('utf-8')
+                   for p in self.placeholders}
+
+        for suffix, chunks in self.files.items():
+            # Even chunks are literal; odd chunks are placeholders
+            with open(base_path + suffix, 'wb') as f:
+                f.write(b''.join(c if i % 2 == 0 else encoded[c]
+                                 for i, c in enumerate(chunks)))
+
+
+def _escape_attr(value: str) -> str:
+    """
+    Escape an XML attribute value exactly as :mod:`xml.etree.ElementTree` does
+    when serializing.
+    """
+    for char, entity in [('&', '&amp;'),
+                         ('<', '&lt;'),
+                         ('>', '&gt;'),
+                         ('"', '&quot;'),
+                         ('\r', '&#13;'),
+                         ('\n', '&#10;'),
+                         ('\t', '&#09;')]:
+        value = value.replace(char, entity)
+
+    return value
@@ -0,0 +1,78 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Deferred importing of 3rd party packages which are expensive to import and only
+needed for some pipeline stages, so that every SIERRA invocation does not pay
+for them when the plugin is loaded.
+
+Usage is the same as a regular module import::
+
+  si = lazy_import('scipy.integrate')
+
+  res = si.solve_ivp(...)  # scipy.integrate is imported here
+
+Annotations which refer to a lazily imported module need to be quoted, or they
+will import it when the function is defined.
+"""
+
+# Core packages
+import importlib
+import sys
+import types
+import typing as tp
+
+# 3rd party packages
+
+# Project packages
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module which imports it the first time one of its
+    attributes is accessed, and from then on behaves exactly like it.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+
+    def __getattr__(self, attr: str) -> tp.Any:
+        # Only called for attributes which are not in __dict__, so after the
+        # first call every access goes directly to the imported module's
+        # attributes.
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __dir__(self) -> tp.List[str]:
+        return dir(importlib.import_module(self.__name__))
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Get the module with the specified name, importing it on first use if it has
+    not been imported already.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    return LazyModule(name)
+
+
+__api__ = [
+    'LazyModule',
+    'lazy_import'
+]
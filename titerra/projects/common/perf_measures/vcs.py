@@ -24,16 +24,18 @@ import typing as tp
 import logging
 
 # 3rd party packages
-import fastdtw
 import pandas as pd
 import numpy as np
-import similaritymeasures as sm
 
 from sierra.core import types, utils, storage, config
 import sierra.core.config
 
 # Project packages
-from titerra.projects.common.variables.temporal_variance_parser import TemporalVarianceParser
+from titerra.projects.common.lazy_import import lazy_import
+
+# Only needed to calculate curve similarity during stage 4
+fastdtw = lazy_import('fastdtw')
+sm = lazy_import('similaritymeasures')
 
 
 def method_xlabel(method: str) -> str:
@@ -73,6 +75,28 @@ def method_ylabel(method: str, arg: tp.Any) -> str:
     return labels[method]
 
 
+def variance_criteria(criteria):
+    """
+    Get the temporal variance criteria the applied variances for a batch are
+    calculated from: the batch criteria itself if it is univariate, and
+    whichever of its two dimensions is temporal variance if it is bivariate.
+
+    The experiment definitions for a bivariate batch contain the changes from
+    both of its dimensions, so the waveforms for any experiment in it can be
+    calculated by the temporal variance criteria from its directory in the
+    batch.
+    """
+    # Checked by attribute, because the temporal variance criteria can't be
+    # imported here without a circular import.
+    for c in [criteria,
+              getattr(criteria, 'criteria1', None),
+              getattr(criteria, 'criteria2', None)]:
+        if hasattr(c, 'waveforms'):
+            return c
+
+    assert False, "No temporal variance in batch criteria '{0}'".format(criteria.cli_arg)
+
+
 class EnvironmentalCS():
     """Compute the Variance Curve Similarity (VCS) measure between the ideal
     conditions of exp0 and the specified experiment.
@@ -95,27 +119,19 @@ class EnvironmentalCS():
     def __call__(self,
                  criteria,
                  exp_dirs: tp.Optional[tp.List[str]] = None) -> float:
-        ideal_var_df = DataFrames.expx_var_df(self.cmdopts,
-                                              criteria,
-                                              exp_dirs,
-                                              self.main_config['sierra']['perf']['intra_tv_environment_csv'],
-                                              0)
-        expx_var_df = DataFrames.expx_var_df(self.cmdopts,
-                                             criteria,
-                                             exp_dirs,
-                                             self.main_config['sierra']['perf']['intra_tv_environment_csv'],
-                                             self.exp_num)
-
-        attr = TemporalVarianceParser()(criteria.cli_arg)
-
-        xlen = len(expx_var_df[attr["variance_csv_col"]].values)
-        exp_data = np.zeros((xlen, 2))
-        exp_data[:, 0] = expx_var_df["clock"].values
-        exp_data[:, 1] = expx_var_df[attr["variance_csv_col"]].values
-
-        ideal_data = np.zeros((xlen, 2))
-        ideal_data[:, 0] = ideal_var_df["clock"].values
-        ideal_data[:, 1] = ideal_var_df[attr["variance_csv_col"]].values
+        if exp_dirs is None:
+            exp_dirs = criteria.gen_exp_dirnames(self.cmdopts)
+
+        # The applied variances are fully determined by the batch criteria, so
+        # they don't need to be read from the simulation outputs.
+        tv_criteria = variance_criteria(criteria)
+        clock = tv_criteria.waveform_clock(self.cmdopts, exp_dirs)
+        ideal_var, expx_var = tv_criteria.waveforms(self.cmdopts,
+                                                    clock,
+                                                    [exp_dirs[0], exp_dirs[self.exp_num]])
+
+        exp_data = np.column_stack((clock, expx_var))
+        ideal_data = np.column_stack((clock, ideal_var))
         return CSRaw()(exp_data=exp_data,
                        ideal_data=ideal_data,
                        method=self.cmdopts["envc_cs_method"])
@@ -185,12 +201,8 @@ class AdaptabilityCS():
         self.main_config = main_config
 
         self.perf_csv_col = main_config['sierra']['perf']['intra_perf_col']
-        self.var_csv_col = TemporalVarianceParser()(
-            self.criteria.cli_arg)['variance_csv_col']
         self.perf_leaf = self.main_config['sierra']['perf']['intra_perf_csv'].split('.')[
             0]
-        self.tv_env_leaf = self.main_config['sierra']['perf']['intra_tv_environment_csv'].split('.')[
-            0]
 
     def from_batch(self,
                    ideal_num: int,
@@ -228,7 +240,10 @@ class AdaptabilityCS():
                                                sierra.core.config.kStatsExtensions['mean'],
                                                exp_num)
 
-        return self._calc_waveforms(ideal_num, ideal_perf_df, expx_perf_df, exp_dirs)
+        return self._calc_waveforms(ideal_num,
+                                    ideal_perf_df[self.perf_csv_col],
+                                    expx_perf_df[self.perf_csv_col],
+                                    exp_dirs)
 
     def _waveforms_from_batch(self,
                               ideal_num: int,
@@ -248,32 +263,18 @@ class AdaptabilityCS():
         experiment. Returns NP arrays rather than dataframes, because that is what the curve
         similarity measure calculator needs as input.
         """
+        if exp_dirs is None:
+            exp_dirs = self.criteria.gen_exp_dirnames(self.cmdopts)
 
-        # Variance can always be read from the averaged outputs, because the
-        # same variance was applied to all simulations.
-        ideal_var_df = DataFrames.expx_var_df(self.cmdopts,
-                                              self.criteria,
-                                              exp_dirs,
-                                              self.tv_env_leaf +
-                                              sierra.core.config.kStatsExtensions['mean'],
-                                              ideal_num)
-
-        ideal_df = pd.DataFrame(index=ideal_var_df.index,
-                                columns=[self.perf_csv_col])
+        # Same clock as the applied variances are calculated at
+        clock = variance_criteria(self.criteria).waveform_clock(self.cmdopts,
+                                                                exp_dirs,
+                                                                len(ideal_perf_df))
 
         # The performance curve of an adaptable system should resist all changes
         # in the environment, and be the same as exp0
-        ideal_df = ideal_perf_df
-
-        xlen = len(ideal_var_df[self.var_csv_col].values)
-
-        exp_data = np.zeros((xlen, 2))
-        exp_data[:, 0] = ideal_var_df['clock'].values
-        exp_data[:, 1] = expx_perf_df.values
-
-        ideal_data = np.zeros((xlen, 2))
-        ideal_data[:, 0] = ideal_var_df['clock'].values
-        ideal_data[:, 1] = ideal_df.values
+        exp_data = np.column_stack((clock, np.asarray(expx_perf_df.values, dtype=float)))
+        ideal_data = np.column_stack((clock, np.asarray(ideal_perf_df.values, dtype=float)))
         return ideal_data, exp_data
 
 
@@ -308,12 +309,8 @@ class ReactivityCS():
         self.exp_num = exp_num
 
         self.perf_csv_col = self.main_config['sierra']['perf']['intra_perf_col']
-        self.var_csv_col = TemporalVarianceParser()(criteria.cli_arg)[
-            'variance_csv_col']
         self.perf_leaf = self.main_config['sierra']['perf']['intra_perf_csv'].split('.')[
             0]
-        self.tv_env_leaf = self.main_config['sierra']['perf']['intra_tv_environment_csv'].split('.')[
-            0]
 
     def from_batch(self,
                    ideal_perf_df: pd.DataFrame,
@@ -369,23 +366,19 @@ class ReactivityCS():
 
         """
 
-        # Variance can always be read from the averaged outputs, because the same variance was
-        # applied to all simulations.
-        ideal_var_df = DataFrames.expx_var_df(self.cmdopts,
-                                              self.criteria,
-                                              exp_dirs,
-                                              self.tv_env_leaf +
-                                              sierra.core.config.kStatsExtensions['mean'],
-                                              self.ideal_num)
-        expx_var_df = DataFrames.expx_var_df(self.cmdopts,
-                                             self.criteria,
-                                             exp_dirs,
-                                             self.tv_env_leaf +
-                                             sierra.core.config.kStatsExtensions['mean'],
-                                             self.exp_num)
-
-        ideal_df = pd.DataFrame(index=ideal_var_df.index,
-                                columns=[self.perf_csv_col])
+        if exp_dirs is None:
+            exp_dirs = self.criteria.gen_exp_dirnames(self.cmdopts)
+
+        # The applied variances are fully determined by the batch criteria, so
+        # they don't need to be read from the simulation outputs.
+        tv_criteria = variance_criteria(self.criteria)
+        clock = tv_criteria.waveform_clock(self.cmdopts,
+                                           exp_dirs,
+                                           len(ideal_perf_df))
+        ideal_var, expx_var = tv_criteria.waveforms(self.cmdopts,
+                                                    clock,
+                                                    [exp_dirs[self.ideal_num],
+                                                     exp_dirs[self.exp_num]])
 
         # The performance curve of a reactive system should respond proportionally to both adverse
         # and beneficial changes in the environment.
@@ -395,24 +388,11 @@ class ReactivityCS():
         # observed to increase by an amount proportional to that difference, as the system reacts
         # the drop in penalties. Vice versa for an increase penalty in the experiment for a timestep
         # t vs. the amount imposed during the ideal conditions experiment.
-        for i in ideal_perf_df.index:
-            ideal_var = ideal_var_df.loc[i, self.var_csv_col]
-            expx_var = expx_var_df.loc[i, self.var_csv_col]
-            ideal_perf = ideal_perf_df.iloc[i]
-
-            scale_factor = self.criteria.calc_reactivity_scaling(
-                ideal_var, expx_var)
+        scale_factor = tv_criteria.calc_reactivity_scaling(ideal_var, expx_var)
 
-            ideal_df.loc[i, self.perf_csv_col] = ideal_perf * scale_factor
-
-        xlen = len(ideal_var_df[self.var_csv_col].values)
-        exp_data = np.zeros((xlen, 2))
-        exp_data[:, 0] = ideal_var_df['clock'].values
-        exp_data[:, 1] = expx_perf_df.iloc[:].values
-
-        ideal_data = np.zeros((xlen, 2))
-        ideal_data[:, 0] = ideal_var_df['clock'].values
-        ideal_data[:, 1] = ideal_df.loc[:, self.perf_csv_col].values
+        exp_data = np.column_stack((clock, np.asarray(expx_perf_df.values, dtype=float)))
+        ideal_data = np.column_stack((clock,
+                                      np.asarray(ideal_perf_df.values, dtype=float) * scale_factor))
 
         return ideal_data, exp_data
 
@@ -466,27 +446,6 @@ class CSRaw():
 
 
 class DataFrames:
-    @staticmethod
-    def expx_var_df(cmdopts: types.Cmdopts,
-                    criteria,
-                    exp_dirs: tp.Optional[tp.List[str]],
-                    tv_environment_csv: str,
-                    exp_num: int) -> pd.DataFrame:
-        if exp_dirs is None:
-            dirs = criteria.gen_exp_dirnames(cmdopts)
-        else:
-            dirs = exp_dirs
-
-        path = os.path.join(cmdopts['batch_stat_root'],
-                            dirs[exp_num],
-                            tv_environment_csv)
-        try:
-            return storage.DataFrameReader('storage.csv')(path)
-        except (FileNotFoundError, IndexError):
-            logging.fatal("%s does not exist for exp num %s",
-                          path,
-                          exp_num)
-
     @staticmethod
     def expx_perf_df(cmdopts: types.Cmdopts,
                      criteria,
@@ -510,6 +469,7 @@ class DataFrames:
 
 
 __api__ = [
+    'variance_criteria',
     'EnvironmentalCS',
     'RawPerfCS',
     'AdaptabilityCS',
@@ -0,0 +1,150 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Caching of merged YAML configuration as JSON, so that it only needs to be parsed
+and merged once, rather than once per SIERRA invocation.
+"""
+
+# Core packages
+import os
+import json
+import hashlib
+import logging  # type: ignore
+import typing as tp
+
+# 3rd party packages
+import yaml
+from sierra.core import types
+
+# Project packages
+
+# Use the libyaml bindings if PyYAML was built with them; they are much faster.
+kYAMLLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Bump when the format of cached configuration changes
+kCACHE_VERSION = 1
+
+
+def yaml_load(path: str) -> types.YAMLDict:
+    """
+    Load a YAML file which only contains plain data (i.e., no python object
+    tags).
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, kYAMLLoader)
+
+
+def cache_root() -> str:
+    """
+    The directory cached configuration is stored in:
+    ``$TITERRA_CACHE_DIR`` if set, and ``$XDG_CACHE_HOME/titerra`` (or
+    ``~/.cache/titerra``) otherwise.
+    """
+    if os.environ.get('TITERRA_CACHE_DIR'):
+        return os.environ['TITERRA_CACHE_DIR']
+
+    xdg = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'),
+                                                        '.cache'))
+    return os.path.join(xdg, 'titerra')
+
+
+class ConfigCache():
+    """
+    Cache of configuration built from a set of source files, keyed by their
+    contents; any change to a source file (including it being created or
+    removed) means that the configuration is rebuilt from them the next time
+    it is needed.
+
+    The cache is best effort: if it can't be read or written, the
+    configuration is built from the sources, same as if there was no cache.
+
+    Attributes:
+        name: Name for the configuration, unique to the code which builds it.
+
+        sources: Paths to all files the configuration is built from.
+    """
+
+    def __init__(self, name: str, sources: tp.List[str]) -> None:
+        self.name = name
+        self.sources = sources
+        self.logger = logging.getLogger(__name__)
+
+        # Different sets of sources (e.g., for different projects) get
+        # different cache entries.
+        paths_hash = hashlib.sha256('\n'.join(sources).encode('utf-8')).hexdigest()
+        self.prefix = '{0}-{1}'.format(name, paths_hash[:12])
+
+    def __call__(self, build: tp.Callable[[], tp.Dict[str, tp.Any]]) -> tp.Dict[str, tp.Any]:
+        root = cache_root()
+        path = os.path.join(root, '{0}-{1}.json'.format(self.prefix,
+                                                       self._contents_hash()))
+
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+            self.logger.debug("Loaded cached %s config from %s", self.name, path)
+            return config
+        except (OSError, ValueError):
+            pass
+
+        config = build()
+
+        try:
+            self._write(root, path, config)
+        except OSError as e:
+            self.logger.debug("Could not cache %s config: %s", self.name, e)
+
+        return config
+
+    def _contents_hash(self) -> str:
+        h = hashlib.sha256(str(kCACHE_VERSION).encode('utf-8'))
+
+        for src in self.sources:
+            h.update(src.encode('utf-8'))
+            if os.path.exists(src):
+                with open(src, 'rb') as f:
+                    h.update(f.read())
+            else:
+                h.update(b'\0')
+
+        return h.hexdigest()
+
+    def _write(self, root: str, path: str, config: tp.Dict[str, tp.Any]) -> None:
+        os.makedirs(root, exist_ok=True)
+
+        # Entries for previous versions of the sources will never be used
+        # again.
+        for leaf in os.listdir(root):
+            if (leaf.startswith(self.prefix) and leaf.endswith('.json') and
+                    leaf != os.path.basename(path)):
+                try:
+                    os.remove(os.path.join(root, leaf))
+                except FileNotFoundError:
+                    pass
+
+        # Concurrent invocations can be building the same config, so never
+        # leave a partially written file where they can see it.
+        tmp_path = '{0}.{1}'.format(path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f)
+        os.replace(tmp_path, path)
+
+
+__api__ = [
+    'ConfigCache',
+    'yaml_load',
+    'cache_root'
+]
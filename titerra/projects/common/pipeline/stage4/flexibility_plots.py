@@ -30,7 +30,6 @@ import typing as tp
 import pandas as pd
 from sierra.core.variables.batch_criteria import BatchCriteria
 from sierra.core.utils import types, storage
-import sierra.core.plugin_manager as pm
 
 # Project packages
 import titerra.projects.common.perf_measures.vcs as vcs
@@ -65,10 +64,6 @@ class FlexibilityPlotsCSVGenerator:
         self.perf_csv_col = main_config['sierra']['perf']['intra_perf_col']
 
     def __call__(self, criteria) -> None:
-        tv = pm.module_load_tiered(self.cmdopts['project'],
-                                   'variables.temporal_variance_parser')
-        tv_attr = tv.TemporalVarianceParser()(criteria.def_str)
-
         res = re.search("exp[0-9]+", self.cmdopts['exp_output_root'])
         assert res is not None, "Unexpected experiment output dir name '{0}'".format(
             self.cmdopts['exp_output_root'])
@@ -85,29 +80,11 @@ class FlexibilityPlotsCSVGenerator:
                                       0,
                                       exp_num)
 
-        expx_perf = vcs.DataFrames.expx_perf_df(self.cmdopts,
-                                                criteria,
-                                                None,
-                                                self.main_config['sierra']['perf']['intra_perf_csv'],
-                                                exp_num)[self.perf_csv_col].values
-
-        exp0_var = vcs.DataFrames.expx_var_df(self.cmdopts,
-                                              criteria,
-                                              None,
-                                              self.main_config['sierra']['perf']['intra_tv_environment_csv'],
-                                              0)[tv_attr['variance_csv_col']]
-
-        expx_var = vcs.DataFrames.expx_var_df(self.cmdopts,
-                                              criteria,
-                                              None,
-                                              self.main_config['sierra']['perf']['intra_tv_environment_csv'],
-                                              exp_num)[tv_attr['variance_csv_col']]
-
-        expx_perf = vcs.DataFrames.expx_perf_df(self.cmdopts,
-                                                criteria,
-                                                None,
-                                                self.main_config['sierra']['perf']['intra_perf_csv'],
-                                                exp_num)[self.perf_csv_col]
+        expx_perf_df = vcs.DataFrames.expx_perf_df(self.cmdopts,
+                                                   criteria,
+                                                   None,
+                                                   self.main_config['sierra']['perf']['intra_perf_csv'],
+                                                   exp_num)
 
         exp0_perf = vcs.DataFrames.expx_perf_df(self.cmdopts,
                                                 criteria,
@@ -115,17 +92,24 @@ class FlexibilityPlotsCSVGenerator:
                                                 self.main_config['sierra']['perf']['intra_perf_csv'],
                                                 0)[self.perf_csv_col]
 
+        # The applied variances are computed from the batch criteria rather
+        # than read from the simulation outputs, at the same timesteps the
+        # ideal waveforms are calculated at.
+        exp_dirs = criteria.gen_exp_dirnames(self.cmdopts)
+        clock = criteria.waveform_clock(self.cmdopts,
+                                        exp_dirs,
+                                        len(expx_perf_df.index))
+        exp0_var, expx_var = criteria.waveforms(self.cmdopts,
+                                                clock,
+                                                [exp_dirs[0], exp_dirs[exp_num]])
+
         df = pd.DataFrame(
             {
-                'clock': vcs.DataFrames.expx_perf_df(self.cmdopts,
-                                                     criteria,
-                                                     None,
-                                                     self.main_config['sierra']['perf']['intra_perf_csv'],
-                                                     exp_num)['clock'].values,
-                'expx_perf': expx_perf.values,
-                'expx_var': expx_var.values,
+                'clock': clock,
+                'expx_perf': expx_perf_df[self.perf_csv_col].values,
+                'expx_var': expx_var,
                 'exp0_perf': exp0_perf.values,
-                'exp0_var': exp0_var.values,
+                'exp0_var': exp0_var,
                 'ideal_reactivity': reactivity.waveforms_for_example_plots()[0][:, 1],
                 'ideal_adaptability': adaptability.waveforms_for_example_plots(0, exp_num)[0][:, 1]
             }
@@ -16,55 +16,72 @@
 
 # Core packages
 import os
+import inspect
 import typing as tp
 
 # 3rd party packages
-import yaml
 import sierra.core.pipeline.stage4.yaml_config_loader as ycl
 from sierra.core import types, utils
 
 # Project packages
+from titerra.projects.common.pipeline.stage4 import config_cache
 
 
 class YAMLConfigLoader(ycl.YAMLConfigLoader):
     """
     Load YAML config common to all projects in TITAN.
+
+    The merged config is cached (see
+    :class:`~titerra.projects.common.pipeline.stage4.config_cache.ConfigCache`),
+    so it is only loaded from the YAML files when they (or the code which
+    merges them) change. Derived classes for specific projects extend
+    :meth:`_sources()` and :meth:`_load()`.
     """
 
     def __init__(self) -> None:
         super().__init__()
 
     def __call__(self, cmdopts: types.Cmdopts) -> tp.Dict[str, types.YAMLDict]:
-        inter_LN_config = {}
-        intra_LN_config = {}
-        intra_HM_config = {}
+        # The code which merges the config is a source too, so that changes to
+        # it are picked up.
+        code = [inspect.getfile(cls) for cls in type(self).__mro__
+                if cls.__module__.startswith('titerra')]
+        cache = config_cache.ConfigCache(type(self).__module__,
+                                         code + self._sources(cmdopts))
+
+        return cache(lambda: self._load(cmdopts))
 
+    def _sources(self, cmdopts: types.Cmdopts) -> tp.List[str]:
         common_config_root = os.path.abspath(os.path.join(cmdopts['project_root'],
                                                           '..',
                                                           'common',
                                                           'config'))
-        common_intra_LN = os.path.join(common_config_root,
-                                       'intra-graphs-line.yaml')
-        common_intra_HM = os.path.join(common_config_root,
-                                       'intra-graphs-hm.yaml')
-        common_inter_LN = os.path.join(common_config_root,
-                                       'inter-graphs-line.yaml')
+        return [os.path.join(common_config_root, 'intra-graphs-line.yaml'),
+                os.path.join(common_config_root, 'intra-graphs-hm.yaml'),
+                os.path.join(common_config_root, 'inter-graphs-line.yaml')]
+
+    def _load(self, cmdopts: types.Cmdopts) -> tp.Dict[str, types.YAMLDict]:
+        inter_LN_config = {}
+        intra_LN_config = {}
+        intra_HM_config = {}
+
+        common_intra_LN, common_intra_HM, common_inter_LN = self._sources(cmdopts)[:3]
 
         # Load TITAN base/common config
         if utils.path_exists(common_intra_LN):
             self.logger.info(
                 "Loading intra-experiment linegraph config for TITAN")
-            intra_LN_config = yaml.load(open(common_intra_LN), yaml.FullLoader)
+            intra_LN_config = config_cache.yaml_load(common_intra_LN)
 
         if utils.path_exists(common_intra_HM):
             self.logger.info(
                 "Loading intra-experiment heatmap config for TITAN")
-            intra_HM_config = yaml.load(open(common_intra_HM), yaml.FullLoader)
+            intra_HM_config = config_cache.yaml_load(common_intra_HM)
 
         if utils.path_exists(common_inter_LN):
             self.logger.info(
                 "Loading inter-experiment linegraph config for TITAN")
-            inter_LN_config = yaml.load(open(common_inter_LN), yaml.FullLoader)
+            inter_LN_config = config_cache.yaml_load(common_inter_LN)
 
         return {
             'intra_LN': intra_LN_config,
@@ -82,25 +82,20 @@ class RectangularArena():
         correctly set up the simulation with the specified area size/shape.
         """
         if not self.attr_changes:
-            grid_changes = [XMLAttrChangeSet(XMLAttrChange(".//arena_map/grid2D",
-                                                           "dims",
-                                                           "{0}, {1}, 2".format(extent.xsize(),
-                                                                                extent.ysize())),
-                                             XMLAttrChange(".//perception/grid2D", "dims",
-                                                           "{0}, {1}, 2".format(extent.xsize(),
-                                                                                extent.ysize())),
-                                             )
-                            for extent in self.extents]
+            # The i-th set of shape changes is for the i-th extent, so each
+            # experiment only gets the changes for its own arena.
             shape_changes = self.shapes.gen_attr_changelist()
-            self.attr_changes = [XMLAttrChangeSet() for extent in self.extents]
-            for achgs in self.attr_changes:
-                for gchgs in grid_changes:
-                    achgs |= gchgs
-                for schgs in shape_changes:
-                    achgs |= schgs
+            self.attr_changes = [self._gen_chgs_for_extent(extent) | schgs
+                                 for extent, schgs in zip(self.extents, shape_changes)]
 
         return self.attr_changes
 
+    @staticmethod
+    def _gen_chgs_for_extent(extent: ArenaExtent) -> XMLAttrChangeSet:
+        dims = "{0}, {1}, 2".format(extent.xsize(), extent.ysize())
+        return XMLAttrChangeSet(XMLAttrChange(".//arena_map/grid2D", "dims", dims),
+                                XMLAttrChange(".//perception/grid2D", "dims", dims))
+
     def gen_tag_rmlist(self) -> tp.List[XMLTagRmList]:
         if not self.tag_rms:
             for arena in self.nests.keys():
@@ -0,0 +1,243 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Compact manifest of per-experiment scalar parameters for a batch experiment,
+so that graph ticks/labels and performance measures do not need to unpickle
+every experiment definition each time they are needed.
+"""
+
+# Core packages
+import os
+import json
+import fcntl
+import typing as tp
+
+# 3rd party packages
+from sierra.core.xml import XMLAttrChangeSet
+from sierra.core import types
+import sierra.core.config
+
+# Project packages
+
+# Manifests loaded by this process, by path
+_loaded = {}  # type: tp.Dict[str, tp.Dict[str, tp.Any]]
+
+# (manifest path, exp dir, key) entries checked against their experiment
+# definitions by this process
+_validated = set()  # type: tp.Set[tp.Tuple[str, str, str]]
+
+
+class BatchManifest():
+    """
+    Per-experiment scalar parameters stored as a JSON file in the batch root
+    (the parent of the batch input root). It can't be in the batch input root
+    itself, because SIERRA checks that it only contains experiment
+    directories when the batch is regenerated.
+
+    Parameters written during stage 1 from the batch criteria are valid until
+    stage 1 is run again. Parameters which can only be computed from the
+    complete experiment definition are computed the first time they are
+    needed, and are valid until the definition changes; they are checked
+    against it once per process.
+
+    Several processes can update the manifest concurrently during stage 4, so
+    updates are merged into the manifest on disk while holding a lock on it,
+    rather than overwriting it with what this process has loaded.
+
+    During stage 1, the manifest is reset when the batch criteria pickle the
+    experiment definitions (see :class:`ManifestCriteria`), which SIERRA does
+    before it constructs the generators for each experiment; parameters
+    written by generators (e.g., the execution plan) are therefore written
+    after the reset, and are not lost.
+    """
+    kLEAF = 'batch-manifest.json'
+
+    def __init__(self, batch_input_root: str) -> None:
+        self.batch_input_root = batch_input_root
+        self.path = os.path.join(os.path.dirname(batch_input_root), self.kLEAF)
+
+    def reset(self) -> None:
+        """
+        Remove all parameters, so that stage 1 is idempotent.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        _loaded[self.path] = {}
+        for v in [v for v in _validated if v[0] == self.path]:
+            _validated.discard(v)
+
+    def put(self, exp_params: tp.Dict[str, tp.Dict[str, tp.Any]]) -> None:
+        """
+        Add parameters which remain valid until the batch is regenerated, as
+        a dictionary of (experiment dir, (parameter, value) dictionary)
+        pairs.
+        """
+        self._update({exp: {key: {'value': value, 'mtime': None}
+                            for key, value in params.items()}
+                      for exp, params in exp_params.items()})
+
+    def get(self,
+            key: str,
+            exp_dirs: tp.List[str],
+            calc: tp.Callable[[str], tp.Any]) -> tp.List[tp.Any]:
+        """
+        Get a parameter for each of the specified experiments, computing it
+        for an experiment from its directory name if it is not in the
+        manifest.
+        """
+        data = self._data()
+        updates = {}  # type: tp.Dict[str, tp.Dict[str, tp.Any]]
+
+        for exp in exp_dirs:
+            if (self.path, exp, key) in _validated:
+                continue
+
+            entry = data.get(exp, {}).get(key)
+            mtime = os.path.getmtime(self._exp_def_path(exp))
+
+            if entry is None or entry['mtime'] not in [None, mtime]:
+                updates[exp] = {key: {'value': calc(exp), 'mtime': mtime}}
+
+            _validated.add((self.path, exp, key))
+
+        if updates:
+            data = self._update(updates)
+
+        return [data[exp][key]['value'] for exp in exp_dirs]
+
+    def values(self, key: str) -> tp.Dict[str, tp.Any]:
+        """
+        Get a parameter for all experiments it is in the manifest for, as a
+        dictionary of (experiment dir, value) pairs, without checking it
+        against their definitions. Only for parameters which are put during
+        stage 1, when the experiment dirs might not be known.
+        """
+        return {exp: params[key]['value']
+                for exp, params in self._data().items() if key in params}
+
+    def exp_def(self, exp: str) -> XMLAttrChangeSet:
+        return XMLAttrChangeSet.unpickle(self._exp_def_path(exp))
+
+    def _exp_def_path(self, exp: str) -> str:
+        return os.path.join(self.batch_input_root,
+                            exp,
+                            sierra.core.config.kPickleLeaf)
+
+    def _data(self) -> tp.Dict[str, tp.Any]:
+        if self.path not in _loaded:
+            _loaded[self.path] = self._read()
+
+        return _loaded[self.path]
+
+    def _read(self) -> tp.Dict[str, tp.Any]:
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                return json.load(f)
+
+        return {}
+
+    def _update(self,
+                updates: tp.Dict[str, tp.Dict[str, tp.Any]]) -> tp.Dict[str, tp.Any]:
+        """
+        Merge the specified (experiment dir, (parameter, entry) dictionary)
+        pairs into the manifest on disk, and return the merged manifest.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # Other processes may have updated the manifest since this process
+        # loaded it, so merge into what is on disk now, and don't let them
+        # update it while we are.
+        with open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            data = self._read()
+            for exp, entries in updates.items():
+                data.setdefault(exp, {}).update(entries)
+
+            # Never leave a partially written file where readers can see it.
+            tmp_path = '{0}.{1}'.format(self.path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, self.path)
+
+        _loaded[self.path] = data
+        return data
+
+
+class ManifestCriteria():
+    """
+    Mixin for univariate batch criteria which writes the per-experiment scalar
+    parameters returned by :meth:`manifest_params()` to the
+    :class:`BatchManifest` during stage 1, and serves
+    :meth:`populations()` from it.
+
+    Must come before the batch criteria base class in the list of bases.
+    """
+
+    def manifest_params(self, exp_def: XMLAttrChangeSet) -> tp.Dict[str, tp.Any]:
+        """
+        Calculate the scalar parameters for an experiment. Only the changes
+        from the batch criteria are present during stage 1, so the parameters
+        can only depend on those.
+        """
+        return {}
+
+    def manifest(self) -> BatchManifest:
+        return BatchManifest(self.batch_input_root)
+
+    def manifest_get(self,
+                     cmdopts: types.Cmdopts,
+                     key: str,
+                     exp_dirs: tp.Optional[tp.List[str]] = None,
+                     calc: tp.Optional[tp.Callable[[XMLAttrChangeSet], tp.Any]] = None) -> tp.List[tp.Any]:
+        """
+        Get a parameter for each of the specified experiments (all experiments
+        if None). If ``calc`` is None, the parameter must be one of the
+        :meth:`manifest_params()`.
+        """
+        if exp_dirs is None:
+            exp_dirs = self.gen_exp_dirnames(cmdopts)
+
+        if calc is None:
+            def calc(exp_def): return self.manifest_params(exp_def)[key]
+
+        manifest = self.manifest()
+        return manifest.get(key, exp_dirs, lambda exp: calc(manifest.exp_def(exp)))
+
+    def pickle_exp_defs(self, cmdopts: types.Cmdopts) -> None:
+        super().pickle_exp_defs(cmdopts)
+
+        # SIERRA calls this before constructing the generators for each
+        # experiment, so resetting here does not remove parameters they put.
+        manifest = self.manifest()
+        manifest.reset()
+        manifest.put({exp: self.manifest_params(chgs)
+                      for exp, chgs in zip(self.gen_exp_dirnames(cmdopts),
+                                           self.gen_attr_changelist())})
+
+    def populations(self,
+                    cmdopts: types.Cmdopts,
+                    exp_dirs: tp.Optional[tp.List[str]] = None) -> tp.List[int]:
+        if exp_dirs is None:
+            exp_dirs = self.gen_exp_dirnames(cmdopts)
+
+        # The swarm size is generally not set by the batch criteria, so it
+        # can't be computed during stage 1.
+        base = super()
+        return self.manifest().get('population',
+                                   exp_dirs,
+                                   lambda exp: base.populations(cmdopts, [exp])[0])
@@ -21,7 +21,6 @@ for usage documentation.
 
 # Core packages
 import typing as tp
-import os
 
 # 3rd party packages
 import implements
@@ -35,10 +34,11 @@ import sierra.core.config
 import sierra.core.variables.batch_criteria as bc
 
 # Project packages
+from titerra.projects.common.variables.batch_manifest import ManifestCriteria
 
 
 @implements.implements(bc.IConcreteBatchCriteria)
-class BlockConstantDensity(cd.ConstantDensity):
+class BlockConstantDensity(ManifestCriteria, cd.ConstantDensity):
     """
     A univariate range specifiying the block density (ratio of block count to
     arena size) to hold constant as arena size is increased. This class is a
@@ -101,18 +101,7 @@ class BlockConstantDensity(cd.ConstantDensity):
     def graph_xticks(self,
                      cmdopts: types.Cmdopts,
                      exp_dirs: tp.Optional[tp.List[str]] = None) -> tp.List[float]:
-        if exp_dirs is None:
-            exp_dirs = self.gen_exp_dirnames(cmdopts)
-
-        areas = []
-        for d in exp_dirs:
-            pkl_path = os.path.join(self.batch_input_root,
-                                    d,
-                                    sierra.core.config.kPickleLeaf)
-            exp_def = XMLAttrChangeSet.unpickle(pkl_path)
-            areas.append(sierra.core.utils.extract_arena_dims(exp_def).area())
-
-        return areas
+        return self.manifest_get(cmdopts, 'arena_area', exp_dirs)
 
     def graph_xticklabels(self,
                           cmdopts: types.Cmdopts,
@@ -125,6 +114,9 @@ class BlockConstantDensity(cd.ConstantDensity):
     def pm_query(self, pm: str) -> bool:
         return pm in ['raw']
 
+    def manifest_params(self, exp_def: XMLAttrChangeSet) -> tp.Dict[str, tp.Any]:
+        return {'arena_area': sierra.core.utils.extract_arena_dims(exp_def).area()}
+
 
 def factory(cli_arg: str,
             main_config: tp.Dict[str, str],
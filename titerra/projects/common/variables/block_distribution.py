@@ -26,6 +26,7 @@ import implements
 # Project packages
 from sierra.core.variables.base_variable import IBaseVariable
 from sierra.core.utils import ArenaExtent
+from sierra.core.vector import Vector3D
 from sierra.core.xml import XMLAttrChangeSet, XMLTagRmList, XMLTagAddList, XMLTagRm, XMLTagAdd, XMLAttrChange
 
 
@@ -63,21 +64,55 @@ class BaseDistribution():
     def gen_files(self) -> None:
         pass
 
+    def source_extents(self, arena_dim: ArenaExtent) -> tp.List[ArenaExtent]:
+        """
+        Get the extents of the block sources for the distribution in an arena
+        of the specified size, as laid out by the block distributor in COSM;
+        empty if blocks are not distributed in fixed sources.
+        """
+        return []
+
+    @staticmethod
+    def _source_extent(arena_dim: ArenaExtent,
+                       xfrac: tp.Tuple[float, float],
+                       yfrac: tp.Tuple[float, float]) -> ArenaExtent:
+        ll = Vector3D(arena_dim.ll.x + xfrac[0] * arena_dim.xsize(),
+                      arena_dim.ll.y + yfrac[0] * arena_dim.ysize())
+        ur = Vector3D(arena_dim.ll.x + xfrac[1] * arena_dim.xsize(),
+                      arena_dim.ll.y + yfrac[1] * arena_dim.ysize())
+        return ArenaExtent(dims=ur - ll, origin=ll)
+
 
 class SingleSourceDistribution(BaseDistribution):
     def __init__(self) -> None:
         super().__init__("single_source")
 
+    def source_extents(self, arena_dim: ArenaExtent) -> tp.List[ArenaExtent]:
+        # At the opposite end of the arena from the nest
+        return [self._source_extent(arena_dim, (0.80, 0.90), (0.10, 0.90))]
+
 
 class DualSourceDistribution(BaseDistribution):
     def __init__(self) -> None:
         super().__init__("dual_source")
 
+    def source_extents(self, arena_dim: ArenaExtent) -> tp.List[ArenaExtent]:
+        # At both ends of the arena, on either side of the nest
+        return [self._source_extent(arena_dim, (0.10, 0.20), (0.10, 0.90)),
+                self._source_extent(arena_dim, (0.80, 0.90), (0.10, 0.90))]
+
 
 class QuadSourceDistribution(BaseDistribution):
     def __init__(self) -> None:
         super().__init__("quad_source")
 
+    def source_extents(self, arena_dim: ArenaExtent) -> tp.List[ArenaExtent]:
+        # Along each of the 4 sides of the arena, around the nest
+        return [self._source_extent(arena_dim, (0.10, 0.20), (0.40, 0.60)),
+                self._source_extent(arena_dim, (0.80, 0.90), (0.40, 0.60)),
+                self._source_extent(arena_dim, (0.40, 0.60), (0.10, 0.20)),
+                self._source_extent(arena_dim, (0.40, 0.60), (0.80, 0.90))]
+
 
 class PowerLawDistribution(BaseDistribution):
     def __init__(self, arena_dim: ArenaExtent) -> None:
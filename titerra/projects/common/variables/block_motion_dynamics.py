@@ -20,22 +20,20 @@ Classes for the block motion batch criteria. See
 
 # Core packages
 import typing as tp
-import os
 
 # 3rd party packages
 import implements
 from sierra.core.variables import batch_criteria as bc
-import sierra.core.utils
 from sierra.core.xml import XMLAttrChangeSet, XMLAttrChange
 from sierra.core import types
-import sierra.core.config
 
 # Project packages
 import titerra.projects.common.variables.dynamics_parser as dp
+from titerra.projects.common.variables.batch_manifest import ManifestCriteria
 
 
 @implements.implements(bc.IConcreteBatchCriteria)
-class BlockMotionDynamics(bc.UnivarBatchCriteria):
+class BlockMotionDynamics(ManifestCriteria, bc.UnivarBatchCriteria):
     """
     A univariate range of block motion dynamics used to define batched experiments. This class is a
     base class which should (almost) never be used on its own. Instead, the ``factory()`` function
@@ -73,18 +71,7 @@ class BlockMotionDynamics(bc.UnivarBatchCriteria):
     def graph_xticks(self,
                      cmdopts: types.Cmdopts,
                      exp_dirs: tp.Optional[tp.List[str]] = None) -> tp.List[float]:
-        if exp_dirs is None:
-            exp_dirs = self.gen_exp_dirnames(cmdopts)
-
-        ticks = []
-
-        for d in exp_dirs:
-            exp_def = XMLAttrChangeSet.unpickle(os.path.join(self.batch_input_root,
-                                                             d,
-                                                             sierra.core.config.kPickleLeaf))
-            ticks.append(BlockMotionDynamics.calc_xtick(exp_def))
-
-        return ticks
+        return self.manifest_get(cmdopts, 'xtick', exp_dirs)
 
     def graph_xticklabels(self,
                           cmdopts: types.Cmdopts,
@@ -101,6 +88,9 @@ class BlockMotionDynamics(bc.UnivarBatchCriteria):
     def inter_exp_graphs_exclude_exp0(self) -> bool:
         return False
 
+    def manifest_params(self, exp_def: XMLAttrChangeSet) -> tp.Dict[str, tp.Any]:
+        return {'xtick': BlockMotionDynamics.calc_xtick(exp_def)}
+
     @staticmethod
     def calc_xtick(exp_def):
         policy = None
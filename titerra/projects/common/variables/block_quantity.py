@@ -23,21 +23,19 @@ Classes for the block quantity batch criteria. See
 import typing as tp
 import re
 import math
-import os
 
 # 3rd party packages
 import implements
 from sierra.core.variables import batch_criteria as bc
-import sierra.core.utils
 from sierra.core.xml import XMLAttrChangeSet, XMLAttrChange
 from sierra.core import types
-import sierra.core.config
 
 # Project packages
+from titerra.projects.common.variables.batch_manifest import ManifestCriteria
 
 
 @implements.implements(bc.IConcreteBatchCriteria)
-class BlockQuantity(bc.UnivarBatchCriteria):
+class BlockQuantity(ManifestCriteria, bc.UnivarBatchCriteria):
     """
     A univariate range of block counts used to define batched experiments. This
     class is a base class which should (almost) never be used on its
@@ -80,20 +78,7 @@ class BlockQuantity(bc.UnivarBatchCriteria):
                      cmdopts: types.Cmdopts,
                      exp_dirs: tp.Optional[tp.List[str]] = None) -> tp.List[float]:
 
-        if exp_dirs is None:
-            exp_dirs = self.gen_exp_dirnames(cmdopts)
-
-        quantities = []
-
-        for d in exp_dirs:
-            pkl_path = os.path.join(self.batch_input_root,
-                                    d,
-                                    sierra.core.config.kPickleLeaf)
-            exp_def = XMLAttrChangeSet.unpickle(pkl_path)
-            for path, attr, value in exp_def:
-                if path == ".//arena_map/blocks/distribution/manifest" and attr == "n_" + self.block_type:
-                    quantities.append(float(value))
-        return quantities
+        return self.manifest_get(cmdopts, 'n_' + self.block_type, exp_dirs)
 
     def graph_xticklabels(self,
                           cmdopts: types.Cmdopts,
@@ -110,6 +95,13 @@ class BlockQuantity(bc.UnivarBatchCriteria):
     def inter_exp_graphs_exclude_exp0(self) -> bool:
         return False
 
+    def manifest_params(self, exp_def: XMLAttrChangeSet) -> tp.Dict[str, tp.Any]:
+        for path, attr, value in exp_def:
+            if path == ".//arena_map/blocks/distribution/manifest" and attr == "n_" + self.block_type:
+                return {attr: float(value)}
+
+        return {}
+
     @staticmethod
     def gen_attr_changelist_from_list(quantities: list, block_type: str) -> tp.List[XMLAttrChangeSet]:
         return [XMLAttrChangeSet(XMLAttrChange(".//arena_map/blocks/distribution/manifest",
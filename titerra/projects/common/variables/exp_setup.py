@@ -20,11 +20,13 @@ See :ref:`ln-var-expsetup` for documentation and usage.
 
 # Core packages
 import typing as tp
+import re
+import math
 
 # 3rd party packages
 import implements
 from sierra.core.variables.base_variable import IBaseVariable
-from sierra.core.xml import XMLAttrChangeSet, XMLAttrChange, XMLTagRmList, XMLTagAddList
+from sierra.core.xml import XMLAttrChangeSet, XMLAttrChange, XMLTagRmList, XMLTagAddList, XMLLuigi
 from sierra.core.variables import exp_setup as exp
 from sierra.core import config
 
@@ -38,33 +40,158 @@ three-dimensional data, as compared to the output interval for 1D data.
 
 """
 
+kBYTES_PER_ROW = 256
+"""
+Approximate size of a single datapoint from a single robot (or from the whole
+swarm, for metrics which are aggregated in simulation) for a collector of
+one-dimensional data.
+"""
+
+kBYTES_PER_CELL = 8
+"""
+Approximate size of a single datapoint for a single cell of the arena for a
+collector of two- or three-dimensional data.
+"""
+
+kGRID_RESOLUTION_DEFAULT = 0.2
+"""
+Default resolution of the arena grid, if it is not in the experiment definition.
+"""
+
+kSINK_NETWORK = ".//output/metrics/sinks/network/stream"
+kSINK_APPEND = ".//output/metrics/sinks/file/append"
+kSINK_TRUNCATE = ".//output/metrics/sinks/file/truncate"
+kSINK_CREATE = ".//output/metrics/sinks/file/create"
+
 
 @implements.implements(IBaseVariable)
 class TimeSetup():
-    def __init__(self, n_secs_per_run: int, metric_interval: int) -> None:
+    """
+    Defines the duration of each experimental run and the output intervals for
+    the metric sinks.
+
+    If an output budget is specified, then the output interval for each sink is
+    increased as needed to keep the output from each of its collectors within
+    the budget, which is either a maximum # of datapoints, or an equal share of
+    the maximum # of bytes for the run, after :meth:`budget_apply()` is called
+    with the experiment to apply it to. Output intervals are never decreased
+    below their defaults.
+
+    Attributes:
+        n_secs_per_run: The duration of each run in seconds.
+
+        metric_interval: The default output interval for 1D metrics.
+
+        n_ticks_per_sec: # timesteps per second.
+
+        budget_bytes: The maximum # bytes of metrics to output per run, if any.
+
+        budget_datapoints: The maximum # datapoints to output per collector per
+                           run, if any.
+    """
+    @staticmethod
+    def extract_metric_interval(exp_def: XMLAttrChangeSet) -> tp.Optional[int]:
+        """
+        Extract and return the output interval (in timesteps) for 1D metrics
+        for the specified experiment, if it was set.
+        """
+        for path, attr, value in exp_def:
+            if 'sinks/file/append' in path and attr == 'output_interval':
+                return int(float(value))
+
+        return None
+
+    def __init__(self,
+                 n_secs_per_run: int,
+                 metric_interval: int,
+                 n_ticks_per_sec: int = config.kARGoS['n_ticks_per_sec'],
+                 budget_bytes: tp.Optional[int] = None,
+                 budget_datapoints: tp.Optional[int] = None) -> None:
         self.n_secs_per_run = n_secs_per_run
         self.metric_interval = metric_interval
+        self.n_ticks_per_sec = n_ticks_per_sec
+        self.budget_bytes = budget_bytes
+        self.budget_datapoints = budget_datapoints
         self.attr_changes = []
 
+        self.intervals = {
+            # 2022/4/7: Network metrics are streamed to the master every
+            # timestep for simplicity; this may be revisited in the future
+            # if needed. It seemed better to make this change here than to
+            # have the C++ code ignore what is set here and always do 1.
+            kSINK_NETWORK: 1,
+            kSINK_APPEND: self.metric_interval,
+            kSINK_TRUNCATE: self.metric_interval,
+            kSINK_CREATE: max(1, self.metric_interval / kND_DATA_DIVISOR_DEFAULT)
+        }  # type: tp.Dict[str, tp.Union[int, float]]
+
+    def has_budget(self) -> bool:
+        return self.budget_bytes is not None or self.budget_datapoints is not None
+
+    def budget_apply(self,
+                     exp_def: XMLLuigi,
+                     n_robots: int,
+                     arena_area: float) -> None:
+        """
+        Set the output interval for each sink so that the output from each of
+        its collectors in the specified experiment fits in the budget.
+
+        Metrics streamed over the network are per-robot, so their size scales
+        with the swarm size; metrics of two- or three-dimensional data scale
+        with the # of cells in the arena. Collectors writing to the truncate
+        sink overwrite their output each interval, so their size does not
+        depend on it, and it is not changed, though their size still counts
+        against the byte budget.
+        """
+        if not self.has_budget():
+            return
+
+        n_timesteps = self.n_secs_per_run * self.n_ticks_per_sec
+
+        resolution = kGRID_RESOLUTION_DEFAULT
+        if exp_def.has_tag(".//arena_map/grid2D"):
+            resolution = float(exp_def.attr_get(".//arena_map/grid2D", "resolution"))
+
+        n_cells = max(1, int(arena_area / resolution ** 2))
+
+        # Bytes per datapoint for each collector in each budgeted sink
+        dp_sizes = {
+            kSINK_NETWORK: kBYTES_PER_ROW * n_robots,
+            kSINK_APPEND: kBYTES_PER_ROW,
+            kSINK_CREATE: kBYTES_PER_CELL * n_cells
+        }
+        n_collectors = {sink: self._n_collectors(exp_def, sink)
+                        for sink in list(dp_sizes.keys()) + [kSINK_TRUNCATE]}
+
+        if self.budget_bytes is not None:
+            fixed = n_collectors[kSINK_TRUNCATE] * kBYTES_PER_CELL * n_cells
+            n_budgeted = sum(n_collectors[sink] for sink in dp_sizes)
+            share = max(0, self.budget_bytes - fixed) / max(1, n_budgeted)
+        else:
+            share = None
+
+        for sink, dp_size in dp_sizes.items():
+            if n_collectors[sink] == 0:
+                continue
+
+            interval = self.intervals[sink]
+
+            if self.budget_datapoints is not None:
+                interval = max(interval, n_timesteps / self.budget_datapoints)
+
+            if share is not None:
+                if share > 0:
+                    interval = max(interval, n_timesteps * dp_size / share)
+                else:
+                    interval = n_timesteps
+
+            self.intervals[sink] = min(n_timesteps, int(math.ceil(interval)))
+
     def gen_attr_changelist(self) -> tp.List[XMLAttrChangeSet]:
         if not self.attr_changes:
             self.attr_changes = [XMLAttrChangeSet(
-                # 2022/4/7: Network metrics are streamed to the master every
-                # timestep for simplicity; this may be revisited in the future
-                # if needed. It seemed better to make this change here than to
-                # have the C++ code ignore what is set here and always do 1.
-                XMLAttrChange(".//output/metrics/sinks/network/stream",
-                              "output_interval",
-                              "{0}".format(1)),
-                XMLAttrChange(".//output/metrics/sinks/file/append",
-                              "output_interval",
-                              "{0}".format(self.metric_interval)),
-                XMLAttrChange(".//output/metrics/sinks/file/truncate",
-                              "output_interval",
-                              "{0}".format(self.metric_interval)),
-                XMLAttrChange(".//output/metrics/sinks/file/create",
-                              "output_interval",
-                              "{0}".format(max(1, self.metric_interval / kND_DATA_DIVISOR_DEFAULT))))]
+                *[XMLAttrChange(sink, "output_interval", "{0}".format(interval))
+                  for sink, interval in self.intervals.items()])]
 
         return self.attr_changes
 
@@ -77,9 +204,48 @@ class TimeSetup():
     def gen_files(self) -> None:
         pass
 
+    @staticmethod
+    def _n_collectors(exp_def: XMLLuigi, sink: str) -> int:
+        if not exp_def.has_tag(sink):
+            return 0
+
+        return len([attr for attr in exp_def.root.find(sink).attrib
+                    if attr != 'output_interval'])
+
 
 class Parser(exp.Parser):
-    pass
+    """
+    Extends the SIERRA parser for ``--exp-setup`` with an optional output
+    budget as the last section: ``B<n>`` for at most <n> bytes of metrics per
+    run (with an optional ``K``, ``M``, or ``G`` suffix), or ``D<n>`` for at
+    most <n> datapoints per collector per run.
+    """
+    kMULTIPLIERS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+    def __call__(self, arg: str) -> tp.Dict[str, tp.Any]:
+        sections = arg.split('.')
+        budget_bytes = None
+        budget_datapoints = None
+
+        # The first section is the variable name and the second the duration,
+        # neither of which can be a budget.
+        if len(sections) > 2:
+            bytes_res = re.fullmatch(r"B(\d+)([KMG]?)", sections[-1])
+            dp_res = re.fullmatch(r"D(\d+)", sections[-1])
+
+            if bytes_res is not None:
+                budget_bytes = int(bytes_res.group(1)) * self.kMULTIPLIERS[bytes_res.group(2)]
+                sections = sections[:-1]
+            elif dp_res is not None:
+                budget_datapoints = int(dp_res.group(1))
+                assert budget_datapoints > 0, \
+                    "Bad datapoint budget in section '{0}'".format(dp_res.group(0))
+                sections = sections[:-1]
+
+        ret = super().__call__('.'.join(sections))
+        ret['budget_bytes'] = budget_bytes
+        ret['budget_datapoints'] = budget_datapoints
+        return ret
 
 
 def factory(arg: str) -> TimeSetup:
@@ -97,7 +263,10 @@ def factory(arg: str) -> TimeSetup:
     def __init__(self) -> None:
         TimeSetup.__init__(self,
                            attr["n_secs_per_run"],
-                           int(attr["n_secs_per_run"] * attr['n_ticks_per_sec'] / attr["n_datapoints"]))
+                           int(attr["n_secs_per_run"] * attr['n_ticks_per_sec'] / attr["n_datapoints"]),
+                           attr['n_ticks_per_sec'],
+                           attr['budget_bytes'],
+                           attr['budget_datapoints'])
 
     return type(attr['pretty_name'],  # type: ignore
                 (TimeSetup,),
@@ -106,5 +275,7 @@ def factory(arg: str) -> TimeSetup:
 
 __api__ = [
     'kND_DATA_DIVISOR_DEFAULT',
+    'kBYTES_PER_ROW',
+    'kBYTES_PER_CELL',
     'TimeSetup',
 ]
@@ -20,23 +20,21 @@
 
 # Core packages
 import typing as tp
-import os
 
 # 3rd party packages
 import implements
 from sierra.core.variables import batch_criteria as bc
-import sierra.core.utils
 from sierra.core.xml import XMLAttrChange, XMLAttrChangeSet, XMLLuigi
-import sierra.core.config
 import sierra.plugins.platform.argos.variables.exp_setup as ts
 from sierra.core import types
 
 # Project packages
 import titerra.projects.common.variables.dynamics_parser as dp
+from titerra.projects.common.variables.batch_manifest import ManifestCriteria
 
 
 @implements.implements(bc.IConcreteBatchCriteria)
-class PopulationDynamics(bc.UnivarBatchCriteria):
+class PopulationDynamics(ManifestCriteria, bc.UnivarBatchCriteria):
     """A univariate range of population dynamics used to define batched
     experiments. This class is a base class which should (almost) never be used
     on its own. Instead, the ``factory()`` function should be used to
@@ -105,30 +103,18 @@ class PopulationDynamics(bc.UnivarBatchCriteria):
         if exp_dirs is None:
             exp_dirs = self.gen_exp_dirnames(cmdopts)
 
-        ticks = []
-
-        exp0_def = XMLAttrChangeSet.unpickle(os.path.join(self.batch_input_root,
-                                                          exp_dirs[0],
-                                                          sierra.core.config.kPickleLeaf))
-        T_Sbar0 = PopulationDynamics.calc_untasked_swarm_system_time(exp0_def)
-
-        for d in exp_dirs:
-            exp_def = XMLAttrChangeSet.unpickle(os.path.join(self.batch_input_root,
-                                                             d,
-                                                             sierra.core.config.kPickleLeaf))
-
-            # If we had pure death dynamics, the tasked swarm time is 0 in the
-            # steady state, so we use lambda_d as the ticks instead, which is
-            # somewhat more meaningful.
-            if self.is_pure_death_dynamics():
-                lambda_d, _, _, _ = PopulationDynamics.extract_rate_params(
-                    exp_def)
-                ticks.append(lambda_d)
-            else:
-                T_Sbar = PopulationDynamics.calc_untasked_swarm_system_time(
-                    exp_def)
-
-                ticks.append(round(T_Sbar0 / T_Sbar, 4))
+        # If we had pure death dynamics, the tasked swarm time is 0 in the
+        # steady state, so we use lambda_d as the ticks instead, which is
+        # somewhat more meaningful.
+        if self.is_pure_death_dynamics():
+            ticks = self.manifest_get(cmdopts, 'lambda_d', exp_dirs)
+        else:
+            # The time setup is not part of the batch criteria, so this can't
+            # be computed during stage 1.
+            calc = PopulationDynamics.calc_untasked_swarm_system_time
+            T_Sbar0 = self.manifest_get(cmdopts, 'T_Sbar', exp_dirs[:1], calc)[0]
+            ticks = [round(T_Sbar0 / T_Sbar, 4)
+                     for T_Sbar in self.manifest_get(cmdopts, 'T_Sbar', exp_dirs, calc)]
 
         return list(map(str, ticks))
 
@@ -147,6 +133,10 @@ class PopulationDynamics(bc.UnivarBatchCriteria):
     def is_pure_death_dynamics(self) -> bool:
         return 'D' in self.dynamics_types and 'B' not in self.dynamics_types
 
+    def manifest_params(self, exp_def: XMLAttrChangeSet) -> tp.Dict[str, tp.Any]:
+        lambda_d, _, _, _ = PopulationDynamics.extract_rate_params(exp_def)
+        return {'lambda_d': lambda_d}
+
     @staticmethod
     def calc_untasked_swarm_system_time(exp_def: XMLAttrChangeSet) -> float:
         params = ts.ARGoSExpSetup.extract_time_params(exp_def)
@@ -25,6 +25,7 @@ import logging
 
 # 3rd party packages
 import implements
+import numpy as np
 import sierra.core.variables.batch_criteria as bc
 from sierra.plugins.platform.argos.variables.population_size import PopulationSize
 from sierra.core.xml import XMLAttrChange, XMLAttrChangeSet
@@ -33,10 +34,12 @@ from sierra.core import types
 # Project packages
 from titerra.projects.common.perf_measures import vcs
 from titerra.projects.common.variables.temporal_variance_parser import TemporalVarianceParser
+from titerra.projects.common.variables.batch_manifest import ManifestCriteria
+from titerra.projects.common.variables import waveform, exp_setup
 
 
 @implements.implements(bc.IConcreteBatchCriteria)
-class TemporalVariance(bc.UnivarBatchCriteria):
+class TemporalVariance(ManifestCriteria, bc.UnivarBatchCriteria):
     """
     A univariate range specifiying the set of temporal variances (and possibly
     swarm size) to use to define the batched experiment. This class is a base
@@ -80,6 +83,7 @@ class TemporalVariance(bc.UnivarBatchCriteria):
         self.variances = variances
         self.population = population
         self.attr_changes = []  # type: tp.List[XMLAttrChangeSet]
+        self.xticks = {}  # type: tp.Dict[tp.Tuple[str, tp.Tuple[str, ...]], tp.List[float]]
 
     def gen_attr_changelist(self) -> tp.List[XMLAttrChangeSet]:
         """
@@ -117,14 +121,19 @@ class TemporalVariance(bc.UnivarBatchCriteria):
 
         return self.attr_changes
 
-    def calc_reactivity_scaling(self, ideal_var: float, expx_var: float) -> float:
+    def calc_reactivity_scaling(self,
+                                ideal_var: tp.Union[float, np.ndarray],
+                                expx_var: tp.Union[float, np.ndarray]) -> tp.Union[float, np.ndarray]:
+        """
+        Calculate how much the performance of a reactive system should be
+        scaled by for the variance in an experiment, relative to the ideal
+        variance. Works elementwise on arrays of variances.
+        """
         # For motion throttling while robots carry blocks, the variances are always percents between
-        # 0 and 1.
+        # 0 and 1. Performance should decrease by the amount the throttling
+        # increases, and vice versa.
         if self.variance_type in ['BC', 'M']:
-            if expx_var > ideal_var:
-                return 1.0 - abs(expx_var - ideal_var)
-            else:  # expx_var <= ideal_var:
-                return 1.0 + abs(expx_var - ideal_var)
+            return 1.0 - (expx_var - ideal_var)
         elif self.variance_type == 'BM':
             return ideal_var / expx_var
 
@@ -142,10 +151,15 @@ class TemporalVariance(bc.UnivarBatchCriteria):
         if exp_dirs is None:
             exp_dirs = self.gen_exp_dirnames(cmdopts)
 
-        m = len(exp_dirs)
+        # The ticks are computed from the waveform parameters, and so are
+        # available as soon as stage 1 has run.
+        key = (cmdopts['envc_cs_method'], tuple(exp_dirs))
+        if key not in self.xticks:
+            m = len(exp_dirs)
+            self.xticks[key] = [round(vcs.EnvironmentalCS(self.main_config, cmdopts, x)(self, exp_dirs), 4)
+                                for x in range(0, m)]
 
-        return [round(vcs.EnvironmentalCS(self.main_config, cmdopts, x)(self, exp_dirs), 4)
-                for x in range(0, m)]
+        return self.xticks[key]
 
     def graph_xticklabels(self,
                           cmdopts: types.Cmdopts,
@@ -164,6 +178,56 @@ class TemporalVariance(bc.UnivarBatchCriteria):
     def inter_exp_graphs_exclude_exp0(self) -> bool:
         return True
 
+    def waveforms(self,
+                  cmdopts: types.Cmdopts,
+                  clock: np.ndarray,
+                  exp_dirs: tp.Optional[tp.List[str]] = None) -> np.ndarray:
+        """
+        Calculate the variance applied in each of the specified experiments
+        (all experiments if None) at each of the specified timesteps, as an
+        array with one row per experiment.
+        """
+        params = self.manifest_get(cmdopts, 'waveform', exp_dirs)
+        return waveform.synthesize(params, clock)
+
+    def waveform_clock(self,
+                       cmdopts: types.Cmdopts,
+                       exp_dirs: tp.Optional[tp.List[str]] = None,
+                       n_datapoints: tp.Optional[int] = None) -> np.ndarray:
+        """
+        Calculate the timesteps at which 1D metrics are output during each
+        simulation, which are the same for all experiments. If
+        ``n_datapoints`` is not None, only the timesteps for the first
+        ``n_datapoints`` outputs are returned.
+        """
+        if exp_dirs is None:
+            exp_dirs = self.gen_exp_dirnames(cmdopts)
+
+        tsetup = exp_setup.factory(cmdopts['exp_setup'])()
+
+        # The output interval can be changed from the default when the
+        # experiment definitions are generated.
+        interval = self.manifest_get(cmdopts,
+                                     'metric_interval',
+                                     exp_dirs[:1],
+                                     exp_setup.TimeSetup.extract_metric_interval)[0]
+        if interval is None:
+            interval = tsetup.metric_interval
+
+        if n_datapoints is None:
+            n_datapoints = int(tsetup.n_secs_per_run * tsetup.n_ticks_per_sec / interval)
+
+        return interval * np.arange(1, n_datapoints + 1, dtype=float)
+
+    def manifest_params(self, exp_def: XMLAttrChangeSet) -> tp.Dict[str, tp.Any]:
+        waveform_path = '{0}/waveform'.format(self.variances[0][0])
+        params = {}  # type: tp.Dict[str, tp.Any]
+        for path, attr, value in exp_def:
+            if path == waveform_path:
+                params[attr] = value if attr == 'type' else float(value)
+
+        return {'waveform': params}
+
 
 class VariancesGenerator():
     def __init__(self, main_config: types.YAMLDict, attr: types.CLIArgSpec):
@@ -0,0 +1,82 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Synthesis of the temporal variance waveforms applied during simulation from
+their parameters, so that the variance curves for a batch are available without
+reading them back from simulation outputs.
+"""
+
+# Core packages
+import math
+import typing as tp
+
+# 3rd party packages
+import numpy as np
+
+# Project packages
+
+
+def synthesize(waveforms: tp.List[tp.Dict[str, tp.Any]],
+                clock: np.ndarray) -> np.ndarray:
+    """
+    Calculate the value of each waveform at each timestep.
+
+    Parameters:
+        waveforms: The parameters of each waveform, as a dictionary with the
+                   same keys as the attributes of the ``<waveform>`` tag
+                   (``type``, ``frequency``, ``amplitude``, ``offset``,
+                   ``phase``). Missing numeric parameters are 0.
+
+        clock: The timesteps to calculate the waveforms at.
+
+    Returns:
+        Array with one row per waveform and one column per timestep. Waveforms
+        of unknown type (e.g., ``Null``) are 0 everywhere.
+    """
+    clock = np.asarray(clock, dtype=float)[np.newaxis, :]
+    shape = (len(waveforms), clock.shape[1])
+
+    def param(key: str) -> np.ndarray:
+        return np.array([[float(w.get(key, 0.0))] for w in waveforms])
+
+    wtype = np.array([[w.get('type', '')] for w in waveforms])
+    freq = param('frequency')
+    amp = param('amplitude')
+    offset = param('offset')
+    phase = param('phase')
+
+    theta = 2 * math.pi * freq * clock + phase
+
+    cycles = theta / (2 * math.pi)
+
+    sine = amp * np.sin(theta) + offset
+
+    # Square waves are offset + amplitude for the first half of each period,
+    # and offset for the second, so that a half period is a step (see
+    # VariancesGenerator).
+    square = np.where(np.mod(cycles, 1.0) < 0.5, amp, 0.0) + offset
+    sawtooth = amp * 2.0 * (cycles - np.floor(cycles + 0.5)) + offset
+
+    constant = np.broadcast_to(amp, shape)
+
+    conds = [np.broadcast_to(wtype == t, shape)
+             for t in ['Sine', 'Square', 'Sawtooth', 'Constant']]
+    return np.select(conds, [sine, square, sawtooth, constant], default=0.0)
+
+
+__api__ = [
+    'synthesize'
+]
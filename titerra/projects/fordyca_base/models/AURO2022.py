@@ -23,13 +23,14 @@ Models of the steady state collective foraging behavior of a swarm of
 # Core packages
 import os
 import typing as tp
-import copy
-from functools import reduce
+import json
+from functools import reduce, partial
 
 # 3rd party packages
 import implements
+import numpy as np
 import pandas as pd
-from sierra.core import types, config, utils
+from sierra.core import types, config, utils, storage
 import sierra.core.models.interface
 import sierra.core.variables.batch_criteria as bc
 from sierra.core.experiment.spec import ExperimentSpec
@@ -38,20 +39,23 @@ import sierra.plugins.platform.argos.variables.exp_setup as ts
 
 
 # Project packages
+from titerra.projects.common.variables.exp_setup import TimeSetup
 import titerra.projects.fordyca_base.models.representation as rep
-from titerra.projects.fordyca_base.models.interference import IntraExp_RobotInterferenceRate_NRobots, IntraExp_WallInterferenceRate_1Robot
+from titerra.projects.fordyca_base.models.interference import IntraExp_RobotInterferenceRate_NRobots, IntraExp_WallInterferenceRate_1Robot, IntraExp_RobotInterferenceTime_NRobots, interference_counts_read
 from titerra.projects.fordyca_base.models.homing_time import IntraExp_HomingTime_NRobots, IntraExp_HomingTime_1Robot
 import titerra.projects.fordyca_base.models.ode_solver as ode
 from titerra.projects.fordyca_base.models.blocks import IntraExp_BlockAcqRate_NRobots
 from titerra.projects.fordyca_base.models.perf_measures import InterExp_RawPerf_NRobots, InterExp_Scalability_NRobots, InterExp_SelfOrg_NRobots
 import titerra.projects.fordyca_base.models.diffusion as diffusion
+import titerra.projects.fordyca_base.models.exp_runner as exp_runner
+import titerra.projects.fordyca_base.models.output_cache as output_cache
 
 
 def available_models(category: str):
     if category == 'intra':
         return ['IntraExp_ODE_NRobots']
     elif category == 'inter':
-        return ['InterExp_ODE_NRobots']
+        return ['InterExp_ODE_NRobots', 'InterExp_ODEUncertainty_NRobots']
     else:
         return None
 
@@ -89,6 +93,7 @@ class IntraExp_ODE_1Robot():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
@@ -107,7 +112,7 @@ class IntraExp_ODE_1Robot():
             'N_avs0': 0,
             'B0': n_blocks
         }
-        soln = ode.CRWSolver(model_params).solve(z0)
+        soln = _ode_solver_create(self.config, model_params).solve(z0)
 
         res = {
             'searching': [soln[:, 0]][0],
@@ -123,8 +128,28 @@ class IntraExp_ODE_1Robot():
                          criteria: bc.IConcreteBatchCriteria,
                          exp_num: int,
                          cmdopts: types.Cmdopts) -> tp.Dict[str, float]:
-        fsm_counts_df = storage.DataFrameReader('storage.csv')(os.path.join(cmdopts['exp0_stat_root'],
-                                                       'fsm-interference-counts.csv'))
+        # The 1 robot params are derived from exp0 results, but T comes from
+        # the definition of the experiment they are calculated for, so there
+        # is one set per experiment, which lives in the batch model root
+        # because the N robot model for every experiment uses them.
+        spec = ExperimentSpec(criteria, exp_num, cmdopts)
+        fpath = os.path.join(cmdopts['batch_model_root'],
+                             'ode-params-1robot-exp{0}.json'.format(exp_num))
+        deps = [os.path.join(cmdopts['exp0_stat_root'], 'fsm-interference-counts.csv'),
+                os.path.join(cmdopts['exp0_stat_root'], 'block-clusters.csv'),
+                spec.exp_def_fpath]
+
+        return _ode_params_cached(fpath,
+                                  deps,
+                                  self.config,
+                                  cmdopts,
+                                  lambda: self._ode_params_extract(criteria, exp_num, cmdopts))
+
+    def _ode_params_extract(self,
+                            criteria: bc.IConcreteBatchCriteria,
+                            exp_num: int,
+                            cmdopts: types.Cmdopts) -> tp.Dict[str, float]:
+        fsm_counts_df = interference_counts_read(cmdopts['exp0_stat_root'])
 
         # T,n_datapoints are directly from simulation inputs
         spec = ExperimentSpec(criteria, exp_num, cmdopts)
@@ -159,7 +184,8 @@ class IntraExp_ODE_1Robot():
             'tau_h1': tau_h1['model'].iloc[-1],
             'alpha_b1': alpha_b1['model'].iloc[-1],
             'alpha_ca1': alpha_ca1['model'].iloc[-1],
-            'n_datapoints': n_datapoints
+            'n_datapoints': n_datapoints,
+            'output_interval': TimeSetup.extract_metric_interval(exp_def)
         }
         print("--------------------------------------------------------------------------------")
         print("Calculated ODE params for 1 robot:")
@@ -198,6 +224,7 @@ class IntraExp_ODE_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
@@ -224,7 +251,7 @@ class IntraExp_ODE_NRobots():
             'N_avs0': 0,
             'B0': n_blocks
         }
-        soln = ode.CRWSolver(model_params).solve(z0)
+        soln = _ode_solver_create(self.config, model_params).solve(z0)
 
         res = {
             'searching': [soln[:, 0]][0],
@@ -240,8 +267,25 @@ class IntraExp_ODE_NRobots():
                          criteria: bc.IConcreteBatchCriteria,
                          exp_num: int,
                          cmdopts: types.Cmdopts) -> tp.Dict[str, float]:
-        fsm_counts_df = storage.DataFrameReader('storage.csv')(os.path.join(cmdopts['exp_stat_root'],
-                                                         'fsm-interference-counts.csv'))
+        spec = ExperimentSpec(criteria, exp_num, cmdopts)
+        fpath = os.path.join(cmdopts['exp_model_root'], 'ode-params.json')
+        deps = [os.path.join(cmdopts['exp_stat_root'], 'fsm-interference-counts.csv'),
+                os.path.join(cmdopts['exp_stat_root'], 'block-clusters.csv'),
+                os.path.join(cmdopts['exp_stat_root'], 'block-manipulation.csv'),
+                os.path.join(cmdopts['exp0_stat_root'], 'fsm-interference-counts.csv'),
+                spec.exp_def_fpath]
+
+        return _ode_params_cached(fpath,
+                                  deps,
+                                  self.config,
+                                  cmdopts,
+                                  lambda: self._ode_params_extract(criteria, exp_num, cmdopts))
+
+    def _ode_params_extract(self,
+                            criteria: bc.IConcreteBatchCriteria,
+                            exp_num: int,
+                            cmdopts: types.Cmdopts) -> tp.Dict[str, float]:
+        fsm_countsN_df = interference_counts_read(cmdopts['exp_stat_root'])
 
         # N,T,n_datapoints are directly from simulation inputs
         N = criteria.populations(cmdopts)[exp_num]
@@ -250,23 +294,23 @@ class IntraExp_ODE_NRobots():
         exp_def = XMLAttrChangeSet.unpickle(spec.exp_def_fpath)
         time_params = ts.ARGoSExpSetup.extract_time_params(exp_def)
         T = time_params['T_in_secs'] * time_params['ticks_per_sec']
-        n_datapoints = len(fsm_counts_df.index)
+        n_datapoints = len(fsm_countsN_df.index)
 
         # This is OK to read from experimental data, per the paper.
-        tau_avN = fsm_counts_df['int_avg_interference_duration'].iloc[-1]
+        tau_avN = fsm_countsN_df['int_avg_interference_duration'].iloc[-1]
 
         # tau_h, alpha_b are computed directly from simulation
         # inputs/configuration, so we can run() them here.
-        tau_hN = IntraExp_HomingTime_NRobots(self.main_config, self.config).run(criteria,
-                                                                                exp_num,
-                                                                                cmdopts)[0]
+        homing_kargs = IntraExp_HomingTime_NRobots.calc_kernel_args(criteria,
+                                                                    exp_num,
+                                                                    cmdopts,
+                                                                    self.main_config,
+                                                                    self.config)
+        tau_hN = IntraExp_HomingTime_NRobots.kernel(**homing_kargs)
 
         # FIXME: N_av1 COULD be computed a priori, but I don't have time to do it right now, so I
         # just read it from simulation results.
-        fsm_counts1_df = storage.DataFrameReader('storage.csv')(os.path.join(cmdopts['exp0_stat_root'],
-                                                          'fsm-interference-counts.csv'))
-        fsm_countsN_df = storage.DataFrameReader('storage.csv')(os.path.join(cmdopts['exp_stat_root'],
-                                                          'fsm-interference-counts.csv'))
+        fsm_counts1_df = interference_counts_read(cmdopts['exp0_stat_root'])
 
         N_av1 = fsm_counts1_df['int_avg_exp_interference'].iloc[-1]
         N_avN = fsm_countsN_df['cum_avg_exp_interference'].iloc[-1]
@@ -287,9 +331,12 @@ class IntraExp_ODE_NRobots():
             'N_av1': N_av1,
             'N_avN': N_avN,
             'tau_hN': tau_hN['model'].iloc[-1],
+            # Needed to recompute tau_hN for perturbed interference params
+            'tau_h1N': homing_kargs['tau_h1']['model'].iloc[-1],
             'alpha_bN': alpha_bN['model'].iloc[-1],
             'crwD': crwD,
-            'n_datapoints': n_datapoints
+            'n_datapoints': n_datapoints,
+            'output_interval': TimeSetup.extract_metric_interval(exp_def)
         }
 
         print("--------------------------------------------------------------------------------")
@@ -338,6 +385,7 @@ class InterExp_ODE_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self, criteria: bc.IConcreteBatchCriteria, cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
 
         # We always run the models for all experiments, regardless of
@@ -349,35 +397,17 @@ class InterExp_ODE_NRobots():
         res_df_searching = pd.DataFrame(columns=dirs, index=[0])
         res_df_homing = pd.DataFrame(columns=dirs, index=[0])
 
+        # The intra-experiment model is run with the same config as when it is
+        # run on its own, so the steady state comes from the same (cached)
+        # solve as the time-resolved predictions.
         # attempting to get one model datapoint from batch to be representative
         # of ODE solution
-        for i, exp in enumerate(dirs):
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], dirs[0])
-
-            utils.dir_create_checked(cmdopts2['exp_model_root'],
-                                       exist_ok=True)
-
-            intra_dfs = IntraExp_ODE_NRobots(self.main_config,
-                                             self.config).run(criteria,
-                                                              i,
-                                                              cmdopts2)
+        exp_dfs = exp_runner.run_intra(IntraExp_ODE_NRobots(self.main_config, self.config),
+                                       criteria,
+                                       cmdopts,
+                                       self.config)
 
+        for exp, intra_dfs in zip(dirs, exp_dfs):
             # gets steady state solution for avoiding and searching counts
             res_df_searching[exp] = intra_dfs[0].iloc[-1]
             res_df_homing[exp] = intra_dfs[1].iloc[-1]
@@ -386,6 +416,216 @@ class InterExp_ODE_NRobots():
         return [res_df_searching, res_df_homing, res_df_avoiding]
 
 
+@implements.implements(sierra.core.models.interface.IConcreteInterExpModel1D)
+class InterExp_ODEUncertainty_NRobots():
+    r"""
+    Propagates the uncertainty in the empirically estimated inputs of
+    :class:`InterExp_ODE_NRobots` through the model via Monte-Carlo sampling,
+    across all experiments in the batch.
+
+    The interference inputs (and the homing time, which depends on them) are
+    sampled by resampling the simulations in each experiment, and the steady
+    state for all samples is computed at once with
+    :meth:`~titerra.projects.fordyca_base.models.ode_solver.CRWSolver.fixed_point_batch()`. The
+    block acquisition rate and the single robot homing time are computed from
+    first principles, and are not sampled.
+
+    The mean prediction for each experiment is returned under the same CSV
+    stems as :class:`InterExp_ODE_NRobots` with a ``-uncertainty`` suffix, so
+    that it does not replace the deterministic prediction, and the standard
+    deviation of the predictions is written to the batch model root alongside
+    each model output as ``<csv_stem>.stddev``, in the same format as the
+    ``.stddev`` files for empirical data, so that the prediction interval can
+    be drawn as a band.
+
+    The # of samples per experiment is ``uncertainty_samples`` in the model
+    config. Sampling is seeded from ``uncertainty_seed`` in the model config,
+    so the predictions for a batch are reproducible.
+
+    .. IMPORTANT::
+       This model does not have a kernel() function which computes the
+       calculation, because it is a summary model, built on simpler
+       intra-experiment models.
+
+    From :xref:`Harwell2021b`.
+    """
+    kDEFAULT_SAMPLES = 1000
+    kDEFAULT_SEED = 0
+    kSTEM_SUFFIX = '-uncertainty'
+
+    def __init__(self, main_config: types.YAMLDict, config: types.YAMLDict) -> None:
+        self.main_config = main_config
+        self.config = config
+
+    def run_for_batch(self, criteria: bc.IConcreteBatchCriteria, cmdopts: types.Cmdopts) -> bool:
+        return True
+
+    def target_csv_stems(self) -> tp.List[str]:
+        return [stem + self.kSTEM_SUFFIX
+                for stem in InterExp_ODE_NRobots(self.main_config, self.config).target_csv_stems()]
+
+    def legend_names(self) -> tp.List[str]:
+        return [name + ' (Monte-Carlo Mean)'
+                for name in InterExp_ODE_NRobots(self.main_config, self.config).legend_names()]
+
+    def __repr__(self) -> str:
+        return self.__class__.__name__
+
+    def run(self, criteria: bc.IConcreteBatchCriteria, cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
+        # The stddevs are written here rather than when they are calculated,
+        # so that they are always written, even when the predictions are
+        # cached.
+        dfs = self._predict(criteria, cmdopts)
+        res_dfs = dfs[:3]
+        stddev_dfs = dfs[3:]
+
+        for df, csv_stem in zip(stddev_dfs, self.target_csv_stems()):
+            opath = os.path.join(cmdopts['batch_model_root'],
+                                 csv_stem + config.kStatsExtensions['stddev'])
+            storage.DataFrameWriter('storage.csv')(df, opath, index=False)
+
+        return res_dfs
+
+    def cache_inputs(self,
+                     criteria: bc.IConcreteBatchCriteria,
+                     cmdopts: types.Cmdopts) -> tp.List[str]:
+        """
+        The per-simulation outputs the predictions are sampled from, which are
+        not part of the collated outputs the model cache checks by default.
+        """
+        return [path
+                for d in criteria.gen_exp_dirnames(cmdopts)
+                for path in self._per_sim_paths(os.path.join(cmdopts['batch_output_root'], d))]
+
+    @output_cache.cached
+    def _predict(self,
+                 criteria: bc.IConcreteBatchCriteria,
+                 cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
+        """
+        Calculate the mean and standard deviation of the predicted searching,
+        homing, and avoiding counts for each experiment.
+        """
+        dirs = criteria.gen_exp_dirnames(cmdopts)
+        n_samples = int(self.config.get('uncertainty_samples', self.kDEFAULT_SAMPLES))
+        seed = int(self.config.get('uncertainty_seed', self.kDEFAULT_SEED))
+
+        res_dfs = [pd.DataFrame(columns=dirs, index=[0]) for _ in range(0, 3)]
+        stddev_dfs = [pd.DataFrame(columns=dirs, index=[0]) for _ in range(0, 3)]
+
+        sims1_df = self._per_sim_interference(os.path.join(cmdopts['batch_output_root'],
+                                                           dirs[0]))
+
+        # Each experiment gets its own independent random stream, so results do
+        # not depend on how experiments are spread across processes.
+        seeds = np.random.SeedSequence(seed).spawn(len(dirs))
+        exp_preds = exp_runner.map_exps(partial(self._exp_predict,
+                                                sims1_df,
+                                                n_samples,
+                                                seeds),
+                                        criteria,
+                                        cmdopts,
+                                        self.config)
+
+        for exp, preds in zip(dirs, exp_preds):
+            for j, pred in enumerate(preds):
+                res_dfs[j][exp] = pred.mean()
+                stddev_dfs[j][exp] = pred.std()
+
+        return res_dfs + stddev_dfs
+
+    def _exp_predict(self,
+                     sims1_df: pd.DataFrame,
+                     n_samples: int,
+                     seeds: tp.List[np.random.SeedSequence],
+                     criteria: bc.IConcreteBatchCriteria,
+                     exp_num: int,
+                     cmdopts: types.Cmdopts) -> tp.List[np.ndarray]:
+        """
+        Solve the ODE for each sampled set of params for an experiment, and
+        return the searching, homing, and avoiding counts for each sample.
+        """
+        rng = np.random.default_rng(seeds[exp_num])
+        params = self._sample_params(criteria,
+                                     exp_num,
+                                     cmdopts,
+                                     sims1_df.sample(n_samples,
+                                                     replace=True,
+                                                     random_state=rng),
+                                     rng)
+        soln = ode.CRWSolver.fixed_point_batch(params)
+
+        searching = soln[:, 0]
+        homing = soln[:, 1]
+        avoiding = params['N'] - searching - homing
+
+        return [searching, homing, avoiding]
+
+    def _sample_params(self,
+                       criteria: bc.IConcreteBatchCriteria,
+                       exp_num: int,
+                       cmdopts: types.Cmdopts,
+                       sims1_df: pd.DataFrame,
+                       rng: np.random.Generator) -> tp.Dict[str, tp.Any]:
+        model1_robot = IntraExp_ODE_1Robot(self.main_config, self.config)
+        N = criteria.populations(cmdopts)[exp_num]
+
+        if N == 1:
+            params = model1_robot._ode_params_calc(criteria, exp_num, cmdopts)
+            params['tau_av1'] = sims1_df['int_avg_interference_duration'].values
+            alpha_ca1 = IntraExp_WallInterferenceRate_1Robot.kernel(N_av1=sims1_df['cum_avg_exp_interference'].values,
+                                                                    tau_av1=sims1_df['cum_avg_interference_duration'].values)
+            params['alpha_ca1'] = alpha_ca1
+            return params
+
+        params = model1_robot._ode_params_calc(criteria, 0, cmdopts)
+        params.update(IntraExp_ODE_NRobots(self.main_config,
+                                           self.config)._ode_params_calc(criteria,
+                                                                         exp_num,
+                                                                         cmdopts))
+
+        # Same # samples as were drawn for 1 robot
+        simsN_df = self._per_sim_interference(cmdopts['exp_output_root']).sample(len(sims1_df.index),
+                                                                                 replace=True,
+                                                                                 random_state=rng)
+        params['tau_av1'] = sims1_df['int_avg_interference_duration'].values
+        params['N_av1'] = sims1_df['int_avg_exp_interference'].values
+        params['tau_avN'] = simsN_df['int_avg_interference_duration'].values
+
+        # Recompute the homing time from the sampled interference params the
+        # same way IntraExp_HomingTime_NRobots does.
+        kargs = {
+            'N_av1': sims1_df['cum_avg_exp_interference'].values,
+            'tau_av1': sims1_df['cum_avg_interference_duration'].values,
+            'N_avN': simsN_df['cum_avg_exp_interference'].values,
+            'tau_avN': simsN_df['cum_avg_interference_duration'].values
+        }
+        alpha_caN = IntraExp_RobotInterferenceRate_NRobots.kernel(**kargs)
+        tau_avN = IntraExp_RobotInterferenceTime_NRobots.kernel(N=N, **kargs)
+        params['tau_hN'] = IntraExp_HomingTime_NRobots.kernel(tau_h1=params['tau_h1N'],
+                                                              alpha_caN=alpha_caN,
+                                                              tau_avN=tau_avN,
+                                                              N=N)
+        return params
+
+    def _per_sim_interference(self, exp_output_root: str) -> pd.DataFrame:
+        """
+        Gather the steady state interference counts for each simulation in an
+        experiment, one row per simulation.
+        """
+        rows = [storage.DataFrameReader('storage.csv')(path).iloc[-1]
+                for path in self._per_sim_paths(exp_output_root)]
+
+        return pd.DataFrame(rows).reset_index(drop=True)
+
+    def _per_sim_paths(self, exp_output_root: str) -> tp.List[str]:
+        metrics_leaf = self.main_config['sierra']['run']['run_metrics_leaf']
+        return [os.path.join(exp_output_root,
+                             sim,
+                             metrics_leaf,
+                             'fsm-interference-counts.csv')
+                for sim in sorted(os.listdir(exp_output_root))]
+
+
 @implements.implements(sierra.core.models.interface.IConcreteInterExpModel1D)
 class InterExp_ODEWrapper_NRobots():
     r"""
@@ -434,6 +674,7 @@ class InterExp_ODEWrapper_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -443,3 +684,62 @@ class InterExp_ODEWrapper_NRobots():
         so_df = self.self_org.run(criteria, cmdopts)[0]
 
         return [perf_df, sc_df, so_df]
+
+
+def _ode_params_cached(fpath: str,
+                       deps: tp.List[str],
+                       model_config: types.YAMLDict,
+                       cmdopts: types.Cmdopts,
+                       calc: tp.Callable[[], tp.Dict[str, float]]) -> tp.Dict[str, float]:
+    """
+    Get the ODE params for an experiment from the JSON file at the specified
+    path if they are still valid, calculating and writing them out otherwise.
+
+    Cached params are valid if none of the files they were derived from
+    (including the pickled experiment definition) have been modified since
+    they were calculated, and the model config and scenario they were
+    calculated with have not changed.
+    """
+    # The ode_* keys only control how the ODE is solved, not the params
+    key = {
+        'deps': {d: os.path.getmtime(d) for d in deps if os.path.exists(d)},
+        'config': {k: str(v) for k, v in model_config.items() if not k.startswith('ode_')},
+        'scenario': cmdopts['scenario']
+    }
+
+    if os.path.exists(fpath):
+        with open(fpath, 'r') as f:
+            cached = json.load(f)
+
+        if cached['key'] == key:
+            return cached['params']
+
+    params = calc()
+
+    # Experiments can be run in parallel, and several may need the same cached
+    # params, so never leave a partially written file where others can see it.
+    utils.dir_create_checked(os.path.dirname(fpath), exist_ok=True)
+    tmp_path = '{0}.{1}'.format(fpath, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump({'key': key,
+                   'params': {k: v.item() if hasattr(v, 'item') else v for k, v in params.items()}},
+                  f,
+                  indent=4)
+    os.replace(tmp_path, fpath)
+
+    return params
+
+
+def _ode_solver_create(config: types.YAMLDict,
+                       params: tp.Dict[str, float]) -> ode.CRWSolver:
+    """
+    Create the ODE solver for the CRW foraging model, using the solution mode,
+    integration method, and steady state tolerance from the model config, if
+    present. Integration stops at steady state by default, since the rest of
+    the trajectory is (within tolerance) constant.
+    """
+    ss_tol = config.get('ode_ss_tol', ode.CRWSolver.kSS_TOL)
+    return ode.CRWSolver(params,
+                         method=config.get('ode_method', 'auto'),
+                         ss_tol=float(ss_tol) if str(ss_tol).lower() != 'none' else None,
+                         mode=config.get('ode_mode', 'integrate'))
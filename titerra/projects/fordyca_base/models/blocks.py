@@ -19,7 +19,6 @@ Free block acquisition and block collection models for the FORDYCA project.
 
 # Core packages
 import os
-import copy
 import typing as tp
 import math
 
@@ -34,12 +33,14 @@ import titerra.projects.fordyca_base.models.representation as rep
 import sierra.core.variables.batch_criteria as bc
 from sierra.core.vector import Vector3D
 from sierra.core.xml import XMLAttrChangeSet
-from sierra.core import types, storage, utils
+from sierra.core import types, storage
 import sierra.plugins.platform.argos.variables.exp_setup as ts
 
-from titerra.projects.fordyca_base.models.density import BlockAcqDensity
+from titerra.projects.fordyca_base.models.density import BlockAcqDensity, UniformBlockAcqDensity
 from titerra.projects.fordyca_base.models.dist_measure import DistanceMeasure2D
 import titerra.projects.fordyca_base.models.diffusion as diffusion
+import titerra.projects.fordyca_base.models.exp_runner as exp_runner
+import titerra.projects.fordyca_base.models.output_cache as output_cache
 
 
 def available_models(category: str):
@@ -110,6 +111,7 @@ class IntraExp_BlockAcqRate_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
@@ -249,6 +251,7 @@ class IntraExp_BlockCollectionRate_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
@@ -297,6 +300,7 @@ class InterExp_BlockAcqRate_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -304,35 +308,14 @@ class InterExp_BlockAcqRate_NRobots():
         dirs = criteria.gen_exp_dirnames(cmdopts)
         res_df = pd.DataFrame(columns=dirs, index=[0])
 
-        for i, exp in enumerate(dirs):
-
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], dirs[0])
-
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Model only targets a single graph
-            intra_df = IntraExp_BlockAcqRate_NRobots(self.main_config,
-                                                     self.config).run(criteria,
-                                                                      i,
-                                                                      cmdopts2)[0]
-            res_df[exp] = intra_df.loc[intra_df.index[-1], 'model']
+        # Model only targets a single graph
+        exp_dfs = exp_runner.run_intra(IntraExp_BlockAcqRate_NRobots(self.main_config, self.config),
+                                       criteria,
+                                       cmdopts,
+                                       self.config)
+
+        for exp, intra_dfs in zip(dirs, exp_dfs):
+            res_df[exp] = intra_dfs[0].loc[intra_dfs[0].index[-1], 'model']
 
         # All done!
         return [res_df]
@@ -365,6 +348,7 @@ class InterExp_BlockCollectionRate_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -372,35 +356,14 @@ class InterExp_BlockCollectionRate_NRobots():
         dirs = criteria.gen_exp_dirnames(cmdopts)
         res_df = pd.DataFrame(columns=dirs, index=[0])
 
-        for i, exp in enumerate(dirs):
-
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], dirs[0])
-
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Model only targets a single graph
-            intra_df = IntraExp_BlockCollectionRate_NRobots(self.main_config,
-                                                            self.config).run(criteria,
-                                                                             i,
-                                                                             cmdopts2)[0]
-            res_df[exp] = intra_df.loc[intra_df.index[-1], 'model']
+        # Model only targets a single graph
+        exp_dfs = exp_runner.run_intra(IntraExp_BlockCollectionRate_NRobots(self.main_config, self.config),
+                                       criteria,
+                                       cmdopts,
+                                       self.config)
+
+        for exp, intra_dfs in zip(dirs, exp_dfs):
+            res_df[exp] = intra_dfs[0].loc[intra_dfs[0].index[-1], 'model']
 
         # All done!
         return [res_df]
@@ -411,18 +374,33 @@ class InterExp_BlockCollectionRate_NRobots():
 
 
 class ExpectedAcqDist():
+    @staticmethod
+    def is_uniform(scenario: str) -> bool:
+        """
+        Are blocks placed uniformly within each cluster for the specified scenario?
+        """
+        return 'PL' not in scenario and any(s in scenario for s in ['RN', 'SS', 'DS'])
+
     def __call__(self, cmdopts: types.Cmdopts, result_opath: str, nest: rep.Nest) -> float:
 
         # Get clusters in the arena
         clusters = rep.BlockClusterSet(cmdopts, nest, result_opath)
 
+        return self.for_clusters(clusters, nest, cmdopts['scenario'])
+
+    def for_clusters(self,
+                     clusters: tp.Iterable[rep.BlockCluster],
+                     nest: rep.Nest,
+                     scenario: str) -> float:
         # Integrate to find average distance from nest to all clusters, weighted by acquisition
         # density.
         dist = 0.0
+        n_clusters = 0
         for cluster in clusters:
-            dist += self._nest_to_cluster(cluster, nest, cmdopts['scenario'])
+            dist += self._nest_to_cluster(cluster, nest, scenario)
+            n_clusters += 1
 
-        return dist / len(clusters)
+        return dist / n_clusters
 
     def _nest_to_cluster(self,
                          cluster: rep.BlockCluster,
@@ -430,8 +408,16 @@ class ExpectedAcqDist():
                          scenario: str) -> float:
         dist_measure = DistanceMeasure2D(scenario, nest=nest)
 
-        density = BlockAcqDensity(
-            nest=nest, cluster=cluster, dist_measure=dist_measure)
+        # Blocks are placed uniformly within clusters except for PL, so we can avoid adaptive
+        # numerical integration.
+        if self.is_uniform(scenario):
+            density = UniformBlockAcqDensity(nest=nest,
+                                             cluster=cluster,
+                                             dist_measure=dist_measure)
+        else:
+            density = BlockAcqDensity(nest=nest,
+                                      cluster=cluster,
+                                      dist_measure=dist_measure)
 
         # Compute expected value of X coordinate of average distance from nest to acquisition
         # location.
@@ -16,9 +16,9 @@
 
 # Core packages
 import math
+import functools
 
 # 3rd party packages
-import scipy.integrate as si
 
 # Project packages
 from sierra.core.vector import Vector3D
@@ -29,6 +29,9 @@ class DistanceMeasure2D():
     """
     Defines how the distance between two (X,Y) points in the plane should be measured. This is
     necessary in order to handle different block distributions within the same model.
+
+    The nest factor depends only on the block distribution and the size of the nest, so it is
+    computed once per distinct (distribution, nest size) pair and then reused.
     """
 
     def __init__(self, scenario: str, nest: Nest):
@@ -36,55 +39,75 @@ class DistanceMeasure2D():
         self.nest = nest
 
         if 'RN' in self.scenario or 'PL' in self.scenario:
-            # Our model assumes all robots finish foraging EXACTLY at the nest center, and the
-            # implementation has robots pick a random point between where they enter the nest and
-            # the center, in order to reduce congestion.
-            #
-            # This has the effect of making the expected distance the robots travel after entering
-            # the nest but before dropping their object LESS than the distance the model
-            # assumes. So, we calculate the average distance from any point in the square defined by
-            # HALF the nest span in X,Y (HALF being a result of uniform random choice in X,Y) to the
-            # nest center:
-            # https://math.stackexchange.com/questions/15580/what-is-average-distance-from-center-of-square-to-some-point
-            edge = nest.extent.xsize() / 2.0
-            self.nest_factor = edge / 6.0 * \
-                (math.sqrt(2.0) + math.log(1 + math.sqrt(2.0)))
+            dist_type = 'RN'
         elif 'SS' in self.scenario:
-            # When I solve for the length of the edge of the triangle bisected by the middle of the
-            # nest in X as a percentage of xsize(), I get 0.032, and we want to integrate equally on
-            # either side of that.
-            xmin = self.nest.extent.center.x
-            xmax = self.nest.extent.center.x + self.nest.extent.xsize() / 2.0
-            ymin = self.nest.extent.center.y - self.nest.extent.ysize() / 32.0
-            ymax = self.nest.extent.center.y + self.nest.extent.ysize() / 32.0
-
-            res, _ = si.nquad(lambda x, y: (self.nest.extent.center - Vector3D(x, y)).length(),
-                              [[xmin, xmax], [ymin, ymax]],
-                              opts={'limit': 100})
-            # Because the effective area is actually a triangle, we take 1/2 the area of the square
-            # we integrate over. This is NOT an exact calculation, but it is close enough for now
-            # (2021/3/26).
-            eff_area = (xmax - xmin) * (ymax - ymin) / 2.0
-            self.nest_factor = res / eff_area
-
+            dist_type = 'SS'
         elif 'DS' in self.scenario:
-            # When I solve for the length of the edge of the triangle bisected by the middle of the
-            # nest in X as a percentage of xsize(), I get 0.125, and we want to integrate equally on
-            # either side of that.
-            xmin = self.nest.extent.center.x
-            xmax = self.nest.extent.center.x + self.nest.extent.xsize() / 2.0
-            ymin = self.nest.extent.center.y - self.nest.extent.ysize() / 16.0
-            ymax = self.nest.extent.center.y + self.nest.extent.ysize() / 16.0
-            res, _ = si.nquad(lambda x, y: (self.nest.extent.center - Vector3D(x, y)).length(),
-                              [[xmin, xmax], [ymin, ymax]],
-                              opts={'limit': 100})
-
-            # Because the effective area is actually a triangle, we take 1/2 the area of the square
-            # we integrate over. This is NOT an exact calculation, but it is close enough for now
-            # (2021/3/26).
-            eff_area = (xmax - xmin) * (ymax - ymin) / 2.0
-            self.nest_factor = res / eff_area
+            dist_type = 'DS'
+        else:
+            dist_type = None
+
+        if dist_type is not None:
+            self.nest_factor = _nest_factor_calc(dist_type,
+                                                 nest.extent.xsize(),
+                                                 nest.extent.ysize())
 
     def to_nest(self, pt: Vector3D):
 
         return (self.nest.extent.center - pt).length() - self.nest_factor
+
+
+@functools.lru_cache(maxsize=None)
+def _nest_factor_calc(dist_type: str, xsize: float, ysize: float) -> float:
+    if dist_type == 'RN':
+        # Our model assumes all robots finish foraging EXACTLY at the nest center, and the
+        # implementation has robots pick a random point between where they enter the nest and
+        # the center, in order to reduce congestion.
+        #
+        # This has the effect of making the expected distance the robots travel after entering
+        # the nest but before dropping their object LESS than the distance the model
+        # assumes. So, we calculate the average distance from any point in the square defined by
+        # HALF the nest span in X,Y (HALF being a result of uniform random choice in X,Y) to the
+        # nest center:
+        # https://math.stackexchange.com/questions/15580/what-is-average-distance-from-center-of-square-to-some-point
+        edge = xsize / 2.0
+        return edge / 6.0 * (math.sqrt(2.0) + math.log(1 + math.sqrt(2.0)))
+
+    if dist_type == 'SS':
+        # When I solve for the length of the edge of the triangle bisected by the middle of the
+        # nest in X as a percentage of xsize(), I get 0.032, and we want to integrate equally on
+        # either side of that.
+        width = xsize / 2.0
+        height = ysize / 32.0
+    else:  # DS
+        # When I solve for the length of the edge of the triangle bisected by the middle of the
+        # nest in X as a percentage of xsize(), I get 0.125, and we want to integrate equally on
+        # either side of that.
+        width = xsize / 2.0
+        height = ysize / 16.0
+
+    # The region integrated over is [0, width] x [-height, height] relative to the nest center, so
+    # by symmetry it is twice the integral over [0, width] x [0, height].
+    res = 2.0 * _dist_integral(width, height)
+
+    # Because the effective area is actually a triangle, we take 1/2 the area of the square
+    # we integrate over. This is NOT an exact calculation, but it is close enough for now
+    # (2021/3/26).
+    eff_area = width * 2.0 * height / 2.0
+    return res / eff_area
+
+
+def _dist_integral(a: float, b: float) -> float:
+    r"""
+    Closed form of the integral of the distance to the origin over the rectangle
+    :math:`[0,a] \times [0,b]`.
+
+    .. math::
+       \frac{1}{6}\big[2abd + a^3\ln{\frac{b + d}{a}} + b^3\ln{\frac{a + d}{b}}\big]
+
+    where :math:`d=\sqrt{a^2 + b^2}`.
+    """
+    d = math.sqrt(a ** 2 + b ** 2)
+    return (2.0 * a * b * d +
+            a ** 3 * math.log((b + d) / a) +
+            b ** 3 * math.log((a + d) / b)) / 6.0
@@ -0,0 +1,89 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of SIERRA.
+#
+#  SIERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  SIERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  SIERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Per-experiment views of the batch cmdopts, for running intra-experiment models
+from inter-experiment models.
+"""
+
+# Core packages
+import os
+import typing as tp
+from collections.abc import Mapping
+
+# 3rd party packages
+from sierra.core import types, utils
+
+# Project packages
+
+
+class ExpContext(Mapping):
+    """
+    Immutable view of the batch cmdopts for a single experiment in the batch,
+    which layers the experiment-specific paths over the (shared, uncopied)
+    batch cmdopts. Can be used anywhere cmdopts are read.
+
+    Arguments:
+        cmdopts: The batch cmdopts.
+
+        overrides: The experiment-specific cmdopts.
+    """
+
+    def __init__(self, cmdopts: types.Cmdopts, overrides: tp.Dict[str, tp.Any]) -> None:
+        self._base = cmdopts
+        self._overrides = overrides
+
+    def __getitem__(self, key: str) -> tp.Any:
+        if key in self._overrides:
+            return self._overrides[key]
+
+        return self._base[key]
+
+    def __iter__(self) -> tp.Iterator[str]:
+        yield from self._overrides
+        yield from (k for k in self._base if k not in self._overrides)
+
+    def __len__(self) -> int:
+        return len(self._overrides) + len([k for k in self._base if k not in self._overrides])
+
+    def __repr__(self) -> str:
+        return "{0}({1})".format(self.__class__.__name__, self._overrides)
+
+
+def for_exp(cmdopts: types.Cmdopts, exp_dirs: tp.List[str], exp: str) -> ExpContext:
+    """
+    Create the context for running intra-experiment models on the specified
+    experiment in the batch, creating its model root if needed.
+
+    Arguments:
+        cmdopts: The batch cmdopts.
+
+        exp_dirs: The names of all experiments in the batch; the first is
+                  taken to be exp0.
+
+        exp: The name of the experiment.
+    """
+    ctx = ExpContext(cmdopts, {
+        'exp_input_root': os.path.join(cmdopts['batch_input_root'], exp),
+        'exp_output_root': os.path.join(cmdopts['batch_output_root'], exp),
+        'exp_graph_root': os.path.join(cmdopts['batch_graph_root'], exp),
+        'exp_stat_root': os.path.join(cmdopts['batch_stat_root'], exp),
+        'exp_model_root': os.path.join(cmdopts['batch_model_root'], exp),
+        'exp0_output_root': os.path.join(cmdopts['batch_output_root'], exp_dirs[0]),
+        'exp0_stat_root': os.path.join(cmdopts['batch_stat_root'], exp_dirs[0])
+    })
+
+    utils.dir_create_checked(ctx['exp_model_root'], exist_ok=True)
+    return ctx
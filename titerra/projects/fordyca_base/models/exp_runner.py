@@ -0,0 +1,102 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of SIERRA.
+#
+#  SIERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  SIERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  SIERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Parallel evaluation of per-experiment computations for inter-experiment models.
+
+The experiments in a batch are independent, so inter-experiment models which
+are built on intra-experiment models can evaluate them for all experiments in
+parallel. Results are always returned in experiment order, regardless of the
+order in which they complete.
+
+The degree of parallelism is controlled by the ``n_procs`` key in the model
+config; it defaults to the # of cores on the machine, and evaluation is always
+serial if ``--processing-serial`` was passed.
+"""
+
+# Core packages
+import multiprocessing as mp
+import typing as tp
+import logging  # type: ignore
+
+# 3rd party packages
+import pandas as pd
+from sierra.core import types
+import sierra.core.variables.batch_criteria as bc
+
+# Project packages
+import titerra.projects.fordyca_base.models.exp_context as exp_context
+
+
+def parallelism_calc(cmdopts: types.Cmdopts, config: types.YAMLDict) -> int:
+    """
+    Calculate how many processes to use to evaluate per-experiment computations.
+    """
+    if cmdopts.get('processing_serial', False):
+        return 1
+
+    return max(1, int(config.get('n_procs', mp.cpu_count())))
+
+
+def map_exps(func: tp.Callable[[bc.IConcreteBatchCriteria, int, types.Cmdopts], tp.Any],
+             criteria: bc.IConcreteBatchCriteria,
+             cmdopts: types.Cmdopts,
+             config: types.YAMLDict) -> tp.List[tp.Any]:
+    """
+    Evaluate ``func(criteria, exp_num, exp_cmdopts)`` for each experiment in the
+    batch, and return the results in experiment order.
+
+    We always run for all experiments, regardless of --exp-range, because
+    models depend on the experiment at the 0-th position being exp0.
+
+    Arguments:
+        func: The computation to evaluate. Must be picklable (i.e., a module
+              level function, a bound method of a picklable object, or a
+              :func:`functools.partial` of one of those) if run in parallel.
+
+        criteria: The batch criteria.
+
+        cmdopts: The batch cmdopts.
+
+        config: The config for the model doing the evaluating.
+    """
+    dirs = criteria.gen_exp_dirnames(cmdopts)
+    args = [(criteria, i, exp_context.for_exp(cmdopts, dirs, exp))
+            for i, exp in enumerate(dirs)]
+
+    n_procs = min(parallelism_calc(cmdopts, config), len(args))
+    logging.getLogger(__name__).debug("Evaluating %s for %s experiments with %s processes",
+                                      getattr(func, '__name__', func),
+                                      len(args),
+                                      n_procs)
+
+    if n_procs <= 1:
+        return [func(*a) for a in args]
+
+    with mp.Pool(processes=n_procs) as pool:
+        return pool.starmap(func, args)
+
+
+def run_intra(model: tp.Any,
+              criteria: bc.IConcreteBatchCriteria,
+              cmdopts: types.Cmdopts,
+              config: types.YAMLDict) -> tp.List[tp.List[pd.DataFrame]]:
+    """
+    Run an intra-experiment model for each experiment in the batch, and return
+    the list of dataframes it generated for each experiment, in experiment
+    order.
+    """
+    return map_exps(model.run, criteria, cmdopts, config)
+
@@ -22,7 +22,6 @@ return to the nest after picking up an object.
 # Core packages
 import os
 import typing as tp
-import copy
 import math
 
 # 3rd party packages
@@ -34,7 +33,7 @@ import sierra.core.variables.batch_criteria as bc
 from sierra.core.vector import Vector3D
 from sierra.core.experiment.spec import ExperimentSpec
 from sierra.core.xml import XMLAttrChangeSet
-from sierra.core import types, utils, storage
+from sierra.core import types, storage
 
 # Project packages
 import titerra.projects.fordyca_base.models.representation as rep
@@ -42,6 +41,8 @@ from titerra.projects.fordyca_base.models.density import BlockAcqDensity
 from titerra.projects.fordyca_base.models.dist_measure import DistanceMeasure2D
 from titerra.projects.fordyca_base.models.interference import IntraExp_RobotInterferenceRate_NRobots, IntraExp_RobotInterferenceTime_NRobots
 from titerra.projects.fordyca_base.models.blocks import ExpectedAcqDist
+import titerra.projects.fordyca_base.models.exp_runner as exp_runner
+import titerra.projects.fordyca_base.models.output_cache as output_cache
 
 
 def available_models(category: str):
@@ -91,6 +92,7 @@ class IntraExp_HomingTime_1Robot():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
@@ -237,6 +239,7 @@ class IntraExp_HomingTime_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
@@ -288,41 +291,22 @@ class InterExp_HomingTime_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
         dirs = criteria.gen_exp_dirnames(cmdopts)
         res_df = pd.DataFrame(columns=dirs, index=[0])
 
-        for i, exp in enumerate(dirs):
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts2["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(cmdopts2["batch_stat_root"],
-                                                      dirs[0])
-
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts2["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Model only targets a single graph
-            intra_df = IntraExp_HomingTime_NRobots(self.main_config,
-                                                   self.config).run(criteria,
-                                                                    i,
-                                                                    cmdopts2)[0]
+        # Model only targets a single graph
+        exp_dfs = exp_runner.run_intra(IntraExp_HomingTime_NRobots(self.main_config, self.config),
+                                       criteria,
+                                       cmdopts,
+                                       self.config)
+
+        for exp, intra_dfs in zip(dirs, exp_dfs):
             # Last datapoint is the closest to the steady state value (presumably) so we select it
             # to use as our prediction for the experiment within the batch.
-            res_df[exp] = intra_df.loc[intra_df.index[-1], 'model']
+            res_df[exp] = intra_dfs[0].loc[intra_dfs[0].index[-1], 'model']
 
         return [res_df]
@@ -20,17 +20,19 @@ at which a robot experiences interference.
 """
 # Core packages
 import os
-import copy
 import typing as tp
+import functools
 
 # 3rd party packages
 import implements
+import numpy as np
 import pandas as pd
 import sierra.core.models.interface
 import sierra.core.variables.batch_criteria as bc
-from sierra.core import types, utils, storage
+from sierra.core import types, storage
 
 # Project packages
+import titerra.projects.fordyca_base.models.output_cache as output_cache
 
 
 def available_models(category: str):
@@ -105,8 +107,7 @@ class IntraExp_WallInterferenceRate_1Robot():
 
     @staticmethod
     def calc_kernel_args(exp_stat_root: str) -> tp.Dict[str, pd.DataFrame]:
-        fsm_counts_df = storage.DataFrameReader('storage.csv')(os.path.join(exp_stat_root,
-                                                                   'fsm-interference-counts.csv'))
+        fsm_counts_df = interference_counts_read(exp_stat_root)
         return {
             'N_av1': fsm_counts_df['cum_avg_exp_interference'],
             'tau_av1': fsm_counts_df['cum_avg_interference_duration']
@@ -128,15 +129,13 @@ class IntraExp_WallInterferenceRate_1Robot():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
 
-        result_opath = os.path.join(cmdopts['exp_stat_root'])
-
-        fsm_df = storage.DataFrameReader('storage.csv')(
-            os.path.join(result_opath, 'fsm-interference-counts.csv'))
+        fsm_df = interference_counts_read(cmdopts['exp_stat_root'])
 
         # We calculate 1 data point for each interval
         res_df = pd.DataFrame(columns=['model'], index=fsm_df.index)
@@ -229,9 +228,7 @@ class IntraExp_RobotInterferenceRate_NRobots():
             cmdopts['exp0_stat_root'])
 
         # Add additional args for N robot case
-        resultN_opath = os.path.join(cmdopts['exp_stat_root'])
-        fsm_countsN_df = storage.DataFrameReader('storage.csv')(os.path.join(resultN_opath,
-                                                                    'fsm-interference-counts.csv'))
+        fsm_countsN_df = interference_counts_read(cmdopts['exp_stat_root'])
 
         kargs['N_avN'] = fsm_countsN_df['cum_avg_exp_interference']
         kargs['tau_avN'] = fsm_countsN_df['cum_avg_interference_duration']
@@ -254,14 +251,13 @@ class IntraExp_RobotInterferenceRate_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
 
-        result_opath = os.path.join(cmdopts['exp_stat_root'])
-        fsm_df = storage.DataFrameReader('storage.csv')(
-            os.path.join(result_opath, 'fsm-interference-counts.csv'))
+        fsm_df = interference_counts_read(cmdopts['exp_stat_root'])
 
         # We calculate 1 data point for each interval
         res_df = pd.DataFrame(columns=['model'], index=fsm_df.index)
@@ -356,14 +352,13 @@ class IntraExp_RobotInterferenceTime_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             exp_num: int,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
 
-        result_opath = os.path.join(cmdopts['exp_stat_root'])
-        fsm_df = storage.DataFrameReader('storage.csv')(
-            os.path.join(result_opath, 'fsm-interference-counts.csv'))
+        fsm_df = interference_counts_read(cmdopts['exp_stat_root'])
 
         # We calculate 1 data point for each interval
         res_df = pd.DataFrame(columns=['model'], index=fsm_df.index)
@@ -391,7 +386,8 @@ class InterExp_RobotInterferenceRate_NRobots():
 
     .. IMPORTANT::
        This model does not have a kernel() function which computes the calculation, because
-       it is a summary model, built on simpler intra-experiment models.
+       it is a summary model, built on simpler intra-experiment models (computed for all
+       experiments at once via :class:`BatchInterferenceCounts`).
 
     """
 
@@ -411,6 +407,7 @@ class InterExp_RobotInterferenceRate_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -418,35 +415,9 @@ class InterExp_RobotInterferenceRate_NRobots():
         dirs = criteria.gen_exp_dirnames(cmdopts)
         res_df = pd.DataFrame(columns=dirs, index=[0])
 
-        for i, exp in enumerate(dirs):
-
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], dirs[0])
-
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Model only targets one graph
-            intra_df = IntraExp_RobotInterferenceRate_NRobots(self.main_config,
-                                                              self.config).run(criteria,
-                                                                               i,
-                                                                               cmdopts2)[0]
-            res_df[exp] = intra_df.loc[intra_df.index[-1], 'model']
+        # Same calculation as IntraExp_RobotInterferenceRate_NRobots, but for all experiments at once
+        counts = BatchInterferenceCounts.for_batch(criteria, cmdopts)
+        res_df.loc[0] = counts.steady_state(counts.rate())
 
         return [res_df]
 
@@ -460,7 +431,8 @@ class InterExp_RobotInterferenceTime_NRobots():
 
     .. IMPORTANT::
        This model does not have a kernel() function which computes the calculation, because
-       it is a summary model, built on simpler intra-experiment models.
+       it is a summary model, built on simpler intra-experiment models (computed for all
+       experiments at once via :class:`BatchInterferenceCounts`).
 
     """
 
@@ -480,6 +452,7 @@ class InterExp_RobotInterferenceTime_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -487,33 +460,109 @@ class InterExp_RobotInterferenceTime_NRobots():
         dirs = criteria.gen_exp_dirnames(cmdopts)
         res_df = pd.DataFrame(columns=dirs, index=[0])
 
-        for i, exp in enumerate(dirs):
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], dirs[0])
-
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Model only targets one graph
-            intra_df = IntraExp_RobotInterferenceTime_NRobots(self.main_config,
-                                                              self.config).run(criteria,
-                                                                               i,
-                                                                               cmdopts2)[0]
-            res_df[exp] = intra_df.loc[intra_df.index[-1], 'model']
+        # Same calculation as IntraExp_RobotInterferenceTime_NRobots, but for all experiments at once
+        counts = BatchInterferenceCounts.for_batch(criteria, cmdopts)
+        res_df.loc[0] = counts.steady_state(counts.time())
 
         return [res_df]
+
+################################################################################
+# Helper Classes
+################################################################################
+
+
+class BatchInterferenceCounts():
+    r"""
+    The interference counts for all experiments in a batch, as 2D arrays with one row per
+    experiment and one column per timestep, so that the Little's Law quantities in the models
+    above can be computed for every experiment and timestep at once. Experiments with fewer
+    timesteps than the longest experiment are padded with NaN.
+
+    Row 0 is always exp0, which is assumed to be a swarm of size 1.
+
+    Arguments:
+        exp_stat_roots: The collated stats roots of all experiments in the batch, in order.
+
+        populations: The swarm size for each experiment in the batch.
+    """
+
+    @classmethod
+    def for_batch(cls,
+                  criteria: bc.IConcreteBatchCriteria,
+                  cmdopts: types.Cmdopts) -> 'BatchInterferenceCounts':
+        dirs = criteria.gen_exp_dirnames(cmdopts)
+        return cls([os.path.join(cmdopts['batch_stat_root'], exp) for exp in dirs],
+                   criteria.populations(cmdopts))
+
+    def __init__(self, exp_stat_roots: tp.List[str], populations: tp.List[int]) -> None:
+        dfs = [interference_counts_read(root) for root in exp_stat_roots]
+
+        self.n_timesteps = np.array([len(df.index) for df in dfs])
+        self.N = np.array(populations, dtype=float)[:, np.newaxis]
+
+        # Cumulative averages drive the rate/time calculations
+        self.N_av = self._stack(dfs, 'cum_avg_exp_interference')
+        self.tau_av = self._stack(dfs, 'cum_avg_interference_duration')
+
+    def rate1(self) -> np.ndarray:
+        r"""
+        :math:`\alpha_{ca}^1` for exp0 via :meth:`IntraExp_WallInterferenceRate_1Robot.kernel()`,
+        as a row vector.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return IntraExp_WallInterferenceRate_1Robot.kernel(N_av1=self.N_av[0:1],
+                                                               tau_av1=self.tau_av[0:1])
+
+    def rate(self) -> np.ndarray:
+        r"""
+        :math:`\alpha_{ca}^N` for all experiments via
+        :meth:`IntraExp_RobotInterferenceRate_NRobots.kernel()`.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return IntraExp_RobotInterferenceRate_NRobots.kernel(N_av1=self.N_av[0:1],
+                                                                 tau_av1=self.tau_av[0:1],
+                                                                 N_avN=self.N_av,
+                                                                 tau_avN=self.tau_av)
+
+    def time(self) -> np.ndarray:
+        r"""
+        :math:`\tau_{av}^N` for all experiments, computed the same way as
+        :meth:`IntraExp_RobotInterferenceTime_NRobots.kernel()`.
+        """
+        alpha_ca1 = self.rate1()
+        alpha_caN = self.rate()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tau1 = self.N_av[0:1] / alpha_ca1
+            tauN = self.N_av / alpha_caN - alpha_ca1 * self.N_av
+
+        return np.where(self.N == 1, tau1, tauN)
+
+    def steady_state(self, values: np.ndarray) -> np.ndarray:
+        """
+        Select the last (i.e., closest to steady state) value of each experiment from a
+        calculated quantity.
+        """
+        return values[np.arange(values.shape[0]), self.n_timesteps - 1]
+
+    def _stack(self, dfs: tp.List[pd.DataFrame], col: str) -> np.ndarray:
+        res = np.full((len(dfs), self.n_timesteps.max()), np.nan)
+        for i, df in enumerate(dfs):
+            res[i, :len(df.index)] = df[col].values
+
+        return res
+
+
+def interference_counts_read(exp_stat_root: str) -> pd.DataFrame:
+    """
+    Read the collated interference counts for an experiment. Many models need them, so each file
+    is only read once per process until it changes on disk. The returned dataframe is shared, and
+    must not be modified.
+    """
+    path = os.path.join(exp_stat_root, 'fsm-interference-counts.csv')
+    return _interference_counts_read(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=256)
+def _interference_counts_read(path: str, mtime: float) -> pd.DataFrame:
+    return storage.DataFrameReader('storage.csv')(path)
@@ -16,27 +16,38 @@
 
 # Core packages
 import os
-import copy
 import typing as tp
+import logging  # type: ignore
 
 # 3rd party packages
+import numpy as np
 import pandas as pd
-from sierra.core import types, utils, storage
+from sierra.core import types, storage
 import sierra.core.models.interface
 import sierra.core.variables.batch_criteria as bc
 
 # Project packages
+import titerra.projects.fordyca_base.models.exp_runner as exp_runner
 
 
 class Model2DError():
     """
     Runs the specified :class:`models.interface.IConcreteIntraExpModel2D` for each experiment in the
-    batch, computing the average error between model prediction and empirical data as a single
-    data point.
+    batch, computing the error between model prediction and empirical data.
 
-    Returns a 1D data frame for the batch.
+    The model prediction and empirical data for each experiment are read/computed in parallel (see
+    :func:`~titerra.projects.fordyca_base.models.exp_runner.map_exps()`), and aligned by their row
+    and column labels; cells which are only present in one of them are ignored. The errors are then
+    computed for all experiments whose aligned data has the same shape at once, as array operations
+    over their stacked data, so batches whose experiments produce different shapes (e.g., varying
+    arena size) are still supported.
+
+    :meth:`generate()` returns the average error (L1) as a 1D data frame for the batch;
+    :meth:`generate_variants()` returns it along with the other error variants.
     """
 
+    kVARIANTS = ['l1', 'l2', 'relative', 'time']
+
     def __init__(self,
                  stddev_fname: str,
                  model: sierra.core.models.interface.IConcreteIntraExpModel2D,
@@ -46,42 +57,97 @@ class Model2DError():
         self.model = model
         self.main_config = main_config
         self.model_config = model_config
+        self.logger = logging.getLogger(__name__)
 
     def generate(self,
                  cmdopts: types.Cmdopts,
                  criteria: bc.IConcreteBatchCriteria) -> tp.List[pd.DataFrame]:
+        return [self.generate_variants(cmdopts, criteria)['l1']]
+
+    def generate_variants(self,
+                          cmdopts: types.Cmdopts,
+                          criteria: bc.IConcreteBatchCriteria) -> tp.Dict[str, pd.DataFrame]:
+        """
+        Compute all error variants for the batch, as a dictionary of:
+
+        - ``l1`` - The L1 error, as a 1D data frame with a single datapoint per experiment.
+
+        - ``l2`` - The L2 error, as a 1D data frame with a single datapoint per experiment.
+
+        - ``relative`` - The L1 error normalized by the L1 norm of the empirical data, as a 1D data
+          frame with a single datapoint per experiment.
+
+        - ``time`` - The L1 error summed over each row of the 2D data (i.e., for each interval), as
+          a data frame with one column per experiment.
+        """
         dirs = criteria.gen_exp_dirnames(cmdopts)
-        res_df = pd.DataFrame(columns=dirs, index=[0])
-
-        for i, exp in enumerate(dirs):
-
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Calculate model prediction heatmap
-            model_df = self.model(self.main_config, self.model_config).run(
-                cmdopts2, criteria, i)
-
-            # Get data heatmap
-            data_ipath = os.path.join(
-                cmdopts2['exp_stat_root'], self.stddev_fname)
-            data_df = sierra.core.storage.DataFrameReader('storage.csv')(data_ipath)
-
-            # Compute datapoint
-            d1_norm = (model_df - data_df).abs().to_numpy().sum()
-            # d2_norm = (model_df - data_df).pow(2).sum(1).sum()
-            res_df[exp] = d1_norm
-
-        return [res_df]
+        aligned = exp_runner.map_exps(self._exp_aligned,
+                                      criteria,
+                                      cmdopts,
+                                      self.model_config)
+
+        res = {v: pd.DataFrame(columns=dirs, index=[0]) for v in self.kVARIANTS if v != 'time'}
+        time_norms = {}  # type: tp.Dict[str, pd.Series]
+
+        # Experiments with the same shape are stacked along a new first axis, and all their errors
+        # computed at once.
+        groups = {}  # type: tp.Dict[tp.Tuple[int, ...], tp.List[int]]
+        for i, (model, _, _) in enumerate(aligned):
+            groups.setdefault(model.shape, []).append(i)
+
+        for exp_nums in groups.values():
+            model = np.stack([aligned[i][0] for i in exp_nums])
+            data = np.stack([aligned[i][1] for i in exp_nums])
+
+            abs_err = np.abs(model - data)
+            l1_norm = abs_err.sum(axis=(1, 2))
+            l2_norm = np.sqrt(((model - data) ** 2).sum(axis=(1, 2)))
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rel_norm = l1_norm / np.abs(data).sum(axis=(1, 2))
+
+            time_norm = abs_err.sum(axis=2)
+
+            for j, i in enumerate(exp_nums):
+                res['l1'][dirs[i]] = l1_norm[j]
+                res['l2'][dirs[i]] = l2_norm[j]
+                res['relative'][dirs[i]] = rel_norm[j]
+                time_norms[dirs[i]] = pd.Series(time_norm[j], index=aligned[i][2])
+
+        # Experiments can have different #s of intervals; missing ones are NaN.
+        res['time'] = pd.DataFrame(time_norms, columns=dirs)
+        return res
+
+    def _exp_aligned(self,
+                     criteria: bc.IConcreteBatchCriteria,
+                     exp_num: int,
+                     cmdopts: types.Cmdopts) -> tp.Tuple[np.ndarray, np.ndarray, pd.Index]:
+        """
+        Get the model prediction and empirical data heatmaps for an experiment as arrays of the same
+        shape, with cells in the same positions having the same row and column labels, along with
+        the labels of their rows.
+        """
+        # Calculate model prediction heatmap
+        model_df = self.model(self.main_config, self.model_config).run(
+            cmdopts, criteria, exp_num)
+
+        # Get data heatmap
+        data_ipath = os.path.join(
+            cmdopts['exp_stat_root'], self.stddev_fname)
+        data_df = storage.DataFrameReader('storage.csv')(data_ipath)
+
+        # Column labels read from .csv files are always strings, but models can use anything.
+        model_df = model_df.rename(columns=str)
+        data_df = data_df.rename(columns=str)
+        model_aligned, data_aligned = model_df.align(data_df, join='inner')
+
+        if model_aligned.shape != model_df.shape or data_aligned.shape != data_df.shape:
+            self.logger.warning("%s: model prediction %s and data %s heatmaps differ; using the %s cells in both",
+                                cmdopts['exp_stat_root'],
+                                model_df.shape,
+                                data_df.shape,
+                                model_aligned.shape)
+
+        return (model_aligned.to_numpy(dtype=float),
+                data_aligned.to_numpy(dtype=float),
+                model_aligned.index)
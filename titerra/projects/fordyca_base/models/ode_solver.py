@@ -20,13 +20,17 @@ ODE solvers for swarm behavior in different scenarios.
 # Core packages
 import typing as tp
 import math
+import logging
 
 # 3rd party packages
 import numpy as np
-import scipy.integrate as si
 
 # Project packages
 from titerra.projects.fordyca_base.models.interference import IntraExp_RobotInterferenceRate_NRobots
+from titerra.projects.common.lazy_import import lazy_import
+
+si = lazy_import('scipy.integrate')
+so = lazy_import('scipy.optimize')
 
 
 class CRWSolver():
@@ -38,6 +42,9 @@ class CRWSolver():
     - N - How many robots are in the swarm.
     - T - Length of simulation in timesteps.
     - n_datapoints - How many datapoints were taken during simulation.
+    - output_interval - (Optional) Timesteps between datapoints, i.e., the
+      metric output interval. If omitted, datapoints are evenly spaced over
+      the simulation.
     - tau_h1 - Average homing time for 1 robot.
     - tau_av1 - Average collision avoidance time for 1 robot.
     - alpha_ca1 - Rate of entering collision avoidance for 1 robot.
@@ -46,52 +53,285 @@ class CRWSolver():
     If N > 1, the following addition parameters are needed:
     - tau_avN - Average collision avoidance time for a robot in a N robot swarm.
     - crwD - Diffusion constant for a swarm of N CRW robots.
+
+    Arguments:
+        params: The model parameters described above.
+
+        method: The integration method to use. Can be any method accepted by
+                :func:`scipy.integrate.solve_ivp`, or ``auto``, in which case
+                a stiff or non-stiff method is selected based on the
+                eigenvalues of the (constant) Jacobian of the system.
+
+        ss_tol: If not None, integration stops as soon as the magnitude of all
+                derivatives falls below this tolerance, and the remaining
+                datapoints are filled in with the steady state values. Either
+                way, the steady state is available via :attr:`z_ss` after
+                :meth:`solve()`, so time-resolved and steady state predictions
+                come from the same solve.
+
+        mode: How to solve the system. ``integrate`` integrates the system over
+              the duration of the simulation. ``fixed_point`` solves for the
+              steady state directly with a root finder, and returns it for
+              all datapoints, falling back to integrating if the root finder
+              does not converge.
     """
+    # Number of the fastest time constants of the system spanned by the
+    # integration interval above which the system is treated as stiff:
+    # explicit methods need O(that many) steps to remain stable.
+    kSTIFFNESS_RATIO = 1000.0
+
+    # Stiff/non-stiff methods selected from when method='auto'.
+    kSTIFF_METHOD = 'BDF'
+    kNONSTIFF_METHOD = 'RK45'
+
+    # Default tolerance on the magnitude of the derivatives for detecting
+    # steady state, for callers which only care about the steady state.
+    kSS_TOL = 1e-8
+
+    # Integration tolerances, the same as the odeint() defaults. The
+    # solve_ivp() defaults are much looser, which both loses accuracy and
+    # puts the integration error above kSS_TOL, so steady state is never
+    # detected.
+    kRTOL = 1.49012e-8
+    kATOL = 1.49012e-8
 
-    def __init__(self, params: tp.Dict[str, float]):
+    # Methods which make use of the analytic Jacobian.
+    kIMPLICIT_METHODS = ['Radau', 'BDF', 'LSODA']
+
+    def __init__(self,
+                 params: tp.Dict[str, float],
+                 method: str = 'auto',
+                 ss_tol: tp.Optional[float] = None,
+                 mode: str = 'integrate') -> None:
         self.params = params
+        self.method = method
+        self.ss_tol = ss_tol
+        self.mode = mode
+        self.z_ss = None  # type: tp.Optional[np.ndarray]
+        self.logger = logging.getLogger(__name__)
+
+    def solve(self, z0: tp.Dict[str, float]) -> np.ndarray:
+        """
+        Solve the system, returning the state at each of :meth:`times()`, one
+        row per timestep.
+        """
+        if self.mode == 'fixed_point':
+            z_ss = self.solve_fixed_point(z0)
+            if z_ss is not None:
+                z = np.tile(z_ss, (len(self.times()), 1))
+                self.z_ss = z[-1]
+                return z
+
+            self.logger.warning("Fixed point solve did not converge: falling back to integration")
+
+        z = self.solve_integrate(z0)
+        self.z_ss = z[-1]
+        return z
+
+    def times(self) -> np.ndarray:
+        """
+        The timesteps the solution is computed at: every metric output
+        interval, if known, to line up row for row with the collated
+        experimental data, and evenly spaced over the simulation otherwise.
+        """
+        if self.params.get('output_interval'):
+            dt = float(self.params['output_interval'])
+            return np.arange(1, self.params['n_datapoints'] + 1) * dt
+
+        return np.linspace(0, self.params['T'], self.params['n_datapoints'])
 
-    def solve(self, z0: tp.Dict[str, float]):
+    def solve_fixed_point(self, z0: tp.Dict[str, float]) -> tp.Optional[np.ndarray]:
+        """
+        Solve for the steady state of the system directly, using the same RHS
+        as :meth:`solve_integrate()`.
+
+        The block count does not feed back into any of the other terms, so it
+        is not part of the root finding; it is held at its initial value.
+
+        Returns:
+            The steady state, or None if the root finder did not converge.
+        """
+        N = self.params['N']
+        rates = self.rates(self.params)
+        jac = self._jacobian(N, rates)
+        B0 = z0['B0']
+        tol = self.ss_tol if self.ss_tol is not None else self.kSS_TOL
+
+        res = so.root(lambda z: self._rhs(np.append(z, B0), N, rates)[:3],
+                      [z0['N_s0'], z0['N_h0'], z0['N_avs0']],
+                      jac=lambda z: jac[:3, :3],
+                      method='hybr')
+
+        z_ss = np.append(res.x, B0)
+
+        # The root finder's own convergence flag is unreliable in both
+        # directions (it can give up on the exact root of a linear system
+        # because it is not making progress), so check all derivatives at the
+        # point it found instead.
+        if not np.all(np.isfinite(z_ss)) or np.max(np.abs(self._rhs(z_ss, N, rates))) > tol:
+            return None
+
+        return z_ss
+
+    @staticmethod
+    def fixed_point_batch(params: tp.Dict[str, tp.Any]) -> np.ndarray:
+        """
+        Solve for the steady state of the system for a batch of parameter
+        sets at once. Any of the params other than N can be arrays of samples
+        of the same length.
+
+        The system is linear in the state variables, so its fixed point is the
+        solution of :math:`Jz = -f(0)`, where :math:`f` is the same RHS used
+        for integration and :math:`J` is its Jacobian, which is computed for
+        all samples with a single batched linear solve.
+
+        Returns:
+            Array of shape (n_samples, 3) of the steady state N_s, N_h, N_avs.
+        """
+        N = params['N']
+        rates = CRWSolver.rates(params)
+        n_samples = max(np.size(r) for r in rates.values())
+        rates = {k: np.broadcast_to(np.asarray(v, dtype=float), (n_samples,))
+                 for k, v in rates.items()}
+
+        # The block count does not feed back into the other terms, so it is
+        # not part of the solve.
+        zeros = np.zeros(n_samples)
+        f0 = np.array(CRWSolver._rhs([zeros, zeros, zeros, zeros], N, rates)[:3])
+        jac = CRWSolver._jacobian(N, rates)[:3, :3]
+
+        return np.linalg.solve(np.moveaxis(jac, -1, 0),
+                               -np.moveaxis(f0, -1, 0)[..., np.newaxis])[..., 0]
+
+    def solve_integrate(self, z0: tp.Dict[str, float]) -> np.ndarray:
 
         # initial conditions (can be changed)
         # z0 = [1, 0, 0, 20]
         # z0 = initial_conditions
 
         # time points
-        t = np.linspace(0, self.params['T'], self.params['n_datapoints'])
+        t = self.times()
         z0_arr = [z0['N_s0'], z0['N_h0'],  z0['N_avs0'], z0['B0']]
-        z = si.odeint(self.kernel, z0_arr, t, args=(self, self.params))
+
+        # The rates are constant for a given set of params, so compute them
+        # once rather than on every RHS evaluation.
+        N = self.params['N']
+        rates = self.rates(self.params)
+        jac = self._jacobian(N, rates)
+
+        events = None
+        if self.ss_tol is not None:
+            def steady_state(t, z):
+                return np.max(np.abs(self._rhs(z, N, rates))) - self.ss_tol
+            steady_state.terminal = True
+            steady_state.direction = -1
+            events = [steady_state]
+
+        method = self.select_method(jac)
+
+        # The integration error must be below the steady state tolerance, or
+        # the derivatives never fall below it.
+        atol = self.kATOL
+        if self.ss_tol is not None:
+            atol = min(atol, self.ss_tol)
+
+        options = {'rtol': self.kRTOL, 'atol': atol}
+        if method in self.kIMPLICIT_METHODS:
+            options['jac'] = lambda t, z: jac
+
+        res = si.solve_ivp(lambda t, z: self._rhs(z, N, rates),
+                           (0.0, t[-1]),
+                           z0_arr,
+                           method=method,
+                           t_eval=t,
+                           events=events,
+                           **options)
+
+        # solve_ivp returns states as columns; callers expect the odeint()
+        # layout of one row per timestep.
+        z = res.y.T
+
+        # If we stopped early because we reached steady state, the rest of
+        # the solution is (within tolerance) constant.
+        if len(z) < len(t):
+            ss = res.y_events[0][0] if len(res.t_events[0]) > 0 else z[-1]
+            z = np.vstack([z, np.tile(ss, (len(t) - len(z), 1))])
 
         return z
 
+    def select_method(self, jac: np.ndarray) -> str:
+        """
+        Select the integration method to use. If a specific method was
+        requested, use it; otherwise, choose between a stiff and a non-stiff
+        method based on how many of the fastest time constants of the system
+        the integration interval spans.
+        """
+        if self.method != 'auto':
+            return self.method
+
+        eigs = np.abs(np.real(np.linalg.eigvals(jac)))
+        eigs = eigs[eigs > 0.0]
+
+        if len(eigs) == 0:
+            return self.kNONSTIFF_METHOD
+
+        if eigs.max() * self.params['T'] > self.kSTIFFNESS_RATIO:
+            return self.kSTIFF_METHOD
+
+        return self.kNONSTIFF_METHOD
+
+    @staticmethod
+    def rates(params: tp.Dict[str, float]) -> tp.Dict[str, float]:
+        """
+        Compute the rates/times used in the ODE terms from the model
+        parameters, for either the 1 robot or the N robot case.
+        """
+        if params['N'] == 1:
+            return {
+                'tau_av': params['tau_av1'],
+                'alpha_ca': params['alpha_ca1'],
+                'tau_h': params['tau_h1'],
+                'alpha_b': params['alpha_b1']
+            }
+
+        N_avN_est = params['N_av1'] * params['crwD']
+        # N_avN_est = params['N_avN']
+
+        alpha_ca = IntraExp_RobotInterferenceRate_NRobots.kernel(N_av1=params['N_av1'],
+                                                                 tau_av1=params['tau_av1'],
+                                                                 N_avN=N_avN_est,
+                                                                 tau_avN=params['tau_avN'])
+        return {
+            'tau_av': params['tau_avN'],
+            'alpha_ca': alpha_ca,
+            'tau_h': params['tau_hN'],
+            'alpha_b': params['alpha_bN']
+        }
+
     @staticmethod
     def kernel(z, t, self, params: tp.Dict[str, float]):
-        N = params['N']
+        return CRWSolver._rhs(z, params['N'], CRWSolver.rates(params))
+
+    @staticmethod
+    def jacobian(z, t, self, params: tp.Dict[str, float]) -> np.ndarray:
+        """
+        Analytic Jacobian of :meth:`kernel()`. The system is linear in the
+        state variables, so the Jacobian is constant for a given set of
+        params.
+        """
+        return CRWSolver._jacobian(params['N'], CRWSolver.rates(params))
+
+    @staticmethod
+    def _rhs(z, N: float, rates: tp.Dict[str, float]) -> tp.List[float]:
         N_s = z[0]
         N_h = z[1]
         N_avs = z[2]
         N_avh = N - N_s - N_h - N_avs
-        B = z[3]
-
-        if N == 1:
-            tau_av = params['tau_av1']
 
-            alpha_ca = params['alpha_ca1']
-            tau_h = params['tau_h1']
-            alpha_b = params['alpha_b1']
-        else:
-            tau_av = params['tau_avN']
-
-            N_avN_est = params['N_av1'] * params['crwD']
-            # N_avN_est = params['N_avN']
-
-            alpha_ca = IntraExp_RobotInterferenceRate_NRobots.kernel(N_av1=params['N_av1'],
-                                                                     tau_av1=params['tau_av1'],
-                                                                     N_avN=N_avN_est,
-                                                                     tau_avN=params['tau_avN'])
-
-            tau_h = params['tau_hN']
-            alpha_b = params['alpha_bN']
+        tau_av = rates['tau_av']
+        alpha_ca = rates['alpha_ca']
+        tau_h = rates['tau_h']
+        alpha_b = rates['alpha_b']
 
         #
         # ODE terms: dN_s, dN_h, dN_avs, dB. dN_avh is NOT computed here, as it can be obtained from
@@ -116,3 +356,22 @@ class CRWSolver():
         dB = (N_h / tau_h) - alpha_b
 
         return [dN_s, dN_h, dN_avs, dB]
+
+    @staticmethod
+    def _jacobian(N: float, rates: tp.Dict[str, float]) -> np.ndarray:
+        inv_tau_av = 1.0 / rates['tau_av']
+        inv_tau_h = 1.0 / rates['tau_h']
+
+        # Rows are d/dz of dN_s, dN_h, dN_avs, dB; columns are N_s, N_h,
+        # N_avs, B. N_avh depends on N_s, N_h, N_avs via conservation of
+        # robots.
+        #
+        # The rates can also be arrays of samples, in which case the Jacobian
+        # for each sample is along the last axis.
+        zero = 0.0 * inv_tau_av
+        return np.array([
+            [zero, inv_tau_h, inv_tau_av, zero],
+            [-inv_tau_av, -inv_tau_av - inv_tau_h, -inv_tau_av, zero],
+            [zero, zero * inv_tau_h, -inv_tau_av, zero],
+            [zero, inv_tau_h, zero * inv_tau_h, zero]
+        ])
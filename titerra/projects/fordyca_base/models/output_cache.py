@@ -0,0 +1,207 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of SIERRA.
+#
+#  SIERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  SIERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  SIERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Persistent caching of model outputs across runs of stage 4.
+
+A model's outputs are a function of its inputs, so if none of them have
+changed since the model was last run its previous outputs can be used
+instead of re-running it. The inputs of a model are taken to be:
+
+- The contents of the collated ``.csv`` files and pickled experiment
+  definitions for the experiment(s) the model is run on (and exp0, which
+  intra-experiment models can use as a reference).
+
+- The model config and main config, except for keys which only control how
+  the model is run, not what it computes.
+
+- The stage 4 cmdline options which models read.
+
+- The source code of the models, and of the rest of ``titerra.projects``
+  which they use.
+
+- Any other files the model reads, e.g. per-simulation outputs; models which
+  read such files list them via an optional ``cache_inputs(criteria,
+  cmdopts)`` method.
+
+Caching is enabled by default, and can be disabled for a model by setting
+``cache_outputs`` to ``'false'`` in its config.
+"""
+
+# Core packages
+import os
+import typing as tp
+import functools
+import hashlib
+import json
+import logging  # type: ignore
+
+# 3rd party packages
+import pandas as pd
+from sierra.core import types, utils, config
+import sierra.core.variables.batch_criteria as bc
+
+# Project packages
+
+# Model config keys which do not affect model outputs
+kRUN_CONFIG_KEYS = ['n_procs', 'cache_outputs']
+
+# Cmdline options which can affect model outputs
+kCMDOPTS_KEYS = ['scenario', 'dist_stats', 'exp_range']
+
+kCACHE_LEAF = 'cache'
+
+
+def cached(run: tp.Callable[..., tp.List[pd.DataFrame]]) -> tp.Callable[..., tp.List[pd.DataFrame]]:
+    """
+    Decorator for the ``run()`` method of intra- and inter-experiment models,
+    which loads the model's outputs from the previous run if its inputs have
+    not changed, and runs it and saves its outputs otherwise.
+    """
+    @functools.wraps(run)
+    def wrapper(self, criteria: bc.IConcreteBatchCriteria, *args) -> tp.List[pd.DataFrame]:
+        cmdopts = args[-1]
+
+        if not _enabled(self.config):
+            return run(self, criteria, *args)
+
+        if len(args) == 2:  # intra-experiment model
+            roots = [cmdopts['exp_stat_root'],
+                     cmdopts['exp0_stat_root'],
+                     cmdopts['exp_input_root']]
+            cache_root = os.path.join(cmdopts['exp_model_root'], kCACHE_LEAF)
+        else:
+            dirs = criteria.gen_exp_dirnames(cmdopts)
+            roots = [os.path.join(cmdopts[r], d)
+                     for d in dirs
+                     for r in ['batch_stat_root', 'batch_input_root']]
+            roots.append(cmdopts['batch_stat_collate_root'])
+            cache_root = os.path.join(cmdopts['batch_model_root'], kCACHE_LEAF)
+
+        # The same model can be run for different experiments (e.g., exp0 as
+        # a reference) in the same directory, so the other positional
+        # arguments are part of both the key and the cache file names.
+        run_args = [str(a) for a in args[:-1]]
+        inputs = []  # type: tp.List[str]
+        if hasattr(self, 'cache_inputs'):
+            inputs = self.cache_inputs(criteria, cmdopts)
+
+        key = _fingerprint(self, cmdopts, roots, inputs, run_args)
+        stem = os.path.join(cache_root, '-'.join([str(self)] + run_args))
+        logger = logging.getLogger(__name__)
+
+        if os.path.exists(stem + '.key'):
+            with open(stem + '.key', 'r') as f:
+                if f.read() == key:
+                    logger.debug("Using cached outputs for model '%s' from %s",
+                                 str(self),
+                                 cache_root)
+                    return pd.read_pickle(stem + config.kPickleExt)
+
+        dfs = run(self, criteria, *args)
+
+        # Key is written last, so that outputs are never used if we are
+        # interrupted while writing them.
+        utils.dir_create_checked(cache_root, exist_ok=True)
+        tmp_stem = '{0}.{1}'.format(stem, os.getpid())
+        pd.to_pickle(dfs, tmp_stem + config.kPickleExt)
+        os.replace(tmp_stem + config.kPickleExt, stem + config.kPickleExt)
+
+        with open(tmp_stem + '.key', 'w') as f:
+            f.write(key)
+        os.replace(tmp_stem + '.key', stem + '.key')
+
+        return dfs
+
+    return wrapper
+
+
+def _enabled(model_config: types.YAMLDict) -> bool:
+    return str(model_config.get('cache_outputs', 'true')).lower() not in ['false', 'no', '0']
+
+
+def _fingerprint(model: tp.Any,
+                 cmdopts: types.Cmdopts,
+                 roots: tp.List[str],
+                 inputs: tp.List[str],
+                 run_args: tp.List[str]) -> str:
+    h = hashlib.sha256()
+    h.update(str(model).encode())
+    h.update(json.dumps(run_args).encode())
+    h.update(_code_version().encode())
+
+    model_config = {k: v for k, v in model.config.items() if k not in kRUN_CONFIG_KEYS}
+    h.update(json.dumps(model_config, sort_keys=True, default=str).encode())
+    h.update(json.dumps(model.main_config, sort_keys=True, default=str).encode())
+    h.update(json.dumps({k: cmdopts.get(k) for k in kCMDOPTS_KEYS},
+                        sort_keys=True,
+                        default=str).encode())
+
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+
+        for leaf in sorted(os.listdir(root)):
+            path = os.path.join(root, leaf)
+            if os.path.splitext(leaf)[1] not in ['.csv', config.kPickleExt] or not os.path.isfile(path):
+                continue
+
+            stat = os.stat(path)
+            h.update(leaf.encode())
+            h.update(_file_digest(path, stat.st_size, stat.st_mtime_ns).encode())
+
+    for path in inputs:
+        h.update(path.encode())
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            h.update(_file_digest(path, stat.st_size, stat.st_mtime_ns).encode())
+
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version() -> str:
+    """
+    Digest of the source of all of ``titerra.projects``. Models can call each
+    other and the code shared between projects (variables, collated output
+    parsing, etc.), so a change to any of it can change the outputs of all of
+    them.
+    """
+    h = hashlib.sha256()
+    projects_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    for dirpath, dirnames, filenames in os.walk(projects_root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for leaf in sorted(filenames):
+            if leaf.endswith('.py'):
+                path = os.path.join(dirpath, leaf)
+                h.update(os.path.relpath(path, projects_root).encode())
+                with open(path, 'rb') as f:
+                    h.update(f.read())
+
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    """
+    Digest of the contents of a file. Many models share the same inputs, so
+    the digest is only computed once per process until the file changes.
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+
+    return h.hexdigest()
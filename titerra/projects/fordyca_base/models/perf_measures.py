@@ -21,17 +21,17 @@ supports.
 # Core packages
 import os
 import typing as tp
-import copy
 
 # 3rd party packages
 import implements
+import numpy as np
 import pandas as pd
 import sierra.core.models.interface
 import sierra.core.utils
 import sierra.core.config
 import sierra.core.variables.batch_criteria as bc
 from sierra.core.vector import Vector3D
-from sierra.core import types
+from sierra.core import types, storage
 import sierra.core.stat_kernels
 
 # Project packages
@@ -43,6 +43,8 @@ import titerra.projects.fordyca_base.models.representation as rep
 from titerra.projects.fordyca_base.models.density import BlockAcqDensity
 from titerra.projects.fordyca_base.models.dist_measure import DistanceMeasure2D
 from titerra.projects.fordyca_base.models.blocks import IntraExp_BlockAcqRate_NRobots
+import titerra.projects.fordyca_base.models.exp_runner as exp_runner
+import titerra.projects.fordyca_base.models.output_cache as output_cache
 
 
 def available_models(category: str):
@@ -87,6 +89,7 @@ class InterExp_RawPerf_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -94,35 +97,14 @@ class InterExp_RawPerf_NRobots():
         dirs = criteria.gen_exp_dirnames(cmdopts)
         res_df = pd.DataFrame(columns=dirs, index=[0])
 
-        for i, exp in enumerate(dirs):
-
-            # Setup cmdopts for intra-experiment model
-            cmdopts2 = copy.deepcopy(cmdopts)
-
-            cmdopts2["exp0_output_root"] = os.path.join(
-                cmdopts["batch_output_root"], dirs[0])
-            cmdopts2["exp0_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], dirs[0])
-
-            cmdopts2["exp_input_root"] = os.path.join(
-                cmdopts['batch_input_root'], exp)
-            cmdopts2["exp_output_root"] = os.path.join(
-                cmdopts['batch_output_root'], exp)
-            cmdopts2["exp_graph_root"] = os.path.join(
-                cmdopts['batch_graph_root'], exp)
-            cmdopts2["exp_stat_root"] = os.path.join(
-                cmdopts["batch_stat_root"], exp)
-            cmdopts2["exp_model_root"] = os.path.join(
-                cmdopts['batch_model_root'], exp)
-            sierra.core.utils.dir_create_checked(
-                cmdopts2['exp_model_root'], exist_ok=True)
-
-            # Model only targets a single graph
-            intra_df = IntraExp_BlockAcqRate_NRobots(self.main_config,
-                                                     self.config).run(criteria,
-                                                                      i,
-                                                                      cmdopts2)[0]
-            res_df[exp] = intra_df['model'].iloc[-1]
+        # Model only targets a single graph
+        exp_dfs = exp_runner.run_intra(IntraExp_BlockAcqRate_NRobots(self.main_config, self.config),
+                                       criteria,
+                                       cmdopts,
+                                       self.config)
+
+        for exp, intra_dfs in zip(dirs, exp_dfs):
+            res_df[exp] = intra_dfs[0]['model'].iloc[-1]
 
         # All done!
         return [res_df]
@@ -157,6 +139,7 @@ class InterExp_Scalability_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -164,8 +147,10 @@ class InterExp_Scalability_NRobots():
         perf_df = InterExp_RawPerf_NRobots(self.main_config, self.config).run(criteria,
                                                                               cmdopts)[0]
 
-        perf_dfs_mock = _mock_distribution_gen(
-            criteria, self.main_config, cmdopts, perf_df)
+        perf_dfs_mock = _mock_distribution_gen(criteria,
+                                               cmdopts,
+                                               perf_df,
+                                               _mock_sims_gen(criteria, self.main_config, cmdopts))
 
         sc_dfs = self.kernel(criteria, cmdopts, perf_dfs_mock)
 
@@ -213,6 +198,7 @@ class InterExp_SelfOrg_NRobots():
     def __repr__(self) -> str:
         return self.__class__.__name__
 
+    @output_cache.cached
     def run(self,
             criteria: bc.IConcreteBatchCriteria,
             cmdopts: types.Cmdopts) -> tp.List[pd.DataFrame]:
@@ -220,10 +206,6 @@ class InterExp_SelfOrg_NRobots():
         perf_df = InterExp_RawPerf_NRobots(self.main_config, self.config).run(criteria,
                                                                               cmdopts)[0]
 
-        perf_dfs_mock = _mock_distribution_gen(
-            criteria, self.main_config, cmdopts, perf_df)
-
-        # Just needed to extract simulation names/n_sims
         interference_leaf = self.main_config['sierra']['perf']['intra_interference_csv'].split('.')[
             0]
         interference_col = self.main_config['sierra']['perf']['intra_interference_col']
@@ -233,6 +215,10 @@ class InterExp_SelfOrg_NRobots():
                                                             interference_leaf,
                                                             interference_col)
 
+        # Simulation names are the same for all experiments
+        sims = list(next(iter(interference_dfs.values())).columns)
+        perf_dfs_mock = _mock_distribution_gen(criteria, cmdopts, perf_df, sims)
+
         so_dfs = self.kernel(criteria, cmdopts, perf_dfs_mock, interference_dfs)
 
         dist_dfs = sierra.core.stat_kernels.mean.from_pm(so_dfs)
@@ -245,40 +231,39 @@ class InterExp_SelfOrg_NRobots():
 
 
 def _mock_distribution_gen(criteria: bc.IConcreteBatchCriteria,
-                           main_config: types.YAMLDict,
                            cmdopts: types.Cmdopts,
-                           prediction: pd.DataFrame) -> tp.Dict[str, pd.DataFrame]:
+                           prediction: pd.DataFrame,
+                           sims: tp.List[str]) -> tp.Dict[str, pd.DataFrame]:
     """
     The TITAN performance measures expect a distribution of simulation data as
     input, in the form of a dictionary of (experiment name, dataframe)
-    pairs. The dataframe must have temporal columns for each simulation (i.e.,
-    no truncating to steady state yet). To generate predictions of *steady
-    state* performance measures, we generate a mock distribution of the
+    pairs, with a column for each simulation. To generate predictions of
+    *steady state* performance measures, we generate a mock distribution of the
     necessary shape here.
 
+    The performance measure kernels only use the last (steady state) row of
+    each simulation, so the mock distribution only has that row, and is built
+    for all experiments at once from the model predictions.
     """
     exp_dirs = sierra.core.utils.exp_range_calc(cmdopts, '', criteria)
 
-    # Just needed to extract simulation names/n_sims
-    interference_leaf = main_config['sierra']['perf']['intra_interference_csv'].split('.')[
-        0]
-    interference_col = main_config['sierra']['perf']['intra_interference_col']
-
-    interference_dfs = pmcommon.gather_collated_sim_dfs(cmdopts,
-                                                        criteria,
-                                                        interference_leaf,
-                                                        interference_col)
+    ss = prediction.loc[prediction.index[-1], exp_dirs].to_numpy(dtype=float)
+    mock = np.repeat(ss[:, np.newaxis], len(sims), axis=1)
 
-    dfs_mock = {}
-    exps = list(interference_dfs.keys())
-    sims = interference_dfs[exps[0]].columns
+    return {d: pd.DataFrame(mock[i:i + 1], columns=sims) for i, d in enumerate(exp_dirs)}
 
-    for d in exp_dirs:
-        dfs_mock[d] = pd.DataFrame(index=range(
-            len(interference_dfs[exps[0]][sims[0]])))
 
-    for d in exp_dirs:
-        for s in sims:
-            dfs_mock[d][s] = prediction.loc[prediction.index[-1], d]
+def _mock_sims_gen(criteria: bc.IConcreteBatchCriteria,
+                   main_config: types.YAMLDict,
+                   cmdopts: types.Cmdopts) -> tp.List[str]:
+    """
+    Get the names of the simulations in the mock distribution, which are the
+    same as in the experimental data, from a single collated .csv.
+    """
+    exp0 = sierra.core.utils.exp_range_calc(cmdopts, '', criteria)[0]
+    interference_leaf = main_config['sierra']['perf']['intra_interference_csv'].split('.')[0]
+    interference_col = main_config['sierra']['perf']['intra_interference_col']
 
-    return dfs_mock
+    ipath = os.path.join(cmdopts['batch_stat_collate_root'],
+                         exp0 + '-' + interference_leaf + '-' + interference_col + '.csv')
+    return list(storage.DataFrameReader('storage.csv')(ipath).columns)
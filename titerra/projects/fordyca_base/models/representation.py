@@ -16,9 +16,11 @@
 
 # Core packages
 import os
+import re
 import typing as tp
 
 # 3rd party packages
+import numpy as np
 import pandas as pd
 from sierra.core import utils, storage, types
 import sierra.core.variables.batch_criteria as bc
@@ -67,13 +69,28 @@ class BlockCluster():
 
 
 class Nest():
+    @classmethod
+    def from_arena(cls, dist_type: str, arena: ArenaExtent) -> 'Nest':
+        """
+        Create the nest for a block distribution and arena directly, without
+        needing an experiment in a batch (e.g., for running models outside of
+        the SIERRA pipeline).
+        """
+        obj = cls.__new__(cls)
+        obj.extent = cls._extent_calc(dist_type, arena)
+        return obj
+
     def __init__(self, cmdopts: types.Cmdopts, criteria: bc.IConcreteBatchCriteria, exp_num: int):
         # Get nest position
         spec = ExperimentSpec(criteria, exp_num, cmdopts)
         res = sgp.ScenarioGeneratorParser().to_dict(cmdopts['scenario'])
+        self.extent = self._extent_calc(res['scenario_tag'], spec.arena_dim)
+
+    @staticmethod
+    def _extent_calc(dist_type: str, arena: ArenaExtent) -> ArenaExtent:
         pose = nest.Nest(src='arena',
-                         dist_type=res['scenario_tag'],
-                         arena=spec.arena_dim)
+                         dist_type=dist_type,
+                         arena=arena)
 
         for _, tag, attr in pose.gen_tag_addlist()[0]:
             if tag == 'nest':
@@ -82,7 +99,7 @@ class Nest():
                 x, y = attr['dims'].split(',')
                 dims = Vector3D(float(x), float(y), 0.0)
 
-        self.extent = ArenaExtent(dims, center - dims / 2.0)
+        return ArenaExtent(dims, center - dims / 2.0)
 
 
 class BlockClusterSet():
@@ -90,11 +107,18 @@ class BlockClusterSet():
     Given a simulation directory within an experiment in a batch, calculate the
     :class:`BlockCluster`s for all clusters within the arena.
 
+    The columns of ``block-clusters.csv`` are parsed in a single pass into arrays indexed by cluster
+    ID (:attr:`xmin`, :attr:`xmax`, :attr:`ymin`, :attr:`ymax`, :attr:`avg_blocks`), and the
+    per-cluster :class:`BlockCluster` views are built from those.
+
     Arguments:
        main_config: Main YAML configuration for project.
        cmdopts: Parsed cmdline parameters.
        sim_opath: Directory path in which the ``block-clusters.csv`` can be found.
     """
+    kEXTENT_RE = re.compile('cluster([0-9]+)_(xmin|xmax|ymin|ymax)')
+    kBLOCK_COUNT_RE = re.compile('int_avg_cluster[0-9]*_block_count')
+    kAREA_RE = re.compile('cluster[0-9]*_area')
 
     def __init__(self,
                  cmdopts: types.Cmdopts,
@@ -103,10 +127,7 @@ class BlockClusterSet():
 
         clusters_df = storage.DataFrameReader('storage.csv')(
             os.path.join(sim_opath, 'block-clusters.csv'))
-        n_clusters = len([c for c in clusters_df.columns if 'xmin' in c])
-
-        # Create extents from clusters
-        self.clusters = set()
+        self._parse(clusters_df)
 
         # RN block distribution has a single cluster, but the nest is in the middle of it, which
         # makes density calculations much trickier when integrating across/up to the nest (modeled
@@ -114,50 +135,90 @@ class BlockClusterSet():
         # nest to avoid computational issues.
 
         if 'RN' in cmdopts['scenario']:
-            cluster = BlockCluster.from_df(clusters_df, 0)
-            total_area = cluster.extent.area()
-
-            ll1 = cluster.extent.ll
-            ur1 = Vector3D(nest.extent.ll.x, cluster.extent.ur.y)
-            c1_extent = ArenaExtent.from_corners(ll=ll1, ur=ur1)
-
-            c1 = BlockCluster(ll=ll1,
-                              ur=ur1,
-                              cluster_id=0,
-                              avg_blocks=cluster.avg_blocks * c1_extent.area() / total_area)
-
-            ll2 = Vector3D(nest.extent.ll.x, cluster.extent.ll.y)
-            ur2 = Vector3D(nest.extent.ur.x, nest.extent.ll.y)
-            c2_extent = ArenaExtent.from_corners(ll=ll2, ur=ur2)
-
-            c2 = BlockCluster(ll=ll2,
-                              ur=ur2,
-                              cluster_id=1,
-                              avg_blocks=cluster.avg_blocks * c2_extent.area() / total_area)
+            self.clusters = self.ring_nest(self._cluster_view(0), nest)
 
-            ll3 = Vector3D(nest.extent.ll.x, nest.extent.ur.y)
-            ur3 = Vector3D(nest.extent.ur.x, cluster.extent.ur.y)
-            c3_extent = ArenaExtent.from_corners(ll=ll3, ur=ur3)
-
-            c3 = BlockCluster(ll=ll3,
-                              ur=ur3,
-                              cluster_id=2,
-                              avg_blocks=cluster.avg_blocks * c3_extent.area() / total_area)
-
-            ll4 = Vector3D(nest.extent.ur.x, cluster.extent.ll.y)
-            ur4 = cluster.extent.ur
-            c4_extent = ArenaExtent.from_corners(ll=ll4, ur=ur4)
-
-            c4 = BlockCluster(ll=ll4,
-                              ur=ur4,
-                              cluster_id=3,
-                              avg_blocks=cluster.avg_blocks * c4_extent.area() / total_area)
+        else:  # General case
+            self.clusters = set([self._cluster_view(c) for c in range(0, len(self.xmin))])
+
+    def _parse(self, clusters_df: pd.DataFrame) -> None:
+        last = clusters_df.iloc[-1]
+        extent_cols = {}  # type: tp.Dict[tp.Tuple[int, str], str]
+        total_blocks = 0.0
+        total_area = 0.0
+
+        for col in clusters_df.columns:
+            if self.kBLOCK_COUNT_RE.search(col):
+                total_blocks += last[col]
+            if self.kAREA_RE.search(col):
+                total_area += last[col]
+
+            match = self.kEXTENT_RE.search(col)
+            if match:
+                extent_cols.setdefault((int(match.group(1)), match.group(2)), col)
+
+        ids = sorted(set(c for c, _ in extent_cols))
+        self.xmin = np.array([last[extent_cols[(c, 'xmin')]] for c in ids], dtype=float)
+        self.xmax = np.array([last[extent_cols[(c, 'xmax')]] for c in ids], dtype=float)
+        self.ymin = np.array([last[extent_cols[(c, 'ymin')]] for c in ids], dtype=float)
+        self.ymax = np.array([last[extent_cols[(c, 'ymax')]] for c in ids], dtype=float)
 
-            self.clusters = set([c1, c2, c3, c4])
+        # We approximate the # blocks in a cluster (which changes dynamically) as a steady state
+        # quantity, where each cluster always contains the fraction of total blocks in the arena
+        # corresponding to how much of the overall distributable area it contains.
+        areas = (self.xmax - self.xmin) * (self.ymax - self.ymin)
+        self.avg_blocks = total_blocks * areas / total_area
 
-        else:  # General case
-            for c in range(0, n_clusters):
-                self.clusters |= set([BlockCluster.from_df(clusters_df, c)])
+    def _cluster_view(self, cluster_id: int) -> BlockCluster:
+        return BlockCluster(ll=Vector3D(self.xmin[cluster_id], self.ymin[cluster_id]),
+                            ur=Vector3D(self.xmax[cluster_id], self.ymax[cluster_id]),
+                            cluster_id=cluster_id,
+                            avg_blocks=self.avg_blocks[cluster_id])
+
+    @staticmethod
+    def ring_nest(cluster: BlockCluster, nest: Nest) -> tp.Set[BlockCluster]:
+        """
+        Break a single cluster with the nest in the middle of it into an
+        equivalent set of 4 smaller clusters ringing the nest.
+        """
+        total_area = cluster.extent.area()
+
+        ll1 = cluster.extent.ll
+        ur1 = Vector3D(nest.extent.ll.x, cluster.extent.ur.y)
+        c1_extent = ArenaExtent.from_corners(ll=ll1, ur=ur1)
+
+        c1 = BlockCluster(ll=ll1,
+                          ur=ur1,
+                          cluster_id=0,
+                          avg_blocks=cluster.avg_blocks * c1_extent.area() / total_area)
+
+        ll2 = Vector3D(nest.extent.ll.x, cluster.extent.ll.y)
+        ur2 = Vector3D(nest.extent.ur.x, nest.extent.ll.y)
+        c2_extent = ArenaExtent.from_corners(ll=ll2, ur=ur2)
+
+        c2 = BlockCluster(ll=ll2,
+                          ur=ur2,
+                          cluster_id=1,
+                          avg_blocks=cluster.avg_blocks * c2_extent.area() / total_area)
+
+        ll3 = Vector3D(nest.extent.ll.x, nest.extent.ur.y)
+        ur3 = Vector3D(nest.extent.ur.x, cluster.extent.ur.y)
+        c3_extent = ArenaExtent.from_corners(ll=ll3, ur=ur3)
+
+        c3 = BlockCluster(ll=ll3,
+                          ur=ur3,
+                          cluster_id=2,
+                          avg_blocks=cluster.avg_blocks * c3_extent.area() / total_area)
+
+        ll4 = Vector3D(nest.extent.ur.x, cluster.extent.ll.y)
+        ur4 = cluster.extent.ur
+        c4_extent = ArenaExtent.from_corners(ll=ll4, ur=ur4)
+
+        c4 = BlockCluster(ll=ll4,
+                          ur=ur4,
+                          cluster_id=3,
+                          avg_blocks=cluster.avg_blocks * c4_extent.area() / total_area)
+
+        return set([c1, c2, c3, c4])
 
     def __iter__(self):
         return iter(self.clusters)
@@ -20,10 +20,10 @@ import typing as tp
 import logging
 
 # 3rd party packages
-import yaml
 
 # Project packages
 import titerra.projects.common.pipeline.stage4.yaml_config_loader as ycl
+from titerra.projects.common.pipeline.stage4 import config_cache
 from sierra.core import utils
 
 
@@ -31,23 +31,25 @@ class YAMLConfigLoader(ycl.YAMLConfigLoader):
     def __init__(self) -> None:
         super().__init__()
 
-    def __call__(self, cmdopts: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Dict[str, str]]:
-        joint_config = super().__call__(cmdopts)
+    def _sources(self, cmdopts: tp.Dict[str, tp.Any]) -> tp.List[str]:
+        return super()._sources(cmdopts) + [
+            os.path.join(cmdopts['project_config_root'], 'intra-graphs-line.yaml'),
+            os.path.join(cmdopts['project_config_root'], 'intra-graphs-hm.yaml'),
+            os.path.join(cmdopts['project_config_root'], 'inter-graphs-line.yaml')
+        ]
+
+    def _load(self, cmdopts: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Dict[str, str]]:
+        joint_config = super()._load(cmdopts)
 
         # Replace logger for more accurate messages
         self.logger = logging.getLogger(__name__)
 
-        fordyca_inter_LN = os.path.join(cmdopts['project_config_root'],
-                                        'inter-graphs-line.yaml')
-        fordyca_intra_LN = os.path.join(cmdopts['project_config_root'],
-                                        'intra-graphs-line.yaml')
-        fordyca_intra_HM = os.path.join(cmdopts['project_config_root'],
-                                        'intra-graphs-hm.yaml')
+        fordyca_intra_LN, fordyca_intra_HM, fordyca_inter_LN = self._sources(cmdopts)[3:6]
 
         # Load FORDYCA config
         if utils.path_exists(fordyca_intra_LN):
             self.logger.info("Intra-experiment linegraph config for FORDYCA")
-            fordyca_dict = yaml.load(open(fordyca_intra_LN), yaml.FullLoader)
+            fordyca_dict = config_cache.yaml_load(fordyca_intra_LN)
 
             for category in fordyca_dict:
                 if category not in joint_config['intra_LN']:
@@ -59,7 +61,7 @@ class YAMLConfigLoader(ycl.YAMLConfigLoader):
 
         if utils.path_exists(fordyca_intra_HM):
             self.logger.info("Intra-experiment heatmap config for FORDYCA")
-            fordyca_dict = yaml.load(open(fordyca_intra_HM), yaml.FullLoader)
+            fordyca_dict = config_cache.yaml_load(fordyca_intra_HM)
 
             for category in fordyca_dict:
                 if category not in joint_config['intra_HM']:
@@ -71,7 +73,7 @@ class YAMLConfigLoader(ycl.YAMLConfigLoader):
 
         if utils.path_exists(fordyca_inter_LN):
             self.logger.info("Inter-experiment linegraph config for FORDYCA")
-            fordyca_dict = yaml.load(open(fordyca_inter_LN), yaml.FullLoader)
+            fordyca_dict = config_cache.yaml_load(fordyca_inter_LN)
 
             for category in fordyca_dict:
                 if category not in joint_config['inter_LN']:
@@ -0,0 +1,244 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+
+"""
+Partitioning of the arena between 2D and 3D physics engines for construction
+scenarios.
+"""
+
+# Core packages
+import typing as tp
+import logging
+
+# 3rd party packages
+from sierra.core.utils import ArenaExtent
+from sierra.core.vector import Vector3D
+
+# Project packages
+from titerra.projects.common.generators.exec_planner import kVALID_N_ENGINES
+
+# Expected fraction of the robots around the construction targets/block
+# sources at any given time; the rest are spread uniformly over the arena.
+kTARGET_SHARE = 0.3
+kSOURCE_SHARE = 0.3
+
+
+class MixedPhysicsPartition():
+    """
+    The result of partitioning the arena between 2D and 3D physics engines.
+
+    Attributes:
+        n_engines_3D: # of 3D engines. Always > 0.
+
+        extent_3D: The part of the arena managed by the 3D engines.
+
+        n_engines_2D: # of 2D engines; 0 if the whole arena needs 3D physics.
+
+        extent_2D: The part of the arena managed by the 2D engines; None if
+                   there are no 2D engines.
+    """
+
+    def __init__(self,
+                 n_engines_3D: int,
+                 extent_3D: ArenaExtent,
+                 n_engines_2D: int,
+                 extent_2D: tp.Optional[ArenaExtent]) -> None:
+        self.n_engines_3D = n_engines_3D
+        self.extent_3D = extent_3D
+        self.n_engines_2D = n_engines_2D
+        self.extent_2D = extent_2D
+
+
+class MixedPhysicsPartitioner():
+    """
+    Sizes and places the 2D and 3D physics engine regions in the arena from the
+    footprints of the construction targets, and divides the available engines
+    between them to balance the expected load per engine.
+
+    The 3D region is a slab of the arena along X or Y which contains the
+    footprints of all construction targets (plus a margin for robots
+    maneuvering around them) and touches an arena boundary, so that the rest
+    of the arena is a single rectangular 2D region; of the 4 possible slabs,
+    the one giving the lowest expected load on the most loaded engine is
+    used.
+
+    The expected load of a region is proportional to the expected # of robots
+    in it, scaled by the relative cost of 3D dynamics for the 3D region. Robots
+    are modeled as congregating around the block sources (picking up blocks)
+    and the construction targets (placing blocks), which are where blocks are
+    brought in construction scenarios in lieu of a nest, with the rest spread
+    uniformly over the arena while exploring/travelling between them. For
+    distributions without fixed sources (random, powerlaw), the share of
+    robots at the sources is spread uniformly instead.
+
+    Attributes:
+        arena: The extent of the arena.
+
+        footprints: The extents of the construction targets.
+
+        sources: The extents of the block sources; empty if blocks are not
+                 distributed in fixed sources.
+
+        n_engines: The total # of physics engines available.
+
+        margin: How far to extend the 3D region beyond the target footprints,
+                in each direction.
+
+        cost_3D: The cost of updating an entity in a 3D engine relative to a 2D
+                 engine.
+    """
+
+    def __init__(self,
+                 arena: ArenaExtent,
+                 footprints: tp.List[ArenaExtent],
+                 sources: tp.List[ArenaExtent],
+                 n_engines: int,
+                 margin: float = 1.0,
+                 cost_3D: float = 4.0) -> None:
+        self.arena = arena
+        self.footprints = footprints
+        self.sources = sources
+        self.n_engines = n_engines
+        self.margin = margin
+        self.cost_3D = cost_3D
+        self.logger = logging.getLogger(__name__)
+
+    def __call__(self) -> MixedPhysicsPartition:
+        zmax = max([f.zsize() for f in self.footprints], default=self.arena.zsize())
+
+        if self.n_engines == 1:
+            self.logger.warning(
+                "Cannot mix 2D/3D engines with only 1 engine: using 1 3D engine")
+
+        if self.n_engines == 1 or not self.footprints:
+            extent_3D, extent_2D = self._extent(self.arena.ll, self.arena.ur, zmax), None
+        else:
+            extent_3D, extent_2D = self._regions_calc(zmax)
+
+        if extent_2D is None:
+            return MixedPhysicsPartition(self._n_engines_fit(self.n_engines),
+                                         extent_3D,
+                                         0,
+                                         None)
+
+        _, n_engines_3D, n_engines_2D = self._balance(extent_3D, extent_2D)
+        self.logger.debug("Mapped %s 3D engines to %s, %s 2D engines to %s",
+                          n_engines_3D,
+                          extent_3D,
+                          n_engines_2D,
+                          extent_2D)
+        return MixedPhysicsPartition(n_engines_3D, extent_3D, n_engines_2D, extent_2D)
+
+    def _regions_calc(self, zmax: float) -> tp.Tuple[ArenaExtent, tp.Optional[ArenaExtent]]:
+        """
+        Calculate the 3D region and the 2D region (None if empty) for the
+        construction targets.
+        """
+        ll = self.arena.ll
+        ur = self.arena.ur
+
+        # Bounding box of all targets + margin, clipped to the arena
+        fp_ll = Vector3D(max(ll.x, min(f.ll.x for f in self.footprints) - self.margin),
+                         max(ll.y, min(f.ll.y for f in self.footprints) - self.margin),
+                         ll.z)
+        fp_ur = Vector3D(min(ur.x, max(f.ur.x for f in self.footprints) + self.margin),
+                         min(ur.y, max(f.ur.y for f in self.footprints) + self.margin),
+                         ur.z)
+
+        # (3D LL, 3D UR, 2D LL, 2D UR) for slabs touching the W, E, S, N
+        # boundaries, in that order of preference.
+        candidates = [
+            (ll, Vector3D(fp_ur.x, ur.y, ur.z), Vector3D(fp_ur.x, ll.y, ll.z), ur),
+            (Vector3D(fp_ll.x, ll.y, ll.z), ur, ll, Vector3D(fp_ll.x, ur.y, ur.z)),
+            (ll, Vector3D(ur.x, fp_ur.y, ur.z), Vector3D(ll.x, fp_ur.y, ll.z), ur),
+            (Vector3D(ll.x, fp_ll.y, ll.z), ur, ll, Vector3D(ur.x, fp_ll.y, ur.z))
+        ]
+
+        regions = []
+        for c in candidates:
+            extent_3D = self._extent(c[0], c[1], zmax)
+            if (c[3].x - c[2].x) * (c[3].y - c[2].y) <= 0.0:
+                regions.append((extent_3D, None))
+            else:
+                regions.append((extent_3D, self._extent(c[2], c[3], zmax)))
+
+        # Ties (e.g., no sources) go to the smallest 3D region
+        return min(regions, key=lambda r: (self._balance(*r)[0], r[0].area()))
+
+    def _balance(self,
+                 extent_3D: ArenaExtent,
+                 extent_2D: tp.Optional[ArenaExtent]) -> tp.Tuple[float, int, int]:
+        """
+        Calculate the expected load on the most loaded engine and the # of 3D/2D
+        engines giving it for the specified regions.
+        """
+        load_3D = self.cost_3D * self._load(extent_3D)
+        if extent_2D is None:
+            n_engines_3D = self._n_engines_fit(self.n_engines)
+            return load_3D / n_engines_3D, n_engines_3D, 0
+
+        load_2D = self._load(extent_2D)
+        n_engines_3D, n_engines_2D = self._engines_split(load_3D, load_2D)
+        return max(load_3D / n_engines_3D, load_2D / n_engines_2D), n_engines_3D, n_engines_2D
+
+    def _load(self, region: ArenaExtent) -> float:
+        """
+        Calculate the expected fraction of the robots in the specified region.
+        """
+        share_uniform = 1.0 - kTARGET_SHARE - (kSOURCE_SHARE if self.sources else 0.0)
+
+        load = share_uniform * self._overlap(region, self.arena) / self.arena.area()
+        for hotspots, share in [(self.footprints, kTARGET_SHARE),
+                                (self.sources, kSOURCE_SHARE)]:
+            for h in hotspots:
+                load += share / len(hotspots) * self._overlap(region, h) / h.area()
+
+        return load
+
+    def _engines_split(self, load_3D: float, load_2D: float) -> tp.Tuple[int, int]:
+        """
+        Divide the engines between the 3D and 2D regions to minimize the
+        expected load on the most loaded engine, using as many of them as
+        possible.
+        """
+        splits = [(n_3D, n_2D)
+                  for n_3D in kVALID_N_ENGINES
+                  for n_2D in kVALID_N_ENGINES
+                  if n_3D + n_2D <= self.n_engines]
+
+        return min(splits,
+                   key=lambda s: (max(load_3D / s[0], load_2D / s[1]), -sum(s)))
+
+    @staticmethod
+    def _n_engines_fit(n_engines: int) -> int:
+        return max(n for n in kVALID_N_ENGINES if n <= n_engines)
+
+    @staticmethod
+    def _overlap(e1: ArenaExtent, e2: ArenaExtent) -> float:
+        dx = min(e1.ur.x, e2.ur.x) - max(e1.ll.x, e2.ll.x)
+        dy = min(e1.ur.y, e2.ur.y) - max(e1.ll.y, e2.ll.y)
+        return max(dx, 0.0) * max(dy, 0.0)
+
+    @staticmethod
+    def _extent(ll: Vector3D, ur: Vector3D, zmax: float) -> ArenaExtent:
+        return ArenaExtent(dims=Vector3D(ur.x - ll.x, ur.y - ll.y, zmax),
+                           origin=Vector3D(ll.x, ll.y, 0))
+
+
+__api__ = [
+    'MixedPhysicsPartition',
+    'MixedPhysicsPartitioner'
+]
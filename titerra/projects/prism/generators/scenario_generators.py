@@ -58,11 +58,11 @@ class SSGenerator(sicom.ConstructionScenarioGenerator):
         self.generate_arena_map(exp_def, arena_map)
 
         # Generate and apply block distribution type definitions
-        self.generate_block_dist(
-            exp_def, block_distribution.SingleSourceDistribution())
+        block_dist = block_distribution.SingleSourceDistribution()
+        self.generate_block_dist(exp_def, block_dist)
 
         # Mixed 2D/3D physics
-        self.generate_mixed_physics(exp_def, 'single_source')
+        self.generate_mixed_physics(exp_def, block_dist)
 
         return exp_def
 
@@ -101,11 +101,11 @@ class DSGenerator(sicom.ConstructionScenarioGenerator):
         self.generate_arena_map(exp_def, arena_map)
 
         # Generate and apply block distribution type definitions
-        self.generate_block_dist(
-            exp_def, block_distribution.DualSourceDistribution())
+        block_dist = block_distribution.DualSourceDistribution()
+        self.generate_block_dist(exp_def, block_dist)
 
         # Mixed 2D/3D physics
-        self.generate_mixed_physics(exp_def, 'dual_source')
+        self.generate_mixed_physics(exp_def, block_dist)
 
         return exp_def
 
@@ -142,11 +142,11 @@ class QSGenerator(sicom.ConstructionScenarioGenerator):
         self.generate_arena_map(exp_def, arena_map)
 
         # Generate and apply block distribution type definitions
-        self.generate_block_dist(
-            exp_def, block_distribution.QuadSourceDistribution())
+        block_dist = block_distribution.QuadSourceDistribution()
+        self.generate_block_dist(exp_def, block_dist)
 
         # Mixed 2D/3D physics
-        self.generate_mixed_physics(exp_def, 'quad_source')
+        self.generate_mixed_physics(exp_def, block_dist)
 
         return exp_def
 
@@ -183,10 +183,11 @@ class RNGenerator(sicom.ConstructionScenarioGenerator):
         self.generate_arena_map(exp_def, arena_map)
 
         # Generate and apply block distribution type definitions
-        self.generate_block_dist(exp_def, block_distribution.RandomDistribution())
+        block_dist = block_distribution.RandomDistribution()
+        self.generate_block_dist(exp_def, block_dist)
 
         # Mixed 2D/3D physics
-        self.generate_mixed_physics(exp_def, 'random')
+        self.generate_mixed_physics(exp_def, block_dist)
 
         return exp_def
 
@@ -223,11 +224,11 @@ class PLGenerator(sicom.ConstructionScenarioGenerator):
         self.generate_arena_map(exp_def, arena_map)
 
         # Generate and apply block distribution type definitions
-        self.generate_block_dist(exp_def,
-                                 block_distribution.PowerLawDistribution(self.spec.arena_dim))
+        block_dist = block_distribution.PowerLawDistribution(self.spec.arena_dim)
+        self.generate_block_dist(exp_def, block_dist)
 
         # Mixed 2D/3D physics
-        self.generate_mixed_physics(exp_def, 'powerlaw')
+        self.generate_mixed_physics(exp_def, block_dist)
 
         return exp_def
 
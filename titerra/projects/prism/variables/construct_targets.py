@@ -25,7 +25,6 @@ import logging  # type: ignore
 import typing as tp
 
 # 3rd party packages
-import networkx as nx
 import implements
 from sierra.core.vector import Vector3D
 from sierra.core.xml import XMLTagAddList, XMLTagAdd
@@ -35,6 +34,11 @@ from sierra.core import types
 from sierra.core.utils import ArenaExtent
 from titerra.projects.prism import gmt_spec
 from titerra.projects.prism.variables.orientation import Orientation
+from titerra.projects.common.lazy_import import lazy_import
+
+# Only needed when generating construction targets, which most invocations
+# don't do.
+nx = lazy_import('networkx')
 
 
 class IConcreteGMT(implements.Interface):
@@ -45,7 +49,7 @@ class IConcreteGMT(implements.Interface):
         """
         raise NotImplementedError
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         """
         Generates the graphical representation of the target.
         """
@@ -102,7 +106,7 @@ class BaseConstructTarget():
                                        attrs,
                                        False))
 
-    def write_graphml(self, graph: nx.Graph, path: str) -> None:
+    def write_graphml(self, graph: 'nx.Graph', path: str) -> None:
         """
         Writes generated GraphML to the filesystem.
         """
@@ -119,7 +123,7 @@ class BaseConstructTarget():
 
         return True
 
-    def graph_virtual_shell_add(self, graph: nx.Graph) -> nx.Graph:
+    def graph_virtual_shell_add(self, graph: 'nx.Graph') -> 'nx.Graph':
         for vd in graph.copy():
             xplus1 = Vector3D(1, 0, 0)
             xminus1 = Vector3D(-1, 0, 0)
@@ -140,7 +144,7 @@ class BaseConstructTarget():
 
         return graph
 
-    def graph_complement_shell_add(self, graph: nx.Graph) -> nx.Graph:
+    def graph_complement_shell_add(self, graph: 'nx.Graph') -> 'nx.Graph':
         """
         Adds virtual vertices to the graph to form the complement shell.
 
@@ -163,7 +167,7 @@ class BaseConstructTarget():
         return graph
 
     def graph_block_remove(self,
-                           graph: nx.Graph,
+                           graph: 'nx.Graph',
                            c: Vector3D) -> None:
         """
         Removes the block at the specified anchor point from the graph.
@@ -172,7 +176,7 @@ class BaseConstructTarget():
         graph.remove_node(vd)
 
     def graph_block_add(self,
-                        graph: nx.Graph,
+                        graph: 'nx.Graph',
                         block_type: str,
                         c: Vector3D,
                         z_rot: Orientation) -> None:
@@ -188,7 +192,7 @@ class BaseConstructTarget():
             raise NotImplementedError
 
     def _graph_block_add_edge(self,
-                              graph: nx.Graph,
+                              graph: 'nx.Graph',
                               block_type: str,
                               c: Vector3D,
                               z_rot: Orientation) -> None:
@@ -234,7 +238,7 @@ class BaseConstructTarget():
         graph.add_edge(vd1, vd2, weight=1)
 
     def _graph_block_add_semantic(self,
-                                  graph: nx.Graph,
+                                  graph: 'nx.Graph',
                                   block_type: str,
                                   c: Vector3D,
                                   z_rot: Orientation) -> None:
@@ -255,7 +259,7 @@ class BaseConstructTarget():
         self._connect_vertex_to_neighbors(graph, vd, block_type, c)
 
     def _connect_vertex_to_neighbors(self,
-                                     graph: nx.Graph,
+                                     graph: 'nx.Graph',
                                      vd: int,
                                      block_type: str,
                                      c: Vector3D) -> None:
@@ -286,7 +290,7 @@ class BaseConstructTarget():
                               n_vd)
 
     def _graph_ramp2_add(self,
-                         graph: nx.Graph,
+                         graph: 'nx.Graph',
                          c: Vector3D,
                          z_rot: Orientation) -> None:
         """
@@ -361,7 +365,7 @@ class BaseConstructTarget():
             n.x
 
     @staticmethod
-    def calc_block_extent(graph: nx.Graph,
+    def calc_block_extent(graph: 'nx.Graph',
                           anchor: Vector3D,
                           bb: ArenaExtent) -> tp.List[Vector3D]:
         vd = BaseConstructTarget.calc_vertex_descriptor(anchor, bb)
@@ -392,7 +396,7 @@ class BaseConstructTarget():
         return coords
 
     @staticmethod
-    def calc_block_extent_from_vd(graph: nx.Graph,
+    def calc_block_extent_from_vd(graph: 'nx.Graph',
                                   vd: int) -> tp.List[Vector3D]:
         for k, v in gmt_spec.kBlockTypes.items():
             if v == graph.nodes[vd][gmt_spec.kBlockTypeKey]:
@@ -425,7 +429,7 @@ class Beam1Prism(BaseConstructTarget):
                  graphml_path: str) -> None:
         super().__init__(spec, target_id, paradigm, graphml_path)
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         graph = nx.Graph()
 
         # For rectprisms, there is no difference in the generated GRAPHML for +X
@@ -466,7 +470,7 @@ class Beam2Prism(BaseConstructTarget):
                  graphml_path: str) -> None:
         super().__init__(spec, target_id, paradigm, graphml_path)
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         graph = nx.Graph()
 
         if self.spec['orientation'].is_EW():
@@ -505,7 +509,7 @@ class Beam3Prism(BaseConstructTarget):
                  graphml_path: str) -> None:
         super().__init__(spec, target_id, paradigm, graphml_path)
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         graph = nx.Graph()
 
         if self.spec['orientation'].is_EW():
@@ -545,7 +549,7 @@ class MixedBeamPrism(BaseConstructTarget):
                  graphml_path: str) -> None:
         super().__init__(spec, target_id, paradigm, graphml_path)
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         raise NotImplementedError("Error: Cannot generate mixed graph--manual \
                                    specification required")
 
@@ -567,7 +571,7 @@ class Beam1Pyramid(BaseConstructTarget):
                  graphml_path: str) -> None:
         super().__init__(spec, target_id, paradigm, graphml_path)
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         graph = nx.Graph()
 
         # For rectprisms, there is no difference in the generated GRAPHML for +X
@@ -627,7 +631,7 @@ class Ramp(BaseConstructTarget):
                 "Y size={0} not a multiple for ramp block length ratio {1}".format(self.extent.ysize(),
                                                                                    self.kRAMP_LENGTH_RATIO)
 
-    def gen_graph(self) -> nx.Graph:
+    def gen_graph(self) -> 'nx.Graph':
         graph = nx.Graph()
 
         # First, generate beam1 blocks
@@ -638,7 +642,7 @@ class Ramp(BaseConstructTarget):
 
         return graph
 
-    def _gen_ramp_blocks(self, graph: nx.Graph) -> None:
+    def _gen_ramp_blocks(self, graph: 'nx.Graph') -> None:
         """
         Add the nodes containing the anchor cells of ramp blocks to the
         structure graph, along with the connections to their neighbors.
@@ -665,7 +669,7 @@ class Ramp(BaseConstructTarget):
                                          Vector3D(x, y, z))
                 corr += 1
 
-    def _gen_beam1_blocks(self, graph: nx.Graph) -> None:
+    def _gen_beam1_blocks(self, graph: 'nx.Graph') -> None:
         """
         Add the nodes containing the anchor cells of beam1 blocks to the
         structure graph, along with the connections to their neighbors.
@@ -0,0 +1,163 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Checks the time it takes to import each of the plugin modules SIERRA loads
+when it starts up against a budget, so that regressions in the startup time of
+short pipeline stages (e.g., stage 1 on a cluster node) are caught.
+
+Each module is imported in a fresh interpreter after SIERRA and the packages
+it always imports, so only the cost of the plugin itself counts against the
+budget. Packages which are only needed for some stages (see
+:mod:`titerra.projects.common.lazy_import`) must not be imported at all.
+Exits with a non-zero status if any module is over budget.
+"""
+
+# Core packages
+import argparse
+import logging  # type: ignore
+import subprocess
+import sys
+import json
+import typing as tp
+
+# 3rd party packages
+
+# Project packages
+import sierra.core.logging
+
+kBASELINE = ['numpy', 'pandas', 'sierra.core.xml', 'sierra.core.utils']
+"""
+Modules imported before timing each plugin module; SIERRA always imports them,
+so they would not be any faster if TITERRA did not.
+"""
+
+kBUDGETS = {
+    'titerra.projects.common.cmdline': 0.1,
+    'titerra.projects.fordyca_argos.variables': 0.3,
+    'titerra.projects.fordyca_argos.generators.scenario_generators': 0.3,
+    'titerra.projects.fordyca_rosgazebo.generators.scenario_generators': 0.3,
+    'titerra.projects.fordyca_rosrobot.generators.scenario_generators': 0.3,
+    'titerra.projects.prism.variables.ct_set': 0.3,
+    'titerra.projects.prism.generators.scenario_generators': 0.3,
+}  # type: tp.Dict[str, float]
+"""
+Maximum time in seconds to import each module, on top of :data:`kBASELINE`.
+"""
+
+kDEFERRED = ['fastdtw', 'similaritymeasures', 'scipy', 'networkx']
+"""
+Packages which must not be imported when any of the modules in
+:data:`kBUDGETS` are, unless one of the :data:`kBASELINE` modules already does.
+"""
+
+kPROBE = """
+import importlib, json, sys, time
+for m in {baseline}:
+    importlib.import_module(m)
+before = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed,
+                  'deferred': [m for m in {deferred}
+                               if m in sys.modules and m not in before]}}))
+"""
+
+
+class ImportBudgetCmdline():
+    def __init__(self) -> None:
+
+        self.parser = argparse.ArgumentParser(prog='import_budget')
+
+        self.parser.add_argument("--modules",
+                                 help="""The modules to check. Defaults to all
+                                 modules with a budget.""",
+                                 nargs='+',
+                                 choices=list(kBUDGETS.keys()),
+                                 default=list(kBUDGETS.keys()))
+        self.parser.add_argument("--n-trials",
+                                 help="""How many times to import each module;
+                                 the fastest time is checked against the
+                                 budget.""",
+                                 type=int,
+                                 default=3)
+        self.parser.add_argument("--budget-scale",
+                                 help="""Multiply all budgets by this factor,
+                                 for slower machines.""",
+                                 type=float,
+                                 default=1.0)
+
+
+class ImportBudget():
+    """
+    Times importing each plugin module and checks the results against
+    :data:`kBUDGETS` and :data:`kDEFERRED`.
+    """
+
+    def __init__(self) -> None:
+        sierra.core.logging.initialize("INFO")
+        self.logger = logging.getLogger(__name__)
+
+    def __call__(self, args) -> bool:
+        ok = True
+
+        for module in args.modules:
+            results = [self._probe(module) for _ in range(args.n_trials)]
+            elapsed = min(r['elapsed'] for r in results)
+            deferred = results[0]['deferred']
+            budget = kBUDGETS[module] * args.budget_scale
+
+            if elapsed > budget:
+                self.logger.error("%s: %.3fs > budget %.3fs",
+                                  module,
+                                  elapsed,
+                                  budget)
+                ok = False
+            else:
+                self.logger.info("%s: %.3fs <= budget %.3fs",
+                                 module,
+                                 elapsed,
+                                 budget)
+
+            if deferred:
+                self.logger.error("%s: imports %s, which should be imported on first use",
+                                  module,
+                                  deferred)
+                ok = False
+
+        return ok
+
+    @staticmethod
+    def _probe(module: str) -> tp.Dict[str, tp.Any]:
+        code = kPROBE.format(baseline=kBASELINE,
+                             module=module,
+                             deferred=kDEFERRED)
+        res = subprocess.run([sys.executable, '-c', code],
+                             check=True,
+                             stdout=subprocess.PIPE)
+        return json.loads(res.stdout.decode('utf-8').splitlines()[-1])
+
+
+def main() -> None:
+    cmdline = ImportBudgetCmdline()
+    args = cmdline.parser.parse_args()
+
+    if not ImportBudget()(args):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
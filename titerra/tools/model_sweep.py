@@ -0,0 +1,290 @@
+# Copyright 2021 John Harwell, All rights reserved.
+#
+#  This file is part of TITERRA.
+#
+#  TITERRA is free software: you can redistribute it and/or modify it under the
+#  terms of the GNU General Public License as published by the Free Software
+#  Foundation, either version 3 of the License, or (at your option) any later
+#  version.
+#
+#  TITERRA is distributed in the hope that it will be useful, but WITHOUT ANY
+#  WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+#  A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  TITERRA.  If not, see <http://www.gnu.org/licenses/
+"""
+Simulation-free parameter sweeps of the :xref:`Harwell2021b` foraging models,
+for screening configurations before running any experiments.
+
+The sweep is defined by a YAML file with a single ``params`` dictionary. Each
+value is either a scalar (held constant) or a list (swept); the sweep is the
+cartesian product of all lists. For example::
+
+  params:
+    scenario: 'RN'
+    N: [1, 2, 4, 8, 16, 32, 64]
+    arena_dim: ['16x16', '32x32', '64x64']
+    n_blocks: 100
+    wander_speed: 0.09 # m/s
+    homing_speed: 0.08 # m/s
+    ticks_per_sec: 5
+    T: 10000 # seconds
+    tau_av1: 20.0 # timesteps
+    N_av1: 0.01
+    tau_avN: 30.0 # timesteps
+
+The interference parameters (``tau_av1``, ``N_av1``, ``tau_avN``) are read from
+experimental data when the models are run as part of a batch, and so must be
+specified here. The expected distance from the nest to block acquisition
+locations can be computed from the arena geometry for the RN block
+distribution; for other distributions it must be specified via ``acq_dist``
+(meters).
+"""
+
+# Core packages
+import argparse
+import os
+import logging  # type: ignore
+import itertools
+import functools
+import multiprocessing as mp
+import typing as tp
+
+# 3rd party packages
+import yaml
+import pandas as pd
+
+# Project packages
+import sierra.core.logging
+from sierra.core import storage
+from sierra.core.utils import ArenaExtent
+from sierra.core.vector import Vector3D
+
+import titerra.projects.fordyca_base.models.representation as rep
+import titerra.projects.fordyca_base.models.ode_solver as ode
+import titerra.projects.fordyca_base.models.diffusion as diffusion
+from titerra.projects.fordyca_base.models.blocks import IntraExp_BlockAcqRate_NRobots, ExpectedAcqDist
+from titerra.projects.fordyca_base.models.homing_time import IntraExp_HomingTime_NRobots
+from titerra.projects.fordyca_base.models.interference import IntraExp_WallInterferenceRate_1Robot, IntraExp_RobotInterferenceRate_NRobots
+
+
+class ModelSweepCmdline():
+    def __init__(self) -> None:
+
+        self.parser = argparse.ArgumentParser(prog='model_sweep')
+
+        self.parser.add_argument("-f", "--sweep-file",
+                                 help="""YAML file defining the parameter
+                                 sweep.""",
+                                 required=True)
+        self.parser.add_argument("-d", "--output-dir",
+                                 help="""Output directory for the sweep
+                                 tables.""",
+                                 required=True)
+        self.parser.add_argument("--hm-axes",
+                                 help="""The two swept parameters to use as the
+                                 rows/columns of the heatmap tables. Defaults
+                                 to the first two swept parameters.""",
+                                 nargs=2)
+        self.parser.add_argument("--n-procs",
+                                 help="""How many processes to use to evaluate
+                                 the sweep.""",
+                                 type=int,
+                                 default=mp.cpu_count())
+
+
+class ModelSweep():
+    """
+    Evaluates the ODE and queueing models for each point in a parameter sweep
+    in parallel, and writes out the results.
+
+    Results are written as a single table with one row per point, along with
+    one heatmap table per predicted quantity for each combination of swept
+    parameters other than the heatmap axes.
+    """
+    kPREDICTIONS = ['searching', 'homing', 'avoiding',
+                    'alpha_b', 'alpha_ca', 'tau_h', 'crwD']
+
+    def __init__(self) -> None:
+        sierra.core.logging.initialize("INFO")
+        self.logger = logging.getLogger(__name__)
+
+    def __call__(self, args) -> None:
+        with open(args.sweep_file, 'r') as f:
+            params = yaml.load(f, yaml.FullLoader)['params']
+
+        swept = [k for k, v in params.items() if isinstance(v, list)]
+        points = [dict(zip(params.keys(), vals)) for vals in
+                  itertools.product(*[v if isinstance(v, list) else [v]
+                                      for v in params.values()])]
+
+        self.logger.info("Evaluating %s sweep points over %s with %s processes",
+                         len(points),
+                         swept,
+                         args.n_procs)
+
+        with mp.Pool(processes=args.n_procs) as pool:
+            results = pool.map(sweep_point_eval, points)
+
+        res_df = pd.DataFrame(results)
+
+        os.makedirs(args.output_dir, exist_ok=True)
+        storage.DataFrameWriter('storage.csv')(res_df,
+                                               os.path.join(args.output_dir,
+                                                            'sweep.csv'),
+                                               index=False)
+
+        hm_axes = args.hm_axes if args.hm_axes is not None else swept[:2]
+        if len(hm_axes) < 2:
+            self.logger.info("Fewer than 2 swept parameters: not writing heatmap tables")
+            return
+
+        self._write_heatmaps(res_df,
+                             hm_axes,
+                             [s for s in swept if s not in hm_axes],
+                             args.output_dir)
+
+    def _write_heatmaps(self,
+                        res_df: pd.DataFrame,
+                        hm_axes: tp.List[str],
+                        others: tp.List[str],
+                        output_dir: str) -> None:
+        groups = res_df.groupby(others) if others else [((), res_df)]
+
+        for key, group_df in groups:
+            key = key if isinstance(key, tuple) else (key,)
+            suffix = ''.join('-{0}={1}'.format(k, v) for k, v in zip(others, key))
+
+            for pred in self.kPREDICTIONS:
+                hm_df = group_df.pivot(index=hm_axes[0],
+                                       columns=hm_axes[1],
+                                       values=pred)
+                opath = os.path.join(output_dir, pred + suffix + '.csv')
+                storage.DataFrameWriter('storage.csv')(hm_df, opath)
+
+
+def sweep_point_eval(point: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    """
+    Evaluate the models for a single point in the sweep, using the same
+    kernels as the models do when run as part of a batch. Returns the point,
+    augmented with the model predictions.
+    """
+    scenario = point['scenario']
+    N = int(point['N'])
+    tps = int(point['ticks_per_sec'])
+    wander_speed = float(point['wander_speed'])
+
+    if 'acq_dist' in point:
+        acq_dist = float(point['acq_dist'])
+    else:
+        assert 'RN' in scenario,\
+            "acq_dist must be specified for block distribution '{0}'".format(scenario)
+        x, y = point['arena_dim'].split('x')
+        acq_dist = _acq_dist_calc(scenario,
+                                  float(x),
+                                  float(y),
+                                  float(point['n_blocks']))
+
+    crwD = diffusion.crwD_for_avoiding(N=N,
+                                       wander_speed=wander_speed,
+                                       ticks_per_sec=tps,
+                                       scenario=scenario)
+    alpha_b = IntraExp_BlockAcqRate_NRobots._kernel(N=N,
+                                                    wander_speed=wander_speed,
+                                                    ticks_per_sec=tps,
+                                                    avg_acq_dist=acq_dist,
+                                                    scenario=scenario)
+    tau_h1 = acq_dist / float(point['homing_speed']) * tps
+
+    params = {
+        'N': N,
+        'T': float(point['T']) * tps,
+        'n_datapoints': 1,
+        'tau_av1': float(point['tau_av1']),
+        'N_av1': float(point['N_av1']),
+    }
+
+    if N == 1:
+        alpha_ca = IntraExp_WallInterferenceRate_1Robot.kernel(N_av1=params['N_av1'],
+                                                               tau_av1=params['tau_av1'])
+        tau_h = tau_h1
+        params.update({
+            'tau_h1': tau_h,
+            'alpha_b1': alpha_b,
+            'alpha_ca1': alpha_ca
+        })
+    else:
+        # Without experimental data, the # robots experiencing interference
+        # is estimated the same way the ODE model does it.
+        tau_avN = float(point['tau_avN'])
+        alpha_ca = IntraExp_RobotInterferenceRate_NRobots.kernel(N_av1=params['N_av1'],
+                                                                 tau_av1=params['tau_av1'],
+                                                                 N_avN=params['N_av1'] * crwD,
+                                                                 tau_avN=tau_avN)
+        tau_h = IntraExp_HomingTime_NRobots.kernel(tau_h1=tau_h1,
+                                                   alpha_caN=alpha_ca,
+                                                   tau_avN=tau_avN,
+                                                   N=N)
+        params.update({
+            'tau_avN': tau_avN,
+            'tau_hN': tau_h,
+            'alpha_bN': alpha_b,
+            'crwD': crwD
+        })
+
+    z0 = {
+        'N_s0': N,
+        'N_h0': 0,
+        'N_avh0': 0,
+        'N_avs0': 0,
+        'B0': float(point.get('n_blocks', 0))
+    }
+    soln = ode.CRWSolver(params,
+                         ss_tol=ode.CRWSolver.kSS_TOL,
+                         mode='fixed_point').solve(z0)
+
+    res = dict(point)
+    res.update({
+        'searching': soln[-1, 0],
+        'homing': soln[-1, 1],
+        'avoiding': N - soln[-1, 0] - soln[-1, 1],
+        'alpha_b': alpha_b,
+        'alpha_ca': alpha_ca,
+        'tau_h': tau_h,
+        'crwD': crwD
+    })
+    return res
+
+
+@functools.lru_cache(maxsize=None)
+def _acq_dist_calc(scenario: str,
+                   arena_x: float,
+                   arena_y: float,
+                   n_blocks: float) -> float:
+    """
+    Calculate the expected distance from the nest to block acquisition
+    locations for the RN block distribution, in which blocks are distributed
+    uniformly across the whole arena. Expensive, and many sweep points share
+    the same arena, so the result is memoized.
+    """
+    arena = ArenaExtent(Vector3D(arena_x, arena_y, 0.0))
+    nest = rep.Nest.from_arena('RN', arena)
+    cluster = rep.BlockCluster(ll=arena.ll,
+                               ur=arena.ur,
+                               cluster_id=0,
+                               avg_blocks=n_blocks)
+    return ExpectedAcqDist().for_clusters(rep.BlockClusterSet.ring_nest(cluster, nest),
+                                          nest,
+                                          scenario)
+
+
+def main() -> None:
+    cmdline = ModelSweepCmdline()
+    args = cmdline.parser.parse_args()
+
+    ModelSweep()(args)
+
+
+if __name__ == '__main__':
+    main()